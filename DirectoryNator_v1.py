@@ -1,10 +1,149 @@
 import argparse
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
 import datetime
+import hashlib
+import heapq
+import http.server
+import itertools
 import json
+import math
+import mmap
+import multiprocessing
 import os
+import queue
+import random
+import re
+import select
+import shutil
+import signal
+import sqlite3
+import statistics
+import string
+import struct
+import sys
+import tempfile
+import threading
 import time
-from collections import deque
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage.
+    resource = None
+
+# Report writing and formats.
+REPORT_STREAM_BUFFER = 1024
+BINARY_REPORT_MAGIC = b"DNRBIN\0\1"
+BINARY_REPORT_VERSION = 1
+BINARY_REPORT_EXTENSION = ".dnrb"
+BINARY_HEADER = struct.Struct("<8sI4x")
+BINARY_RECORD = struct.Struct("<II")
+BINARY_INDEX_ENTRY = struct.Struct("<IQ")
+BINARY_FOOTER = struct.Struct("<QQQQQQI8s")
+LARGEST_SUBTREES_TOP = 20
+
+# Scan index, compact trees, checkpoints and snapshots.
+SCAN_INDEX_FILENAME = "directorynator_scan_index.sqlite3"
+SCAN_INDEX_COMMIT_EVERY = 5000
+COMPACT_TREE_INTERN_LIMIT = 65536
+COMPACT_TREE_NAME_LRU = 4096
+CHECKPOINT_SYNC_SECONDS = 2.0
+SNAPSHOT_MAGIC = b"DNRSNAP2"
+SNAPSHOT_RULES_DIGEST_SIZE = 16
+SNAPSHOT_RECORD = struct.Struct("<BIqq")
+SNAPSHOT_SORT_RUN = 200_000
+SNAPSHOT_KINDS = ("D", "F")
+
+# Scan engines; shard_process_state is filled in each multiprocess worker by init_shard_process.
+MULTIPROCESS_SHARD_DIR_BUDGET = 20000
+MULTIPROCESS_MIN_THREADS = 4
+WORKSTEALING_BATCH_SIZE = 64
+WORKSTEALING_IDLE_MAX_SLEEP = 0.005
+DIRFD_OPEN_BUDGET = 256
+ASYNC_SCAN_CONCURRENCY = 32
+SCHEDULE_HISTORY_DEPTH = 4
+SCHEDULE_HISTORY_MIN_DIRS = 50
+shard_process_state = {}
+
+# Adaptive concurrency, profiling and progress.
+ADAPTIVE_MAX_WORKERS = 128
+ADAPTIVE_WINDOW_SECONDS = 0.5
+ADAPTIVE_MIN_WINDOW_DIRS = 32
+ADAPTIVE_TRAJECTORY_LIMIT = 512
+PROFILE_TOP_DIRS = 20
+PROFILE_SAMPLE_INTERVAL = 0.1
+PROFILE_SAMPLE_LIMIT = 1024
+PROGRESS_HISTORY_FILENAME = "directorynator_progress_history.json"
+PROGRESS_RATE_WINDOW_SECONDS = 1.0
+
+# Devices and exclusion rules.
+DEVICE_PROFILES_FILENAME = "directorynator_device_profiles.json"
+NETWORK_FILESYSTEM_TYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "afs", "ceph", "glusterfs"}
+PSEUDO_FILESYSTEM_PREFIXES = ("/proc", "/sys", "/dev", "/run")
+PSEUDO_FILESYSTEM_TYPES = (
+    "proc",
+    "sysfs",
+    "devtmpfs",
+    "devpts",
+    "cgroup",
+    "cgroup2",
+    "securityfs",
+    "debugfs",
+    "tracefs",
+    "pstore",
+    "bpf",
+    "mqueue",
+    "hugetlbfs",
+    "fusectl",
+    "configfs",
+    "binfmt_misc",
+    "autofs",
+    "overlay",
+    "nsfs",
+)
+
+# Benchmarks and the benchmark suite.
+DEFAULT_BENCHMARK_ENGINES = ("multithread", "workstealing", "dirfd", "multiprocess")
+THREAD_SWEEP_ENGINES = {"multithread", "workstealing", "dirfd"}
+BENCHMARK_SAMPLE_SUBTREES = 8
+BENCHMARK_SAMPLE_MAX_DEPTH = 3
+BENCHMARK_FINALISTS = 2
+SYNTHETIC_TREE_SHAPES = {
+    "balanced": {"root_fanout": 6, "fanout": 6, "depth": 4, "files_per_dir": 10, "name_length": 12},
+    "wide-flat": {"root_fanout": 2000, "fanout": 0, "depth": 1, "files_per_dir": 20, "name_length": 16},
+    "deep-skinny": {"root_fanout": 32, "fanout": 1, "depth": 64, "files_per_dir": 4, "name_length": 8},
+}
+SYNTHETIC_FILE_EXTENSIONS = (".txt", ".log", ".py", ".json", ".bin", ".csv", "")
+SUITE_FORMAT_VERSION = 1
+
+# Search index and duplicate detection.
+SEARCH_INDEX_FILENAME = "directorynator_search_index.sqlite3"
+SEARCH_INDEX_BATCH = 10_000
+HASH_CACHE_FILENAME = "directorynator_hash_cache.sqlite3"
+PARTIAL_HASH_BYTES = 4096
+HASH_CHUNK_BYTES = 1 << 20
+MMAP_HASH_MIN_BYTES = 16 << 20
+DUPLICATE_SUMMARY_GROUPS = 50
+
+# Daemon and watch modes.
+ARTIFACT_TIMESTAMP = re.compile(r"_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}")
+DAEMON_LOG_FILENAME = "directorynator_daemon_log.jsonl"
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_READ_BYTES = 1 << 16
+INOTIFY_DIR_MASK = 0x00000100 | 0x00000200 | 0x00000040 | 0x00000080 | 0x00000400 | 0x00000800 | 0x01000000
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x00000040, 0x00000080, 0x00000100, 0x00000200
+IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW, IN_IGNORED = 0x00000400, 0x00000800, 0x00004000, 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MTIME_SLACK_NS = 1_000_000_000
+WATCH_HOT_WINDOW_SECONDS = 10.0
+WATCH_WALK_BATCH = 256
 
 
 def print_banner():
@@ -37,18 +176,379 @@ def ensure_output_folder():
     return output_folder
 
 
-def traverse_directory(dirpath):
-    """Returns (subfolders, files, permission_denied_count, other_error_count)."""
+def glob_to_regex(pattern):
+    """Translates a gitignore-style glob (*, ?, [...], **) into a regex source without capturing groups."""
+    parts, index = [], 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            close = pattern.find("]", index + 1)
+            if close == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1 : close]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                index = close
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def read_mount_table():
+    """Returns [(mount_point, fs_type)] from /proc/self/mounts, or [] where it is unavailable."""
+    try:
+        with open("/proc/self/mounts", "r", encoding="utf-8", errors="surrogateescape") as mounts_file:
+            lines = mounts_file.readlines()
+    except OSError:
+        return []
+
+    mounts = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 3:
+            mount_point = re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), fields[1])
+            mounts.append((mount_point, fields[2]))
+    return mounts
+
+
+class ScanRules:
+    """Compiled gitignore-style exclusion rules (last match wins), evaluated inside workers before queueing."""
+
+    def __init__(self, root_dir, patterns=(), prefixes=(), fstypes=()):
+        self.root_prefix = root_dir if root_dir.endswith(os.sep) else root_dir + os.sep
+        self.labels = {}
+        self.prefix_rules = {}
+        self.negated = set()
+        kinds = {}
+
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            body = pattern[1:] if negated else pattern
+            dir_only = body.endswith("/")
+            body = body.rstrip("/")
+            anchored = "/" in body
+            body = body.lstrip("/")
+            if not body:
+                continue
+            group = f"r{len(self.labels)}"
+            self.labels[group] = pattern
+            if negated:
+                self.negated.add(group)
+            kinds.setdefault((anchored, dir_only), []).append(f"(?P<{group}>{glob_to_regex(body)}\\Z)")
+
+        for prefix in prefixes:
+            self.prefix_rules[os.path.normpath(os.path.abspath(prefix))] = f"prefix:{prefix}"
+        wanted_fstypes = set(fstypes)
+        if wanted_fstypes:
+            for mount_point, fs_type in read_mount_table():
+                if fs_type in wanted_fstypes:
+                    self.prefix_rules.setdefault(mount_point, f"fstype:{fs_type}")
+        # Pruning the scan root itself would make the scan empty; never treat it as excluded.
+        self.prefix_rules.pop(os.path.normpath(root_dir), None)
+
+        self.matchers = [(key, re.compile("|".join(reversed(sources)))) for key, sources in kinds.items()]
+        self.has_excludes = len(self.negated) < len(self.labels)
+        self.needs_path = bool(self.prefix_rules) or any(key[0] for key, _ in self.matchers)
+        self.local = threading.local()
+        self.counters = []
+        self.counters_lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.has_excludes or self.prefix_rules)
+
+    def __getstate__(self):
+        # Counters are per process; shard tasks report theirs back through their stats.
+        return {key: value for key, value in self.__dict__.items() if key not in {"local", "counters", "counters_lock"}}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.local = threading.local()
+        self.counters = []
+        self.counters_lock = threading.Lock()
+
+    @staticmethod
+    def last_match(matchers, name, relative_path, is_dir):
+        """Group name of the latest rule (in file order) matching the entry, or None."""
+        last_group, last_index = None, -1
+        for (anchored, dir_only), matcher in matchers:
+            if dir_only and not is_dir:
+                continue
+            target = relative_path if anchored else name
+            if target is None:
+                continue
+            match = matcher.match(target)
+            if match and int(match.lastgroup[1:]) > last_index:
+                last_group, last_index = match.lastgroup, int(match.lastgroup[1:])
+        return last_group
+
+    def match(self, dirpath, name, is_dir, path=None):
+        """Returns the label of the rule excluding this entry, or None when it should be scanned."""
+        relative_path = None
+        if self.needs_path:
+            path = path or os.path.join(dirpath, name)
+            label = self.prefix_rules.get(path)
+            if label is not None:
+                return label
+            if path.startswith(self.root_prefix):
+                relative_path = path[len(self.root_prefix) :].replace(os.sep, "/")
+
+        group = self.last_match(self.matchers, name, relative_path, is_dir)
+        if group is None or group in self.negated:
+            return None
+        return self.labels[group]
+
+    def prune(self, dirpath, name, is_dir, path=None):
+        label = self.match(dirpath, name, is_dir, path)
+        if label is None:
+            return False
+        # Per-thread counters keep the worker hot path free of shared locks.
+        counts = getattr(self.local, "counts", None)
+        if counts is None:
+            counts = self.local.counts = {}
+            with self.counters_lock:
+                self.counters.append(counts)
+        counts[label] = counts.get(label, 0) + 1
+        return True
+
+    def pruned_counts(self):
+        totals = {}
+        with self.counters_lock:
+            for counts in self.counters:
+                for label, count in list(counts.items()):
+                    totals[label] = totals.get(label, 0) + count
+        return totals
+
+    def fingerprint(self):
+        """Digest of the patterns in rule order and the resolved prefix rules."""
+        digest = hashlib.blake2b(digest_size=SNAPSHOT_RULES_DIGEST_SIZE)
+        for pattern in self.labels.values():
+            digest.update(b"p" + os.fsencode(pattern) + b"\0")
+        for prefix, label in sorted(self.prefix_rules.items()):
+            digest.update(b"x" + os.fsencode(prefix) + b"\0" + os.fsencode(label) + b"\0")
+        return digest.digest()
+
+
+def load_scan_rules(root_dir, patterns=(), prefixes=(), fstypes=(), rules_file=None, skip_pseudo_fs=False):
+    """Builds ScanRules from CLI values and an optional JSON or gitignore-style rules file; None if empty."""
+    patterns, prefixes, fstypes = list(patterns or ()), list(prefixes or ()), list(fstypes or ())
+    if rules_file:
+        with open(rules_file, "r", encoding="utf-8") as handle:
+            if rules_file.endswith(".json"):
+                config = json.load(handle)
+                patterns.extend(config.get("exclude", []))
+                patterns.extend(f"!{pattern}" for pattern in config.get("include", []))
+                prefixes.extend(config.get("exclude_prefixes", []))
+                fstypes.extend(config.get("exclude_fstypes", []))
+            else:
+                patterns.extend(line.rstrip("\n") for line in handle)
+    if skip_pseudo_fs:
+        prefixes.extend(PSEUDO_FILESYSTEM_PREFIXES)
+        fstypes.extend(PSEUDO_FILESYSTEM_TYPES)
+
+    rules = ScanRules(root_dir, patterns, prefixes, fstypes)
+    return rules if rules else None
+
+
+def rules_fingerprint(rules):
+    """Snapshot key for the active exclusion rules; scans without rules share one value."""
+    if rules is None:
+        return hashlib.blake2b(digest_size=SNAPSHOT_RULES_DIGEST_SIZE).digest()
+    return rules.fingerprint()
+
+
+def record_pruned_stats(stats, rules, baseline=None):
+    if rules is None:
+        return
+    baseline = baseline or {}
+    pruned = {label: count - baseline.get(label, 0) for label, count in rules.pruned_counts().items()}
+    pruned = {label: count for label, count in pruned.items() if count}
+    stats["pruned"] = pruned
+    stats["pruned_total"] = sum(pruned.values())
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() may go into debt and sleeps it off outside the lock."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.consumed = 0
+        self.waited = 0.0
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self.updated = time.monotonic()
+
+    def acquire(self, amount=1):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            self.consumed += amount
+            wait_seconds = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait_seconds
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+    def available_in(self):
+        """Seconds until a whole token is available (0.0 if one is now); never sleeps."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def charge(self, amount=1):
+        """Takes `amount` tokens without sleeping; any debt delays later callers instead."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - amount
+            self.updated = now
+            self.consumed += amount
+
+
+class ScanRateLimiter:
+    """Separate token buckets for directory opens and listed entries, shared by all workers of a scan."""
+
+    def __init__(self, dirs_per_sec=None, entries_per_sec=None, burst_seconds=1.0):
+        self.dirs_per_sec = dirs_per_sec
+        self.entries_per_sec = entries_per_sec
+        self.burst_seconds = burst_seconds
+        self.dir_bucket = TokenBucket(dirs_per_sec, max(1.0, dirs_per_sec * burst_seconds)) if dirs_per_sec else None
+        self.entry_bucket = (
+            TokenBucket(entries_per_sec, max(1.0, entries_per_sec * burst_seconds)) if entries_per_sec else None
+        )
+
+    def before_directory(self):
+        if self.dir_bucket is not None:
+            self.dir_bucket.acquire(1)
+
+    def after_listing(self, entry_count):
+        if self.entry_bucket is not None and entry_count:
+            self.entry_bucket.acquire(entry_count)
+
+    def dispatch_delay(self):
+        """Seconds until both budgets allow another directory, for schedulers that must not sleep in workers."""
+        return max(bucket.available_in() for bucket in (self.dir_bucket, self.entry_bucket) if bucket is not None)
+
+    def charge_directory(self):
+        if self.dir_bucket is not None:
+            self.dir_bucket.charge(1)
+
+    def charge_entries(self, entry_count):
+        if self.entry_bucket is not None and entry_count:
+            self.entry_bucket.charge(entry_count)
+
+    def split(self, parts):
+        """A limiter for one of `parts` independent processes sharing this budget."""
+        parts = max(1, parts)
+        return ScanRateLimiter(
+            self.dirs_per_sec / parts if self.dirs_per_sec else None,
+            self.entries_per_sec / parts if self.entries_per_sec else None,
+            self.burst_seconds,
+        )
+
+    def throttled_seconds(self):
+        return sum(bucket.waited for bucket in (self.dir_bucket, self.entry_bucket) if bucket is not None)
+
+
+def resolve_rate_limiter(throttle_ms=0, limiter=None):
+    """Explicit limiter wins; a legacy throttle_ms becomes a 1000/throttle_ms dirs/sec bucket with no burst."""
+    if limiter is not None:
+        return limiter
+    if throttle_ms and throttle_ms > 0:
+        return ScanRateLimiter(dirs_per_sec=1000 / throttle_ms, burst_seconds=throttle_ms / 1000)
+    return None
+
+
+def build_rate_limiter(throttle_ms=0, rate_limits=None):
+    rate_limits = rate_limits or {}
+    if rate_limits.get("dirs_per_sec") or rate_limits.get("entries_per_sec"):
+        return ScanRateLimiter(
+            dirs_per_sec=rate_limits.get("dirs_per_sec"),
+            entries_per_sec=rate_limits.get("entries_per_sec"),
+            burst_seconds=rate_limits.get("burst_seconds") or 1.0,
+        )
+    return resolve_rate_limiter(throttle_ms)
+
+
+def record_rate_limit_stats(stats, limiter):
+    if limiter is None:
+        return
+    elapsed = stats["elapsed"] or 1e-9
+    stats["rate_limit"] = {
+        "target_dirs_per_sec": limiter.dirs_per_sec,
+        "observed_dirs_per_sec": round((stats["folders"] + 1) / elapsed, 2),
+        "target_entries_per_sec": limiter.entries_per_sec,
+        "observed_entries_per_sec": round((stats["folders"] + stats["files"]) / elapsed, 2),
+        "burst_seconds": limiter.burst_seconds,
+        "throttled_worker_seconds": round(limiter.throttled_seconds(), 3),
+    }
+
+
+FileMeta = namedtuple("FileMeta", ["path", "size", "blocks", "mtime_ns", "inode", "dev", "nlink"])
+
+
+def file_meta(entry):
+    """FileMeta from DirEntry.stat(follow_symlinks=False); scandir caches it where the OS returns it."""
+    stat_result = entry.stat(follow_symlinks=False)
+    return FileMeta(
+        entry.path,
+        stat_result.st_size,
+        getattr(stat_result, "st_blocks", 0),
+        stat_result.st_mtime_ns,
+        stat_result.st_ino,
+        stat_result.st_dev,
+        stat_result.st_nlink,
+    )
+
+
+def traverse_directory(dirpath, rules=None, limiter=None, metadata=False):
+    """Returns (subfolders, files, permission_denied_count, other_error_count); FileMeta files with metadata."""
     folder_paths, file_paths = [], []
     permission_denied_count, other_error_count = 0, 0
+    entry_count = 0
 
+    if limiter is not None:
+        limiter.before_directory()
     try:
         for entry in os.scandir(dirpath):
+            entry_count += 1
             try:
                 if entry.is_dir(follow_symlinks=False):
-                    folder_paths.append(entry.path)
+                    if rules is None or not rules.prune(dirpath, entry.name, True, entry.path):
+                        folder_paths.append(entry.path)
                 elif entry.is_file(follow_symlinks=False):
-                    file_paths.append(entry.path)
+                    if rules is None or not rules.prune(dirpath, entry.name, False, entry.path):
+                        file_paths.append(file_meta(entry) if metadata else entry.path)
             except PermissionError:
                 permission_denied_count += 1
             except OSError:
@@ -58,21 +558,906 @@ def traverse_directory(dirpath):
     except OSError:
         other_error_count += 1
 
+    if limiter is not None:
+        limiter.after_listing(entry_count)
     return folder_paths, file_paths, permission_denied_count, other_error_count
 
 
+def filter_listing(dirpath, folder_paths, file_paths, rules):
+    if rules is None:
+        return folder_paths, file_paths
+    folders = [path for path in folder_paths if not rules.prune(dirpath, os.path.basename(path), True, path)]
+    files = [path for path in file_paths if not rules.prune(dirpath, os.path.basename(path), False, path)]
+    return folders, files
+
+
+class ScanIndex:
+    """Persistent sqlite3 cache of directory listings, validated by each directory's stat signature."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        self.staged = []
+        self.writer = self.connection()
+        self.writer.execute("PRAGMA journal_mode=WAL")
+        self.writer.execute("PRAGMA synchronous=NORMAL")
+        self.writer.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path BLOB PRIMARY KEY, mtime_ns INTEGER, ctime_ns INTEGER, inode INTEGER, dev INTEGER, "
+            "subdirs BLOB, files BLOB)"
+        )
+        self.writer.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def connection(self):
+        # One connection per thread: workers read concurrently while the dispatcher writes (WAL mode).
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.local.conn = conn
+            with self.connections_lock:
+                self.connections.append(conn)
+        return conn
+
+    @staticmethod
+    def signature(stat_result):
+        return (stat_result.st_mtime_ns, stat_result.st_ctime_ns, stat_result.st_ino, stat_result.st_dev)
+
+    @staticmethod
+    def pack_names(paths):
+        return b"\0".join(os.fsencode(os.path.basename(path)) for path in paths)
+
+    @staticmethod
+    def unpack_names(dirpath, blob):
+        if not blob:
+            return []
+        return [os.path.join(dirpath, os.fsdecode(name)) for name in blob.split(b"\0")]
+
+    def lookup(self, dirpath, signature):
+        """Returns (subfolders, files) when the stored signature still matches, else None."""
+        row = self.connection().execute(
+            "SELECT mtime_ns, ctime_ns, inode, dev, subdirs, files FROM dirs WHERE path = ?",
+            (os.fsencode(dirpath),),
+        ).fetchone()
+        if row is None or tuple(row[:4]) != signature:
+            return None
+        return self.unpack_names(dirpath, row[4]), self.unpack_names(dirpath, row[5])
+
+    def stage(self, dirpath, signature, folders, files):
+        self.staged.append((os.fsencode(dirpath), *signature, self.pack_names(folders), self.pack_names(files)))
+        if len(self.staged) >= SCAN_INDEX_COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        if not self.staged:
+            return
+        self.prune_vanished_subdirs(self.staged)
+        self.writer.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?)", self.staged)
+        self.writer.commit()
+        self.staged = []
+
+    def prune_vanished_subdirs(self, rows):
+        """Drops the index rows of subtrees that vanished from the staged listings, with one lookup per batch."""
+        self.writer.execute("CREATE TEMP TABLE IF NOT EXISTS staged_paths (path BLOB PRIMARY KEY)")
+        self.writer.execute("DELETE FROM staged_paths")
+        self.writer.executemany("INSERT OR IGNORE INTO staged_paths VALUES (?)", ((row[0],) for row in rows))
+        previous = dict(
+            self.writer.execute("SELECT d.path, d.subdirs FROM dirs d JOIN staged_paths s ON s.path = d.path")
+        )
+        separator = os.fsencode(os.sep)
+        vanished = []
+        for row in rows:
+            path_key, new_subdirs = row[0], row[5]
+            old_subdirs = previous.get(path_key)
+            if not old_subdirs or old_subdirs == new_subdirs:
+                continue
+            current = set(new_subdirs.split(b"\0")) if new_subdirs else set()
+            for name in set(old_subdirs.split(b"\0")) - current:
+                child = os.path.join(path_key, name)
+                vanished.append((child, child + separator, child + bytes([separator[0] + 1])))
+        self.writer.executemany("DELETE FROM dirs WHERE path = ? OR (path > ? AND path < ?)", vanished)
+
+    def close(self):
+        try:
+            self.commit()
+        finally:
+            with self.connections_lock:
+                for conn in self.connections:
+                    conn.close()
+                self.connections = []
+
+
+def traverse_directory_indexed(dirpath, scan_index, rules=None, limiter=None):
+    """traverse_directory plus (cache_hit, index_row); skips os.scandir on unchanged directories."""
+    if limiter is not None:
+        limiter.before_directory()
+    try:
+        signature = ScanIndex.signature(os.stat(dirpath, follow_symlinks=False))
+    except PermissionError:
+        return [], [], 1, 0, False, None
+    except OSError:
+        return [], [], 0, 1, False, None
+
+    cached = scan_index.lookup(dirpath, signature)
+    if cached is not None:
+        return (*filter_listing(dirpath, cached[0], cached[1], rules), 0, 0, True, None)
+
+    folder_paths, file_paths, denied, errors = traverse_directory(dirpath)
+    if limiter is not None:
+        limiter.after_listing(len(folder_paths) + len(file_paths))
+    index_row = (signature, folder_paths, file_paths) if not denied and not errors else None
+    return (*filter_listing(dirpath, folder_paths, file_paths, rules), denied, errors, False, index_row)
+
+
+class CompactTree:
+    """Columnar directory tree: parent indices and interned name ids, with full paths rebuilt on demand."""
+
+    __slots__ = (
+        "name_blob",
+        "name_offsets",
+        "intern_cache",
+        "dir_parent",
+        "dir_name",
+        "dir_file_start",
+        "dir_file_count",
+        "file_name",
+    )
+
+    def __init__(self, root_dir):
+        self.name_blob = bytearray()
+        self.name_offsets = array("q", [0])
+        self.intern_cache = OrderedDict()
+        self.dir_parent = array("i")
+        self.dir_name = array("i")
+        self.dir_file_start = array("q")
+        self.dir_file_count = array("i")
+        self.file_name = array("i")
+        self.add_dir(-1, root_dir)
+
+    def __len__(self):
+        return len(self.dir_parent)
+
+    @property
+    def file_total(self):
+        return len(self.file_name)
+
+    def intern(self, name):
+        name_id = self.intern_cache.get(name)
+        if name_id is not None:
+            self.intern_cache.move_to_end(name)
+            return name_id
+        # LRU bound: recurring names (__init__.py, index.js, ...) stay shared however large the tree grows.
+        if len(self.intern_cache) >= COMPACT_TREE_NAME_LRU:
+            self.intern_cache.popitem(last=False)
+        name_id = len(self.name_offsets) - 1
+        self.name_blob += os.fsencode(name)
+        self.name_offsets.append(len(self.name_blob))
+        self.intern_cache[name] = name_id
+        return name_id
+
+    def release_intern_cache(self):
+        self.intern_cache = OrderedDict()
+
+    def name(self, name_id):
+        return os.fsdecode(bytes(self.name_blob[self.name_offsets[name_id] : self.name_offsets[name_id + 1]]))
+
+    def add_dir(self, parent_id, name):
+        self.dir_parent.append(parent_id)
+        self.dir_name.append(self.intern(name))
+        self.dir_file_start.append(0)
+        self.dir_file_count.append(0)
+        return len(self.dir_parent) - 1
+
+    def set_files(self, dir_id, file_names):
+        self.dir_file_start[dir_id] = len(self.file_name)
+        self.dir_file_count[dir_id] = len(file_names)
+        self.file_name.extend(self.intern(name) for name in file_names)
+
+    def dir_path(self, dir_id):
+        components = []
+        while dir_id >= 0:
+            components.append(self.name(self.dir_name[dir_id]))
+            dir_id = self.dir_parent[dir_id]
+        return os.path.join(*reversed(components))
+
+    def file_paths(self, dir_id, folder=None):
+        folder = folder if folder is not None else self.dir_path(dir_id)
+        start = self.dir_file_start[dir_id]
+        end = start + self.dir_file_count[dir_id]
+        return [os.path.join(folder, self.name(name_id)) for name_id in self.file_name[start:end]]
+
+    def items(self):
+        # Siblings are added together, so caching the last parent's path avoids most parent-chain walks.
+        last_parent, last_parent_path = None, None
+        for dir_id in range(len(self.dir_parent)):
+            parent_id = self.dir_parent[dir_id]
+            if parent_id < 0:
+                folder = self.name(self.dir_name[dir_id])
+            else:
+                if parent_id != last_parent:
+                    last_parent, last_parent_path = parent_id, self.dir_path(parent_id)
+                folder = os.path.join(last_parent_path, self.name(self.dir_name[dir_id]))
+            yield folder, self.file_paths(dir_id, folder)
+
+    def nbytes(self):
+        columns = (
+            self.name_offsets,
+            self.dir_parent,
+            self.dir_name,
+            self.dir_file_start,
+            self.dir_file_count,
+            self.file_name,
+        )
+        return len(self.name_blob) + sum(column.itemsize * len(column) for column in columns)
+
+
+def build_compact_tree(root_dir, scan_records):
+    """Folds (folder, subfolders, files) records into a CompactTree; only the open frontier is keyed by path."""
+    tree = CompactTree(root_dir)
+    open_dirs = {root_dir: 0}
+    for folder, subfolders, files in scan_records:
+        dir_id = open_dirs.pop(folder)
+        tree.set_files(dir_id, [os.path.basename(file) for file in files])
+        for subfolder in subfolders:
+            open_dirs[subfolder] = tree.add_dir(dir_id, os.path.basename(subfolder))
+    tree.release_intern_cache()
+    return tree
+
+
+class DiskUsageRollup:
+    """Recursive size/file totals folded bottom-up as records stream in; hardlinks are sized once."""
+
+    def __init__(self, root_dir, top_n=LARGEST_SUBTREES_TOP):
+        self.root_dir = root_dir
+        self.top_n = top_n
+        self.open_dirs = {}
+        self.largest = []
+        self.seen_links = set()
+        self.hardlinks_deduplicated = 0
+        self.total = None
+
+    def track(self, records):
+        """Passes (folder, subfolders, files) records through as (folder, files) while rolling them up."""
+        for folder, subfolders, files in records:
+            self.add(folder, len(subfolders), files)
+            yield folder, files
+
+    def add(self, dirpath, subfolder_count, files):
+        size, blocks = 0, 0
+        for meta in files:
+            if meta.nlink > 1:
+                link_key = (meta.dev, meta.inode)
+                if link_key in self.seen_links:
+                    self.hardlinks_deduplicated += 1
+                    continue
+                self.seen_links.add(link_key)
+            size += meta.size
+            blocks += meta.blocks
+        self.open_dirs[dirpath] = [size, blocks, len(files), subfolder_count]
+        if not subfolder_count:
+            self.finish(dirpath)
+
+    def finish(self, dirpath):
+        while True:
+            size, blocks, file_count, _ = self.open_dirs.pop(dirpath)
+            entry = (size, dirpath, file_count, blocks * 512)
+            if len(self.largest) < self.top_n:
+                heapq.heappush(self.largest, entry)
+            elif size > self.largest[0][0]:
+                heapq.heapreplace(self.largest, entry)
+
+            parent = self.open_dirs.get(os.path.dirname(dirpath)) if dirpath != self.root_dir else None
+            if parent is None:
+                if dirpath == self.root_dir:
+                    self.total = entry
+                return
+            parent[0] += size
+            parent[1] += blocks
+            parent[2] += file_count
+            parent[3] -= 1
+            if parent[3]:
+                return
+            dirpath = os.path.dirname(dirpath)
+
+    def summary(self):
+        size, _, file_count, allocated = self.total if self.total is not None else (None, None, None, None)
+        return {
+            "total_bytes": size,
+            "allocated_bytes": allocated,
+            "files": file_count,
+            "hardlinks_deduplicated": self.hardlinks_deduplicated,
+            "incomplete_dirs": len(self.open_dirs),
+            "largest_subtrees": [
+                {"path": dirpath, "bytes": size, "allocated_bytes": allocated, "files": file_count}
+                for size, dirpath, file_count, allocated in sorted(self.largest, reverse=True)
+            ],
+        }
+
+
+def format_size(num_bytes):
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(num_bytes) < 1024 or unit == "TiB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+def format_metadata_report_block(folder, files):
+    lines = [f"{folder}:\n"]
+    lines.extend(f"    {meta.size:>14}  {meta.path}\n" for meta in files)
+    lines.append("\n")
+    return "".join(lines)
+
+
+def append_largest_subtrees(file_path, disk_usage):
+    try:
+        with open(file_path, "a", encoding="latin-1", errors="replace") as report_file:
+            report_file.write(f"Largest subtrees (top {len(disk_usage['largest_subtrees'])}):\n")
+            for item in disk_usage["largest_subtrees"]:
+                report_file.write(f"    {format_size(item['bytes']):>12}  {item['files']:>10} files  {item['path']}\n")
+    except Exception as error:
+        print(f"Error writing report: {error}")
+
+
+def format_report_block(folder, files):
+    lines = [f"{folder}:\n"]
+    lines.extend(f"    {file}\n" for file in files)
+    lines.append("\n")
+    return "".join(lines)
+
+
 def write_report(file_path, folder_files_map):
     try:
         with open(file_path, "w", encoding="latin-1", errors="replace") as report_file:
             for folder, files in folder_files_map.items():
-                report_file.write(f"{folder}:\n")
-                for file in files:
-                    report_file.write(f"    {file}\n")
-                report_file.write("\n")
+                report_file.write(format_report_block(folder, files))
     except Exception as error:
         print(f"Error writing report: {error}")
 
 
+class BinaryReportWriter:
+    """Streams (folder, files) blocks into the indexed binary report format."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.handle = open(file_path, "wb")
+        self.handle.write(BINARY_HEADER.pack(BINARY_REPORT_MAGIC, BINARY_REPORT_VERSION))
+        self.strings = tempfile.TemporaryFile()
+        self.string_offsets = array("Q")
+        self.strings_size = 0
+        self.intern_cache = {}
+        self.dir_index = []
+        self.file_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.handle.close()
+            self.strings.close()
+
+    def string_id(self, raw):
+        self.string_offsets.append(self.strings_size)
+        self.strings.write(struct.pack("<I", len(raw)))
+        self.strings.write(raw)
+        self.strings_size += 4 + len(raw)
+        return len(self.string_offsets) - 1
+
+    def name_id(self, name):
+        name_id = self.intern_cache.get(name)
+        if name_id is None:
+            if len(self.intern_cache) >= COMPACT_TREE_INTERN_LIMIT:
+                self.intern_cache.clear()
+            name_id = self.intern_cache[name] = self.string_id(os.fsencode(name))
+        return name_id
+
+    def add(self, folder, files):
+        raw_folder = os.fsencode(folder)
+        folder_id = self.string_id(raw_folder)
+        self.dir_index.append((raw_folder, folder_id, self.handle.tell()))
+        name_ids = array("I", (self.name_id(os.path.basename(getattr(file, "path", file))) for file in files))
+        if sys.byteorder != "little":
+            name_ids.byteswap()
+        self.handle.write(BINARY_RECORD.pack(folder_id, len(name_ids)))
+        self.handle.write(name_ids.tobytes())
+        self.file_count += len(name_ids)
+
+    def close(self):
+        records_end = self.handle.tell()
+        self.strings.seek(0)
+        shutil.copyfileobj(self.strings, self.handle)
+        self.strings.close()
+
+        offsets_start = self.handle.tell()
+        if sys.byteorder != "little":
+            self.string_offsets.byteswap()
+        self.handle.write(self.string_offsets.tobytes())
+
+        index_start = self.handle.tell()
+        self.dir_index.sort()
+        for _, folder_id, record_offset in self.dir_index:
+            self.handle.write(BINARY_INDEX_ENTRY.pack(folder_id, record_offset))
+
+        self.handle.write(
+            BINARY_FOOTER.pack(
+                len(self.dir_index),
+                self.file_count,
+                len(self.string_offsets),
+                records_end,
+                offsets_start,
+                index_start,
+                0,
+                BINARY_REPORT_MAGIC,
+            )
+        )
+        self.handle.close()
+
+
+class BinaryReportReader:
+    """mmap-backed random access to a binary report; nothing is loaded beyond the pages touched."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(file_path, "rb") as handle:
+            self.mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = BINARY_HEADER.unpack_from(self.mapped, 0)
+        if magic != BINARY_REPORT_MAGIC or version != BINARY_REPORT_VERSION:
+            self.mapped.close()
+            raise ValueError(f"Not a DirectoryNator binary report (v{BINARY_REPORT_VERSION}): {file_path}")
+        (
+            self.dir_count,
+            self.file_count,
+            self.string_count,
+            self.strings_start,
+            self.offsets_start,
+            self.index_start,
+            _,
+            _,
+        ) = BINARY_FOOTER.unpack_from(self.mapped, len(self.mapped) - BINARY_FOOTER.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.dir_count
+
+    def close(self):
+        self.mapped.close()
+
+    def raw_string(self, string_id):
+        (relative,) = struct.unpack_from("<Q", self.mapped, self.offsets_start + 8 * string_id)
+        position = self.strings_start + relative
+        (length,) = struct.unpack_from("<I", self.mapped, position)
+        return self.mapped[position + 4 : position + 4 + length]
+
+    def index_entry(self, position):
+        folder_id, record_offset = BINARY_INDEX_ENTRY.unpack_from(
+            self.mapped, self.index_start + position * BINARY_INDEX_ENTRY.size
+        )
+        return self.raw_string(folder_id), record_offset
+
+    def lower_bound(self, raw_folder):
+        low, high = 0, self.dir_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.index_entry(middle)[0] < raw_folder:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def record(self, record_offset):
+        """Returns (folder, [file paths]) for the record at record_offset."""
+        folder_id, file_count = BINARY_RECORD.unpack_from(self.mapped, record_offset)
+        name_ids = struct.unpack_from(f"<{file_count}I", self.mapped, record_offset + BINARY_RECORD.size)
+        raw_folder = self.raw_string(folder_id)
+        folder = os.fsdecode(raw_folder)
+        return folder, [os.fsdecode(os.path.join(raw_folder, self.raw_string(name_id))) for name_id in name_ids]
+
+    def listing(self, folder):
+        """File paths directly inside `folder`, or None when the report has no such folder."""
+        raw_folder = os.fsencode(folder)
+        position = self.lower_bound(raw_folder)
+        if position < self.dir_count:
+            found, record_offset = self.index_entry(position)
+            if found == raw_folder:
+                return self.record(record_offset)[1]
+        return None
+
+    def iter_subtree(self, folder):
+        """Yields (folder, files) for `folder` and every folder below it, in path order."""
+        raw_folder = os.fsencode(folder.rstrip(os.sep) or os.sep)
+        position = self.lower_bound(raw_folder)
+        if position < self.dir_count and self.index_entry(position)[0] == raw_folder:
+            yield self.record(self.index_entry(position)[1])
+        prefix = raw_folder if raw_folder.endswith(os.fsencode(os.sep)) else raw_folder + os.fsencode(os.sep)
+        position = self.lower_bound(prefix)
+        while position < self.dir_count:
+            found, record_offset = self.index_entry(position)
+            if not found.startswith(prefix):
+                return
+            yield self.record(record_offset)
+            position += 1
+
+    def items(self):
+        """Yields (folder, files) in the order the scan wrote them."""
+        record_offset = BINARY_HEADER.size
+        while record_offset < self.strings_start:
+            folder_id, file_count = BINARY_RECORD.unpack_from(self.mapped, record_offset)
+            yield self.record(record_offset)
+            record_offset += BINARY_RECORD.size + 4 * file_count
+
+
+class SnapshotSorter:
+    """External sort of (path bytes, kind, size, mtime_ns) entries into a path-ordered snapshot file."""
+
+    def __init__(self, snapshot_path, run_size=SNAPSHOT_SORT_RUN, rules_digest=None):
+        self.snapshot_path = snapshot_path
+        self.run_size = run_size
+        self.rules_digest = rules_digest or rules_fingerprint(None)
+        self.entries = []
+        self.runs = []
+        self.count = 0
+
+    def add(self, raw_path, kind, size=-1, mtime_ns=-1):
+        self.entries.append((raw_path, kind, size, mtime_ns))
+        self.count += 1
+        if len(self.entries) >= self.run_size:
+            self.spill()
+
+    def track(self, records):
+        """Passes (folder, subfolders, files) records through while adding their entries."""
+        for record in records:
+            folder, _, files = record
+            self.add(os.fsencode(folder), 0)
+            for file in files:
+                if isinstance(file, FileMeta):
+                    self.add(os.fsencode(file.path), 1, file.size, file.mtime_ns)
+                else:
+                    self.add(os.fsencode(file), 1)
+            yield record
+
+    def spill(self):
+        self.entries.sort()
+        run = tempfile.TemporaryFile()
+        write_snapshot_entries(run, self.entries)
+        run.seek(0)
+        self.runs.append(run)
+        self.entries = []
+
+    def finish(self):
+        if self.runs:
+            if self.entries:
+                self.spill()
+            merged = heapq.merge(*(read_snapshot_entries(run) for run in self.runs))
+        else:
+            self.entries.sort()
+            merged = self.entries
+        try:
+            with open(self.snapshot_path, "wb") as snapshot_file:
+                snapshot_file.write(SNAPSHOT_MAGIC + self.rules_digest)
+                write_snapshot_entries(snapshot_file, merged)
+        finally:
+            for run in self.runs:
+                run.close()
+            self.runs, self.entries = [], []
+        return self.count
+
+
+def write_snapshot_entries(handle, entries):
+    for raw_path, kind, size, mtime_ns in entries:
+        handle.write(SNAPSHOT_RECORD.pack(kind, len(raw_path), size, mtime_ns))
+        handle.write(raw_path)
+
+
+def read_snapshot_entries(handle):
+    while True:
+        header = handle.read(SNAPSHOT_RECORD.size)
+        if len(header) < SNAPSHOT_RECORD.size:
+            return
+        kind, length, size, mtime_ns = SNAPSHOT_RECORD.unpack(header)
+        yield handle.read(length), kind, size, mtime_ns
+
+
+def read_snapshot_rules(snapshot_path):
+    """Rules fingerprint from a snapshot header, or None for a missing, older or foreign file."""
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            header = snapshot_file.read(len(SNAPSHOT_MAGIC) + SNAPSHOT_RULES_DIGEST_SIZE)
+    except OSError:
+        return None
+    if len(header) != len(SNAPSHOT_MAGIC) + SNAPSHOT_RULES_DIGEST_SIZE or not header.startswith(SNAPSHOT_MAGIC):
+        return None
+    return header[len(SNAPSHOT_MAGIC) :]
+
+
+def iter_snapshot(snapshot_path):
+    with open(snapshot_path, "rb", buffering=1 << 20) as snapshot_file:
+        if snapshot_file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a DirectoryNator snapshot: {snapshot_path}")
+        snapshot_file.read(SNAPSHOT_RULES_DIGEST_SIZE)
+        yield from read_snapshot_entries(snapshot_file)
+
+
+def diff_snapshots(previous_path, current_path, diff_path):
+    """Sorted-merge diff of two snapshots into a line-per-change artifact; returns the change counts."""
+    counts = {
+        "added_dirs": 0,
+        "added_files": 0,
+        "removed_dirs": 0,
+        "removed_files": 0,
+        "changed_files": 0,
+    }
+
+    def emit(marker, entry, detail=""):
+        raw_path, kind = entry[0], entry[1]
+        diff_file.write(f"{marker} {SNAPSHOT_KINDS[kind]} {os.fsdecode(raw_path)}{detail}\n")
+
+    def record(action, entry):
+        counts[f"{action}_{'dirs' if entry[1] == 0 else 'files'}"] += 1
+        emit("+" if action == "added" else "-", entry)
+
+    with open(diff_path, "w", encoding="utf-8", errors="surrogateescape") as diff_file:
+        previous_entries, current_entries = iter_snapshot(previous_path), iter_snapshot(current_path)
+        old, new = next(previous_entries, None), next(current_entries, None)
+        while old is not None or new is not None:
+            if new is None or (old is not None and old[0] < new[0]):
+                record("removed", old)
+                old = next(previous_entries, None)
+            elif old is None or new[0] < old[0]:
+                record("added", new)
+                new = next(current_entries, None)
+            else:
+                if old[1] != new[1]:
+                    record("removed", old)
+                    record("added", new)
+                elif new[1] == 1 and old[2] >= 0 and new[2] >= 0 and old[2:] != new[2:]:
+                    counts["changed_files"] += 1
+                    emit("~", new, f"\tsize {old[2]}->{new[2]} mtime_ns {old[3]}->{new[3]}")
+                old, new = next(previous_entries, None), next(current_entries, None)
+    counts["total_changes"] = sum(counts.values())
+    return counts
+
+
+def root_key(root_dir):
+    return hashlib.blake2b(os.fsencode(root_dir), digest_size=6).hexdigest()
+
+
+def report_label(root_dir):
+    """Root basename made safe for a file name, so per-root reports are recognisable at a glance."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.basename(root_dir.rstrip(os.sep))).strip("._") or "root"
+
+
+def snapshot_path_for(output_folder, root_dir):
+    return os.path.join(output_folder, f"directorynator_snapshot_{root_key(root_dir)}.bin")
+
+
+class CheckpointJournal:
+    """Append-only JSONL log of finished directories, enough to rebuild the report and the frontier."""
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.handle = None
+        self.last_sync = time.monotonic()
+        self.lines_written = 0
+
+    def open(self, root_dir, metadata=False, append=False):
+        if append:
+            self.truncate_torn_tail()
+        self.handle = open(self.journal_path, "a" if append else "w", encoding="utf-8")
+        if not append:
+            self.write({"root": root_dir, "metadata": metadata, "started": datetime.datetime.now().isoformat()})
+            self.sync()
+
+    def truncate_torn_tail(self, chunk_size=1 << 16):
+        """Cuts the file back to its last complete line; returns the number of bytes dropped."""
+        with open(self.journal_path, "rb+") as journal_file:
+            size = end = journal_file.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(0, end - chunk_size)
+                journal_file.seek(start)
+                newline = journal_file.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                journal_file.truncate(end)
+        return size - end
+
+    def write(self, payload):
+        self.handle.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        self.lines_written += 1
+        if time.monotonic() - self.last_sync >= CHECKPOINT_SYNC_SECONDS:
+            self.sync()
+
+    def sync(self):
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        self.last_sync = time.monotonic()
+
+    def track(self, records):
+        """Passes (folder, subfolders, files) records through while journaling them."""
+        for record in records:
+            folder, subfolders, files = record
+            self.write(
+                {
+                    "d": folder,
+                    "s": [os.path.basename(path) for path in subfolders],
+                    "f": [
+                        (
+                            [os.path.basename(file.path), *file[1:]]
+                            if isinstance(file, FileMeta)
+                            else os.path.basename(file)
+                        )
+                        for file in files
+                    ],
+                }
+            )
+            yield record
+
+    def close(self, completed=False):
+        if self.handle is not None:
+            self.sync()
+            self.handle.close()
+            self.handle = None
+        if completed:
+            os.remove(self.journal_path)
+
+    def entries(self):
+        """Yields journaled (folder, subfolders, files) records; stops at a torn trailing line."""
+        with open(self.journal_path, "r", encoding="utf-8") as journal_file:
+            next(journal_file, None)
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return
+                folder = entry["d"]
+                files = [
+                    FileMeta(os.path.join(folder, file[0]), *file[1:])
+                    if isinstance(file, list)
+                    else os.path.join(folder, file)
+                    for file in entry["f"]
+                ]
+                yield folder, [os.path.join(folder, name) for name in entry["s"]], files
+
+    def header(self):
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as journal_file:
+                return json.loads(journal_file.readline())
+        except (OSError, ValueError):
+            return {}
+
+    def frontier(self, root_dir):
+        """Directories announced by a finished parent but not finished themselves, in discovery order."""
+        pending = {root_dir: None}
+        for folder, subfolders, _ in self.entries():
+            pending.pop(folder, None)
+            pending.update(dict.fromkeys(subfolders))
+        return list(pending)
+
+
+def replay_journal(journal, counts):
+    for record in journal.entries():
+        counts["dirs"] += 1
+        counts["folders"] += len(record[1])
+        counts["files"] += len(record[2])
+        yield record
+
+
+def iter_text_report(file_path):
+    """Parses a text report (plain or with sizes) back into (folder, files) blocks."""
+    folder, files = None, []
+    with open(file_path, "r", encoding="latin-1") as report_file:
+        for line in report_file:
+            line = line.rstrip("\n")
+            if line.startswith("    "):
+                if folder is not None:
+                    entry = line[4:]
+                    if not entry.startswith(folder):
+                        entry = entry.lstrip().split("  ", 1)[-1]
+                    files.append(entry)
+            elif line.endswith(":") and folder is None and os.path.isabs(line[:-1]):
+                folder, files = line[:-1], []
+            elif not line and folder is not None:
+                yield folder, files
+                folder = None
+            elif line:
+                break
+    if folder is not None:
+        yield folder, files
+
+
+def convert_report(input_path, output_path=None):
+    """Converts text -> binary or binary -> text, picked by the input's magic bytes; returns output_path."""
+    with open(input_path, "rb") as handle:
+        is_binary = handle.read(len(BINARY_REPORT_MAGIC)) == BINARY_REPORT_MAGIC
+    if is_binary:
+        output_path = output_path or os.path.splitext(input_path)[0] + ".txt"
+        with BinaryReportReader(input_path) as reader:
+            with open(output_path, "w", encoding="latin-1", errors="replace") as report_file:
+                for folder, files in reader.items():
+                    report_file.write(format_report_block(folder, files))
+    else:
+        output_path = output_path or os.path.splitext(input_path)[0] + BINARY_REPORT_EXTENSION
+        with BinaryReportWriter(output_path) as writer:
+            for folder, files in iter_text_report(input_path):
+                writer.add(folder, files)
+    return output_path
+
+
+def write_report_stream(
+    file_path,
+    folder_results,
+    buffer_limit=REPORT_STREAM_BUFFER,
+    timings=None,
+    formatter=format_report_block,
+    binary_path=None,
+):
+    """Writes (folder, files) pairs to text and/or binary reports on a writer thread via a bounded buffer."""
+    buffer = queue.Queue(maxsize=max(1, buffer_limit))
+    written = {"folders": 0}
+    write_seconds = 0.0
+
+    def writer():
+        nonlocal write_seconds
+        try:
+            with contextlib.ExitStack() as sinks:
+                emitters = []
+                if file_path is not None:
+                    report_file = sinks.enter_context(open(file_path, "w", encoding="latin-1", errors="replace"))
+                    emitters.append(lambda folder, files: report_file.write(formatter(folder, files)))
+                if binary_path is not None:
+                    emitters.append(sinks.enter_context(BinaryReportWriter(binary_path)).add)
+                while True:
+                    item = buffer.get()
+                    if item is None:
+                        return
+                    started = time.perf_counter() if timings is not None else None
+                    for emit in emitters:
+                        emit(*item)
+                    if started is not None:
+                        write_seconds += time.perf_counter() - started
+                    written["folders"] += 1
+        except Exception as error:
+            print(f"Error writing report: {error}")
+            # Keep draining so the producer never blocks on a dead writer.
+            while buffer.get() is not None:
+                pass
+
+    writer_thread = threading.Thread(target=writer, name="directorynator-report-writer", daemon=True)
+    writer_thread.start()
+    blocked_seconds = 0.0
+    try:
+        for folder, files in folder_results:
+            if timings is None or not buffer.full():
+                buffer.put((folder, files))
+            else:
+                started = time.perf_counter()
+                buffer.put((folder, files))
+                blocked_seconds += time.perf_counter() - started
+    finally:
+        buffer.put(None)
+        writer_thread.join()
+    if timings is not None:
+        timings["report_write_seconds"] = round(write_seconds, 4)
+        timings["report_producer_blocked_seconds"] = round(blocked_seconds, 4)
+    return written["folders"]
+
+
 def write_small_results_file(output_folder, payload, label):
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     path = os.path.join(output_folder, f"directorynator_{label}_summary_{timestamp}.json")
@@ -98,118 +1483,2642 @@ def detect_recommended_threads(user_threads=None):
     return min(128, int(logical_cores * 1.25))
 
 
-def multithread_scan(root_dir, thread_count, throttle_ms=0):
-    """Threaded traversal with dynamic scheduling and optional throttling."""
-    folder_files_map = {}
-    folder_count, file_count = 0, 0
-    permission_denied_count, other_error_count = 0, 0
+class ConcurrencyController:
+    """Hill-climbing controller for the active worker count, halving it when scandir latency climbs."""
 
-    pending_dirs = deque([root_dir])
-    active_futures = {}
-    inflight_limit = max(thread_count * 4, 8)
-    start_time = time.time()
+    def __init__(
+        self,
+        initial,
+        minimum=1,
+        maximum=ADAPTIVE_MAX_WORKERS,
+        window_seconds=ADAPTIVE_WINDOW_SECONDS,
+        tolerance=0.05,
+        latency_factor=4.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.active = min(max(initial, self.minimum), self.maximum)
+        self.initial = self.active
+        self.window_seconds = window_seconds
+        self.tolerance = tolerance
+        self.latency_factor = latency_factor
+        self.direction, self.step = 1, max(1, self.active // 4)
+        self.last_rate, self.best_latency = None, None
+        self.best_rate, self.best_workers = 0.0, self.active
+        self.started = self.window_start = time.time()
+        self.window_dirs, self.window_latency = 0, 0.0
+        self.trajectory = []
 
-    with ThreadPoolExecutor(max_workers=thread_count) as executor:
-        while pending_dirs or active_futures:
-            while pending_dirs and len(active_futures) < inflight_limit:
-                current_dir = pending_dirs.popleft()
-                folder_files_map.setdefault(current_dir, [])
-                active_futures[executor.submit(traverse_directory, current_dir)] = current_dir
+    def record(self, latency):
+        self.window_dirs += 1
+        self.window_latency += latency
 
-                if throttle_ms > 0:
-                    time.sleep(throttle_ms / 1000)
+    def maybe_adjust(self, now=None):
+        """Closes the window when it is long enough; returns True if the active count changed."""
+        if now is None:
+            now = time.time()
+        elapsed = now - self.window_start
+        if elapsed < self.window_seconds or self.window_dirs < ADAPTIVE_MIN_WINDOW_DIRS:
+            return False
 
-            if not active_futures:
-                continue
+        rate = self.window_dirs / elapsed
+        latency = self.window_latency / self.window_dirs
+        previous = self.active
+        if rate > self.best_rate:
+            self.best_rate, self.best_workers = rate, previous
+        if self.best_latency is None or latency < self.best_latency:
+            self.best_latency = latency
 
-            completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
-            for future in completed:
-                current_dir = active_futures.pop(future)
-                try:
-                    result_folders, result_files, denied, errors = future.result()
-                    folder_files_map[current_dir].extend(result_files)
-                    file_count += len(result_files)
-                    permission_denied_count += denied
-                    other_error_count += errors
+        if self.best_latency and latency > self.best_latency * self.latency_factor and previous > self.minimum:
+            self.active = max(self.minimum, previous // 2)
+            self.direction, self.step = 1, 1
+            # Re-baseline on the next window; a stale best would otherwise keep cutting on a slower device.
+            self.best_latency = None
+        else:
+            if self.last_rate is not None:
+                if rate < self.last_rate * (1 - self.tolerance):
+                    self.direction = -self.direction
+                    self.step = max(1, self.step // 2)
+                elif rate > self.last_rate * (1 + self.tolerance):
+                    self.step = min(self.step * 2, max(1, self.maximum // 4))
+            self.active = min(self.maximum, max(self.minimum, previous + self.direction * self.step))
+            if self.active == previous:
+                self.direction = -self.direction
 
-                    for folder in result_folders:
-                        if folder not in folder_files_map:
-                            folder_files_map[folder] = []
-                            pending_dirs.append(folder)
-                            folder_count += 1
+        self.trajectory.append(
+            {
+                "t": round(now - self.started, 3),
+                "workers": previous,
+                "dirs_per_sec": round(rate, 1),
+                "avg_scandir_ms": round(latency * 1000, 3),
+                "next_workers": self.active,
+            }
+        )
+        if len(self.trajectory) > ADAPTIVE_TRAJECTORY_LIMIT:
+            self.trajectory = self.trajectory[::2]
+        self.last_rate = rate
+        self.window_start, self.window_dirs, self.window_latency = now, 0, 0.0
+        return self.active != previous
+
+    def summary(self):
+        return {
+            "adaptive": True,
+            "workers_initial": self.initial,
+            "workers_final": self.active,
+            "workers_best": self.best_workers,
+            "best_dirs_per_sec": round(self.best_rate, 1),
+            "concurrency_trajectory": self.trajectory,
+        }
+
+
+def timed_call(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def instrumented_call(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, threading.get_ident(), result
+
+
+def log2_bucket_label(bucket, unit):
+    if bucket <= 1:
+        return f"{bucket}{unit}"
+    return f"{1 << (bucket - 1)}-{(1 << bucket) - 1}{unit}"
+
+
+class ScanProfiler:
+    """Dispatcher-side scan instrumentation with power-of-two histograms; dispatcher thread only."""
+
+    def __init__(self, top_n=PROFILE_TOP_DIRS):
+        self.top_n = top_n
+        self.latency_buckets = [0] * 40
+        self.entry_buckets = [0] * 40
+        self.slowest = []
+        self.worker_busy = {}
+        self.depth_samples = []
+        self.next_sample = 0.0
+        self.dispatcher_wait = 0.0
+        self.started = time.perf_counter()
+
+    def record(self, dirpath, latency, worker, entry_count):
+        self.latency_buckets[min(39, int(latency * 1_000_000).bit_length())] += 1
+        self.entry_buckets[min(39, entry_count.bit_length())] += 1
+        self.worker_busy[worker] = self.worker_busy.get(worker, 0.0) + latency
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, (latency, dirpath, entry_count))
+        elif latency > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (latency, dirpath, entry_count))
+
+    def sample_depth(self, pending, active):
+        now = time.perf_counter()
+        if now < self.next_sample:
+            return
+        self.next_sample = now + PROFILE_SAMPLE_INTERVAL
+        self.depth_samples.append({"t": round(now - self.started, 3), "pending_dirs": pending, "active": active})
+        if len(self.depth_samples) > PROFILE_SAMPLE_LIMIT:
+            self.depth_samples = self.depth_samples[::2]
+
+    @staticmethod
+    def histogram(buckets, unit):
+        return {log2_bucket_label(index, unit): count for index, count in enumerate(buckets) if count}
+
+    @staticmethod
+    def bucket_percentile(buckets, fraction):
+        """Upper bound of the bucket holding the given fraction of samples."""
+        target = sum(buckets) * fraction
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if count and seen >= target:
+                return (1 << index) - 1 if index else 0
+        return 0
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        busy_total = sum(self.worker_busy.values())
+        capacity = len(self.worker_busy) * elapsed
+        return {
+            "scandir_latency_us": self.histogram(self.latency_buckets, "us"),
+            "scandir_latency_p50_us_max": self.bucket_percentile(self.latency_buckets, 0.50),
+            "scandir_latency_p99_us_max": self.bucket_percentile(self.latency_buckets, 0.99),
+            "entries_per_dir": self.histogram(self.entry_buckets, ""),
+            "queue_depth_samples": self.depth_samples,
+            "worker_busy_seconds": round(busy_total, 4),
+            "worker_utilization": round(busy_total / capacity, 4) if capacity > 0 else 0.0,
+            "worker_busy_ratio_by_thread": sorted(
+                (round(busy / elapsed, 4) for busy in self.worker_busy.values()), reverse=True
+            )
+            if elapsed > 0
+            else [],
+            "dispatcher_wait_seconds": round(self.dispatcher_wait, 4),
+            "slowest_dirs": [
+                {"path": dirpath, "seconds": round(latency, 6), "entries": entry_count}
+                for latency, dirpath, entry_count in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+def prometheus_label(value):
+    """Escapes a label value for the Prometheus text format: backslash, double quote and newline."""
+    return str(value or "").replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ScanProgress:
+    """Live scan counters written by the dispatcher and read without locks by the progress reporters."""
+
+    def __init__(self, history_path=None):
+        self.history_path = history_path
+        self.history = {}
+        if history_path is not None:
+            try:
+                with open(history_path, "r", encoding="utf-8") as history_file:
+                    self.history = json.load(history_file)
+            except (OSError, ValueError):
+                self.history = {}
+        self.read_lock = threading.Lock()
+        self.begin(None, phase="idle")
+
+    def begin(self, root_dir, phase="scan"):
+        self.root, self.phase = root_dir, phase
+        self.scanned = self.discovered = self.files = self.errors = self.pending = self.inflight = 0
+        self.started, self.finished = time.time(), None
+        self.expected = self.history.get(root_dir) if root_dir is not None else None
+        self.rate_sample = (self.started, 0)
+        self.dirs_per_sec = 0.0
+
+    def update(self, scanned, discovered, files, errors, pending, inflight):
+        """`scanned` counts directories listed so far; `discovered` counts subfolders found (listed or not)."""
+        self.scanned, self.discovered, self.files = scanned, discovered, files
+        self.errors, self.pending, self.inflight = errors, pending, inflight
+
+    def finish(self, persist=False):
+        """Marks the scan done and remembers its totals as the next ETA baseline for this root."""
+        self.finished = time.time()
+        self.pending = self.inflight = 0
+        if self.root is None:
+            return
+        self.history[self.root] = {
+            "dirs": self.scanned,
+            "files": self.files,
+            "elapsed": round(self.finished - self.started, 3),
+        }
+        if persist and self.history_path is not None:
+            with open(self.history_path + ".tmp", "w", encoding="utf-8") as history_file:
+                json.dump(self.history, history_file)
+            os.replace(self.history_path + ".tmp", self.history_path)
+
+    def snapshot(self):
+        now = time.time()
+        scanned, pending, inflight = self.scanned, self.pending, self.inflight
+        with self.read_lock:
+            sampled_at, sampled_dirs = self.rate_sample
+            if now - sampled_at >= PROGRESS_RATE_WINDOW_SECONDS:
+                self.dirs_per_sec = (scanned - sampled_dirs) / (now - sampled_at)
+                self.rate_sample = (now, scanned)
+            dirs_per_sec = self.dirs_per_sec
+        elapsed = (self.finished or now) - self.started
+        expected_dirs = (self.expected or {}).get("dirs")
+        eta_seconds, fraction = None, None
+        if self.finished is not None:
+            eta_seconds, fraction = 0.0, 1.0
+        elif expected_dirs:
+            # Queued work is a floor on what is left, in case the tree grew since the last run.
+            remaining = max(expected_dirs - scanned, pending + inflight)
+            fraction = scanned / (scanned + remaining) if scanned + remaining else 1.0
+            if dirs_per_sec > 0:
+                eta_seconds = remaining / dirs_per_sec
+        return {
+            "root": self.root,
+            "phase": self.phase,
+            "running": self.root is not None and self.finished is None,
+            "dirs_scanned": scanned,
+            "dirs_discovered": self.discovered,
+            "files": self.files,
+            "errors": self.errors,
+            "pending_dirs": pending,
+            "inflight_dirs": inflight,
+            "elapsed_seconds": round(elapsed, 3),
+            "dirs_per_sec": round(dirs_per_sec, 2),
+            "expected_dirs": expected_dirs,
+            "fraction_done": round(fraction, 4) if fraction is not None else None,
+            "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+        }
+
+    def prometheus(self):
+        snapshot = self.snapshot()
+        labels = ",".join(f'{name}="{prometheus_label(snapshot[name])}"' for name in ("root", "phase"))
+        metrics = [
+            ("dirs_scanned", "counter", snapshot["dirs_scanned"]),
+            ("dirs_discovered", "counter", snapshot["dirs_discovered"]),
+            ("files_scanned", "counter", snapshot["files"]),
+            ("errors", "counter", snapshot["errors"]),
+            ("pending_dirs", "gauge", snapshot["pending_dirs"]),
+            ("inflight_dirs", "gauge", snapshot["inflight_dirs"]),
+            ("dirs_per_second", "gauge", snapshot["dirs_per_sec"]),
+            ("elapsed_seconds", "gauge", snapshot["elapsed_seconds"]),
+            ("running", "gauge", int(snapshot["running"])),
+        ]
+        if snapshot["eta_seconds"] is not None:
+            metrics.append(("eta_seconds", "gauge", snapshot["eta_seconds"]))
+        lines = []
+        for name, kind, value in metrics:
+            lines.append(f"# TYPE directorynator_{name} {kind}")
+            lines.append(f"directorynator_{name}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class ProgressReporter:
+    """Serves ScanProgress over local HTTP (/progress, /metrics) and/or a periodically replaced status file."""
+
+    def __init__(self, progress, port=0, status_file=None, interval=2.0):
+        self.progress = progress
+        self.port = port
+        self.status_file = status_file
+        self.interval = max(0.1, interval)
+        self.server = None
+        self.stop = threading.Event()
+        self.threads = []
+
+    def __enter__(self):
+        progress = self.progress
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path in {"/", "/progress"}:
+                    body, content_type = json.dumps(progress.snapshot()).encode(), "application/json"
+                elif self.path == "/metrics":
+                    body, content_type = progress.prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        if self.port:
+            self.server = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+            self.threads.append(threading.Thread(target=self.server.serve_forever, daemon=True))
+            print(f"Progress endpoint: http://127.0.0.1:{self.server.server_port}/progress (and /metrics)")
+        if self.status_file:
+            self.threads.append(threading.Thread(target=self.refresh_status_file, daemon=True))
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def write_status_file(self):
+        with open(self.status_file + ".tmp", "w", encoding="utf-8") as status_file:
+            json.dump(self.progress.snapshot(), status_file, indent=2)
+        os.replace(self.status_file + ".tmp", self.status_file)
+
+    def refresh_status_file(self):
+        while not self.stop.wait(self.interval):
+            try:
+                self.write_status_file()
+            except OSError as error:
+                print(f"Could not write status file '{self.status_file}': {error}")
+
+    def __exit__(self, *exc_info):
+        self.stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self.threads:
+            thread.join()
+        if self.status_file:
+            # The scan itself succeeded; an unwritable status file must not turn that into a traceback.
+            try:
+                self.write_status_file()
+            except OSError as error:
+                print(f"Could not write status file '{self.status_file}': {error}")
+        return False
+
+
+class SubtreeScheduler:
+    """Priority frontier that hands out the subtree expected to take longest first."""
+
+    def __init__(self, start_dirs, workers, history=None):
+        self.workers = max(1, workers)
+        self.history = history or {}
+        self.heap = []
+        self.sequence = itertools.count()
+        self.inflight = {}
+        self.sizes = {}
+        for path in start_dirs:
+            directories, depth = self.history.get(path, (1, 1))
+            self.push(path, directories, depth, 0, (path,))
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (item[2] for item in self.heap)
+
+    def push(self, path, directories, depth, level, chain):
+        cost = max(directories / self.workers, depth)
+        heapq.heappush(self.heap, (-cost, next(self.sequence), path, (directories, depth, level, chain)))
+
+    def popleft(self):
+        _, _, path, estimate = heapq.heappop(self.heap)
+        self.inflight[path] = estimate
+        return path
+
+    def finish(self, dirpath, subfolders):
+        directories, depth, level, chain = self.inflight.pop(dirpath)
+        # chain[i] sits at level i, so this directory makes chain[i]'s subtree at least level - i + 1 deep.
+        for ancestor_level, ancestor in enumerate(chain):
+            size = self.sizes.setdefault(ancestor, [0, 0])
+            size[0] += 1
+            size[1] = max(size[1], level - ancestor_level + 1)
+        if not subfolders:
+            return
+        if dirpath in self.history or directories > 1:
+            share = max(1.0, (directories - 1) / len(subfolders))
+        else:
+            share = len(subfolders)
+        extend_chain = len(chain) <= SCHEDULE_HISTORY_DEPTH
+        for folder in subfolders:
+            folder_directories, folder_depth = self.history.get(folder, (share, max(1, depth - 1)))
+            # Deeper directories share their depth-limited ancestor chain instead of copying it.
+            self.push(
+                folder,
+                folder_directories,
+                folder_depth,
+                level + 1,
+                chain + (folder,) if extend_chain else chain,
+            )
+
+    def learned(self):
+        return {path: size for path, size in self.sizes.items() if size[0] >= SCHEDULE_HISTORY_MIN_DIRS}
+
+
+def iter_multithread_scan_records(
+    root_dir,
+    thread_count,
+    throttle_ms=0,
+    stats=None,
+    scan_index=None,
+    start_dirs=None,
+    max_dirs=None,
+    rules=None,
+    adaptive=False,
+    limiter=None,
+    profile=0,
+    metadata=False,
+    priority=False,
+    subtree_history=None,
+    executor=None,
+    progress=None,
+):
+    """Yields (folder, subfolders, files) as each directory scan completes; fills `stats` once exhausted."""
+    folder_count, file_count = 0, 0
+    permission_denied_count, other_error_count = 0, 0
+    index_hits, index_misses = 0, 0
+    scanned_count = 0
+
+    seeds = start_dirs if start_dirs is not None else [root_dir]
+    scheduler = SubtreeScheduler(seeds, thread_count, subtree_history) if priority else None
+    pending_dirs = scheduler if scheduler is not None else deque(seeds)
+    active_futures = {}
+    inflight_limit = max(thread_count * 4, 8)
+    dispatch_budget = max_dirs if max_dirs is not None else -1
+    pruned_baseline = rules.pruned_counts() if rules is not None else None
+    controller = ConcurrencyController(thread_count) if adaptive else None
+    profiler = ScanProfiler(profile) if profile else None
+    limiter = resolve_rate_limiter(throttle_ms, limiter)
+    pool_size = controller.maximum if controller is not None else thread_count
+    start_time = time.time()
+    last_saturated = time.perf_counter()
+
+    pool = contextlib.nullcontext(executor) if executor is not None else ThreadPoolExecutor(max_workers=pool_size)
+    with pool as executor:
+        while (pending_dirs and dispatch_budget != 0) or active_futures:
+            if controller is not None:
+                # The pool is sized for the ceiling; in-flight tasks == active workers.
+                controller.maybe_adjust()
+                inflight_limit = controller.active
+            while pending_dirs and dispatch_budget != 0 and len(active_futures) < inflight_limit:
+                dispatch_budget -= 1
+                current_dir = pending_dirs.popleft()
+                if scan_index is None:
+                    task = (traverse_directory, current_dir, rules, limiter, metadata)
+                else:
+                    task = (traverse_directory_indexed, current_dir, scan_index, rules, limiter)
+                if profiler is not None:
+                    future = executor.submit(instrumented_call, *task)
+                elif controller is not None:
+                    future = executor.submit(timed_call, *task)
+                else:
+                    future = executor.submit(*task)
+                active_futures[future] = current_dir
+
+            if not active_futures:
+                continue
+            if len(active_futures) >= (controller.active if controller is not None else thread_count):
+                last_saturated = time.perf_counter()
+
+            if profiler is not None:
+                profiler.sample_depth(len(pending_dirs), len(active_futures))
+                wait_started = time.perf_counter()
+                completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
+                profiler.dispatcher_wait += time.perf_counter() - wait_started
+            else:
+                completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                current_dir = active_futures.pop(future)
+                try:
+                    result = future.result()
                 except Exception as error:
                     other_error_count += 1
                     print(f"Error processing '{current_dir}': {error}")
+                    if scheduler is not None:
+                        scheduler.finish(current_dir, [])
+                    yield current_dir, [], []
+                    continue
 
-    elapsed_time = time.time() - start_time
-    stats = {
+                if profiler is not None:
+                    latency, worker, result = result
+                    profiler.record(current_dir, latency, worker, len(result[0]) + len(result[1]))
+                    if controller is not None:
+                        controller.record(latency)
+                elif controller is not None:
+                    latency, result = result
+                    controller.record(latency)
+                result_folders, result_files, denied, errors = result[:4]
+                if scan_index is not None:
+                    cache_hit, index_row = result[4:]
+                    if cache_hit:
+                        index_hits += 1
+                    else:
+                        index_misses += 1
+                        if index_row is not None:
+                            scan_index.stage(current_dir, *index_row)
+
+                file_count += len(result_files)
+                permission_denied_count += denied
+                other_error_count += errors
+                if scheduler is not None:
+                    scheduler.finish(current_dir, result_folders)
+                else:
+                    pending_dirs.extend(result_folders)
+                folder_count += len(result_folders)
+                yield current_dir, result_folders, result_files
+            scanned_count += len(completed)
+            if progress is not None:
+                progress.update(
+                    scanned_count,
+                    folder_count,
+                    file_count,
+                    permission_denied_count + other_error_count,
+                    len(pending_dirs),
+                    len(active_futures),
+                )
+
+    straggler_tail = time.perf_counter() - last_saturated
+    if scan_index is not None:
+        scan_index.commit()
+    if scheduler is not None and subtree_history is not None and start_dirs is None and not pending_dirs:
+        subtree_history.clear()
+        subtree_history.update(scheduler.learned())
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": folder_count,
+                "files": file_count,
+                "permissions_skipped": permission_denied_count,
+                "other_errors": other_error_count,
+                "elapsed": time.time() - start_time,
+                "workers": thread_count,
+                "throttle_ms": throttle_ms,
+                "scheduler": "largest-first" if scheduler is not None else "fifo",
+                "straggler_tail_seconds": round(straggler_tail, 3),
+            }
+        )
+        if max_dirs is not None:
+            stats["unscanned_dirs"] = list(pending_dirs)
+        if controller is not None:
+            stats.update(controller.summary())
+        if profiler is not None:
+            stats["profile"] = profiler.summary()
+        record_pruned_stats(stats, rules, pruned_baseline)
+        record_rate_limit_stats(stats, limiter)
+        if scan_index is not None:
+            looked_up = index_hits + index_misses
+            stats.update(
+                {
+                    "index_hits": index_hits,
+                    "index_misses": index_misses,
+                    "index_hit_ratio": round(index_hits / looked_up, 4) if looked_up else 0.0,
+                }
+            )
+
+
+def iter_multithread_scan(root_dir, thread_count, **options):
+    """Yields (folder, files) as each directory scan completes; see iter_multithread_scan_records."""
+    for folder, _, files in iter_multithread_scan_records(root_dir, thread_count, **options):
+        yield folder, files
+
+
+def multithread_scan(
+    root_dir,
+    thread_count,
+    throttle_ms=0,
+    scan_index=None,
+    compact=False,
+    rules=None,
+    adaptive=False,
+    limiter=None,
+    profile=0,
+    progress=None,
+):
+    """Threaded traversal with dynamic scheduling and optional throttling."""
+    stats = {}
+    records = iter_multithread_scan_records(
+        root_dir,
+        thread_count,
+        throttle_ms=throttle_ms,
+        stats=stats,
+        scan_index=scan_index,
+        rules=rules,
+        adaptive=adaptive,
+        limiter=limiter,
+        profile=profile,
+        progress=progress,
+    )
+    return collect_scan_records(root_dir, records, compact), stats
+
+
+def collect_scan_records(root_dir, records, compact=False):
+    """Folds (folder, subfolders, files) records into a CompactTree or a folder_files_map dict."""
+    if compact:
+        return build_compact_tree(root_dir, records)
+    folder_files_map = {}
+    for folder, _, files in records:
+        folder_files_map[folder] = files
+    return folder_files_map
+
+
+async def iter_async_scan_records(
+    root_dir,
+    executor=None,
+    semaphore=None,
+    concurrency=ASYNC_SCAN_CONCURRENCY,
+    dir_timeout=None,
+    stats=None,
+    rules=None,
+    limiter=None,
+    metadata=False,
+):
+    """Async generator of (folder, subfolders, files) records with bounded concurrency and timeouts."""
+    loop = asyncio.get_running_loop()
+    shared_budget = semaphore is not None
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+    owned_executor = None
+    if executor is None:
+        executor = owned_executor = ThreadPoolExecutor(concurrency, thread_name_prefix="directorynator-async")
+
+    def release_slot(_):
+        # Runs on the worker thread (or the loop, for cancelled listings) once the listing is really over.
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # The loop is closed, so nothing waits on the semaphore any more.
+
+    folder_count, file_count = 0, 0
+    permission_denied_count, other_error_count, timeout_count = 0, 0, 0
+    pending_dirs = deque([root_dir])
+    active_tasks = {}
+    start_time = time.time()
+
+    try:
+        while pending_dirs or active_tasks:
+            # Block for a slot only when nothing of ours is running; otherwise take free slots and move on.
+            while pending_dirs and (not active_tasks or not semaphore.locked()):
+                await semaphore.acquire()
+                current_dir = pending_dirs.popleft()
+                try:
+                    listing = executor.submit(traverse_directory, current_dir, rules, limiter, metadata)
+                except BaseException:
+                    semaphore.release()
+                    raise
+                # The slot follows the thread, not the task: a timed-out listing holds it until it returns.
+                listing.add_done_callback(release_slot)
+                task = asyncio.ensure_future(asyncio.wait_for(asyncio.wrap_future(listing), dir_timeout))
+                active_tasks[task] = current_dir
+            completed, _ = await asyncio.wait(active_tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in completed:
+                current_dir = active_tasks.pop(task)
+                try:
+                    result_folders, result_files, denied, errors = task.result()
+                except asyncio.TimeoutError:
+                    timeout_count += 1
+                    yield current_dir, [], []
+                    continue
+                except Exception as error:
+                    other_error_count += 1
+                    print(f"Error processing '{current_dir}': {error}")
+                    yield current_dir, [], []
+                    continue
+                file_count += len(result_files)
+                permission_denied_count += denied
+                other_error_count += errors
+                pending_dirs.extend(result_folders)
+                folder_count += len(result_folders)
+                yield current_dir, result_folders, result_files
+    finally:
+        for task in active_tasks:
+            task.cancel()
+        if active_tasks:
+            await asyncio.gather(*active_tasks, return_exceptions=True)
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=False, cancel_futures=True)
+
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": folder_count,
+                "files": file_count,
+                "permissions_skipped": permission_denied_count,
+                "other_errors": other_error_count,
+                "timeouts": timeout_count,
+                "elapsed": time.time() - start_time,
+                "concurrency": "shared" if shared_budget else concurrency,
+            }
+        )
+        record_rate_limit_stats(stats, limiter)
+
+
+async def async_scan(root_dir, executor=None, semaphore=None, concurrency=ASYNC_SCAN_CONCURRENCY, **options):
+    """Awaitable counterpart of multithread_scan: returns (folder_files_map, stats)."""
+    stats = {}
+    folder_files_map = {}
+    records = iter_async_scan_records(
+        root_dir, executor=executor, semaphore=semaphore, concurrency=concurrency, stats=stats, **options
+    )
+    async for folder, _, files in records:
+        folder_files_map[folder] = files
+    return folder_files_map, stats
+
+
+def init_shard_process(limiter):
+    """ProcessPoolExecutor initializer: installs this worker process's long-lived slice of the rate budget."""
+    shard_process_state["limiter"] = limiter
+
+
+def scan_shard(
+    shard_dirs, thread_count, throttle_ms=0, max_dirs=MULTIPROCESS_SHARD_DIR_BUDGET, rules=None, limiter=None
+):
+    """Process-pool task: scans a batch of subtrees with its own threads; returns (records, unscanned, stats)."""
+    limiter = limiter or shard_process_state.get("limiter")
+    throttled_before = limiter.throttled_seconds() if limiter is not None else 0.0
+    stats, records = {}, []
+    for folder, subfolders, files in iter_multithread_scan_records(
+        shard_dirs[0],
+        thread_count,
+        throttle_ms=throttle_ms,
+        stats=stats,
+        start_dirs=shard_dirs,
+        max_dirs=max_dirs,
+        rules=rules,
+        limiter=limiter,
+    ):
+        records.append(
+            (
+                folder,
+                [os.path.basename(subfolder) for subfolder in subfolders],
+                [os.path.basename(file) for file in files],
+            )
+        )
+    stats["throttled_seconds"] = limiter.throttled_seconds() - throttled_before if limiter is not None else 0.0
+    return records, stats.pop("unscanned_dirs"), stats
+
+
+def split_shards(dirs, shard_count):
+    shard_count = max(1, min(shard_count, len(dirs)))
+    return [dirs[index::shard_count] for index in range(shard_count)]
+
+
+def iter_multiprocess_scan_records(
+    root_dir,
+    thread_count,
+    throttle_ms=0,
+    stats=None,
+    process_count=None,
+    shard_dir_budget=MULTIPROCESS_SHARD_DIR_BUDGET,
+    rules=None,
+    limiter=None,
+):
+    """Sharded traversal on a process pool; yields (folder, subfolders, files) like the threaded engine."""
+    process_count = max(1, process_count or min(os.cpu_count() or 4, thread_count))
+    # Listing is I/O bound, so every process keeps a few threads even if that exceeds thread_count overall.
+    threads_per_process = max(MULTIPROCESS_MIN_THREADS, thread_count // process_count)
+    limiter = resolve_rate_limiter(throttle_ms, limiter)
+    # Each process gets an equal slice of the budget, installed once per process by the pool initializer.
+    shard_limiter = limiter.split(process_count) if limiter is not None else None
+    shard_throttled_seconds = 0.0
+    start_time = time.time()
+
+    pruned_baseline = rules.pruned_counts() if rules is not None else None
+    root_folders, root_files, permission_denied_count, other_error_count = traverse_directory(root_dir, rules, limiter)
+    root_stats = {}
+    record_pruned_stats(root_stats, rules, pruned_baseline)
+    pruned = root_stats.get("pruned", {})
+    folder_count, file_count = len(root_folders), len(root_files)
+    shard_total, failed_shards = 0, 0
+    yield root_dir, root_folders, root_files
+
+    def rescan_in_process(shard):
+        nonlocal folder_count, file_count, permission_denied_count, other_error_count
+        shard_stats = {}
+        yield from iter_multithread_scan_records(
+            shard[0], threads_per_process, stats=shard_stats, start_dirs=shard, rules=rules, limiter=limiter
+        )
+        folder_count += shard_stats["folders"]
+        file_count += shard_stats["files"]
+        permission_denied_count += shard_stats["permissions_skipped"]
+        other_error_count += shard_stats["other_errors"]
+        for label, count in shard_stats.get("pruned", {}).items():
+            pruned[label] = pruned.get(label, 0) + count
+
+    pending_shards = deque([folder] for folder in root_folders)
+    active_futures = {}
+    pool_broken = False
+    # The report writer thread is already running, so worker processes must not be forked from this one.
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    with ProcessPoolExecutor(
+        max_workers=process_count, mp_context=context, initializer=init_shard_process, initargs=(shard_limiter,)
+    ) as executor:
+        while pending_shards or active_futures:
+            while pending_shards and not pool_broken and len(active_futures) < process_count * 2:
+                shard = pending_shards[0]
+                try:
+                    future = executor.submit(scan_shard, shard, threads_per_process, 0, shard_dir_budget, rules)
+                except BrokenProcessPool:
+                    pool_broken = True
+                    break
+                pending_shards.popleft()
+                shard_total += 1
+                active_futures[future] = shard
+
+            if not active_futures:
+                # Nothing left can run in the pool, so the remaining shards are scanned here.
+                while pending_shards:
+                    yield from rescan_in_process(pending_shards.popleft())
+                continue
+
+            completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                shard = active_futures.pop(future)
+                try:
+                    records, unscanned_dirs, shard_stats = future.result()
+                except Exception as error:
+                    failed_shards += 1
+                    pool_broken = pool_broken or isinstance(error, BrokenProcessPool)
+                    print(f"Error processing shard '{shard[0]}': {error}; rescanning it in-process")
+                    yield from rescan_in_process(shard)
+                    continue
+
+                folder_count += shard_stats["folders"]
+                file_count += shard_stats["files"]
+                permission_denied_count += shard_stats["permissions_skipped"]
+                other_error_count += shard_stats["other_errors"]
+                shard_throttled_seconds += shard_stats["throttled_seconds"]
+                for label, count in shard_stats.get("pruned", {}).items():
+                    pruned[label] = pruned.get(label, 0) + count
+                if unscanned_dirs:
+                    pending_shards.extend(split_shards(unscanned_dirs, process_count))
+
+                for folder, subfolder_names, file_names in records:
+                    yield (
+                        folder,
+                        [os.path.join(folder, name) for name in subfolder_names],
+                        [os.path.join(folder, name) for name in file_names],
+                    )
+
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": folder_count,
+                "files": file_count,
+                "permissions_skipped": permission_denied_count,
+                "other_errors": other_error_count,
+                "elapsed": time.time() - start_time,
+                "workers": process_count * threads_per_process,
+                "throttle_ms": throttle_ms,
+                "processes": process_count,
+                "threads_per_process": threads_per_process,
+                "shards": shard_total,
+                "failed_shards": failed_shards,
+            }
+        )
+        if rules is not None:
+            stats["pruned"] = pruned
+            stats["pruned_total"] = sum(pruned.values())
+        record_rate_limit_stats(stats, limiter)
+        if limiter is not None:
+            stats["rate_limit"]["throttled_worker_seconds"] = round(
+                limiter.throttled_seconds() + shard_throttled_seconds, 3
+            )
+
+
+def multiprocess_scan(
+    root_dir, thread_count, throttle_ms=0, process_count=None, compact=False, rules=None, limiter=None
+):
+    """Multiprocess sharded traversal; same (result, stats) contract as multithread_scan."""
+    stats = {}
+    records = iter_multiprocess_scan_records(
+        root_dir,
+        thread_count,
+        throttle_ms=throttle_ms,
+        stats=stats,
+        process_count=process_count,
+        rules=rules,
+        limiter=limiter,
+    )
+    return collect_scan_records(root_dir, records, compact), stats
+
+
+def iter_workstealing_scan_records(
+    root_dir, thread_count, throttle_ms=0, stats=None, batch_size=WORKSTEALING_BATCH_SIZE, rules=None, limiter=None
+):
+    """Work-stealing traversal; yields (folder, subfolders, files) records in batches from the workers."""
+    thread_count = max(1, thread_count)
+    local_dirs = [deque() for _ in range(thread_count)]
+    local_dirs[0].append(root_dir)
+    # Directories discovered but not yet finished; children are queued before the count drops, so 0 means done.
+    outstanding = [1]
+    outstanding_lock = threading.Lock()
+    finished = threading.Event()
+    result_batches = queue.Queue(maxsize=thread_count * 4)
+    worker_stats = [{"folders": 0, "files": 0, "denied": 0, "errors": 0, "steals": 0} for _ in range(thread_count)]
+    limiter = resolve_rate_limiter(throttle_ms, limiter)
+
+    def steal(index):
+        for offset in random.sample(range(1, thread_count), thread_count - 1):
+            try:
+                return local_dirs[(index + offset) % thread_count].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def worker(index):
+        own_dirs, counters, batch = local_dirs[index], worker_stats[index], []
+        idle_sleep = 0.0001
+        try:
+            while not finished.is_set():
+                try:
+                    current_dir = own_dirs.pop()
+                except IndexError:
+                    current_dir = steal(index)
+                    if current_dir is None:
+                        if batch:
+                            result_batches.put(batch)
+                            batch = []
+                        time.sleep(idle_sleep)
+                        idle_sleep = min(idle_sleep * 2, WORKSTEALING_IDLE_MAX_SLEEP)
+                        continue
+                    counters["steals"] += 1
+                idle_sleep = 0.0001
+
+                try:
+                    result_folders, result_files, denied, errors = traverse_directory(current_dir, rules, limiter)
+                except Exception as error:
+                    print(f"Error processing '{current_dir}': {error}")
+                    result_folders, result_files, denied, errors = [], [], 0, 1
+                own_dirs.extend(result_folders)
+                counters["folders"] += len(result_folders)
+                counters["files"] += len(result_files)
+                counters["denied"] += denied
+                counters["errors"] += errors
+                batch.append((current_dir, result_folders, result_files))
+                if len(batch) >= batch_size:
+                    result_batches.put(batch)
+                    batch = []
+
+                with outstanding_lock:
+                    outstanding[0] += len(result_folders) - 1
+                    done = outstanding[0] == 0
+                if done:
+                    finished.set()
+        finally:
+            if batch:
+                result_batches.put(batch)
+            result_batches.put(None)
+
+    pruned_baseline = rules.pruned_counts() if rules is not None else None
+    start_time = time.time()
+    workers = [
+        threading.Thread(target=worker, args=(index,), name=f"directorynator-steal-{index}", daemon=True)
+        for index in range(thread_count)
+    ]
+    for thread in workers:
+        thread.start()
+
+    running, batch_count = thread_count, 0
+    try:
+        while running:
+            batch = result_batches.get()
+            if batch is None:
+                running -= 1
+                continue
+            batch_count += 1
+            yield from batch
+    finally:
+        # Stop and unblock workers if the consumer abandoned the generator early.
+        finished.set()
+        while running:
+            if result_batches.get() is None:
+                running -= 1
+        for thread in workers:
+            thread.join()
+
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": sum(item["folders"] for item in worker_stats),
+                "files": sum(item["files"] for item in worker_stats),
+                "permissions_skipped": sum(item["denied"] for item in worker_stats),
+                "other_errors": sum(item["errors"] for item in worker_stats),
+                "elapsed": time.time() - start_time,
+                "workers": thread_count,
+                "throttle_ms": throttle_ms,
+                "steals": sum(item["steals"] for item in worker_stats),
+                "result_batches": batch_count,
+            }
+        )
+        record_pruned_stats(stats, rules, pruned_baseline)
+        record_rate_limit_stats(stats, limiter)
+
+
+def workstealing_scan(root_dir, thread_count, throttle_ms=0, compact=False, rules=None, limiter=None):
+    """Work-stealing traversal; same (result, stats) contract as multithread_scan."""
+    stats = {}
+    records = iter_workstealing_scan_records(
+        root_dir, thread_count, throttle_ms=throttle_ms, stats=stats, rules=rules, limiter=limiter
+    )
+    return collect_scan_records(root_dir, records, compact), stats
+
+
+def dirfd_supported():
+    return hasattr(os, "O_DIRECTORY") and os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+
+
+class DirHandle:
+    """Open directory fd shared by its queued children; closed once the last child has opened."""
+
+    __slots__ = ("fd", "refs")
+
+    def __init__(self, fd, refs):
+        self.fd = fd
+        self.refs = refs
+
+
+def traverse_directory_fd(parent_fd, name, dirpath, keep_fd, rules=None, limiter=None):
+    """Opens a directory relative to its parent's fd and lists it; returns (fd, folders, files, denied, errors)."""
+    flags = os.O_RDONLY | os.O_DIRECTORY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+    if limiter is not None:
+        limiter.before_directory()
+    try:
+        fd = os.open(dirpath, flags) if parent_fd is None else os.open(name, flags, dir_fd=parent_fd)
+    except PermissionError:
+        return None, [], [], 1, 0
+    except OSError:
+        return None, [], [], 0, 1
+
+    folder_names, file_names = [], []
+    permission_denied_count, other_error_count = 0, 0
+    entry_count = 0
+    try:
+        with os.scandir(fd) as entries:
+            for entry in entries:
+                entry_count += 1
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if rules is None or not rules.prune(dirpath, entry.name, True):
+                            folder_names.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        if rules is None or not rules.prune(dirpath, entry.name, False):
+                            file_names.append(entry.name)
+                except PermissionError:
+                    permission_denied_count += 1
+                except OSError:
+                    other_error_count += 1
+    except PermissionError:
+        permission_denied_count += 1
+    except OSError:
+        other_error_count += 1
+
+    if limiter is not None:
+        limiter.after_listing(entry_count)
+    if not keep_fd or not folder_names:
+        os.close(fd)
+        fd = None
+    return fd, folder_names, file_names, permission_denied_count, other_error_count
+
+
+def iter_dirfd_scan(
+    root_dir, thread_count, throttle_ms=0, stats=None, fd_budget=DIRFD_OPEN_BUDGET, rules=None, limiter=None
+):
+    """fd-relative traversal within `fd_budget` open fds; yields (folder, subfolder_names, file_names)."""
+    folder_count, file_count = 0, 0
+    permission_denied_count, other_error_count = 0, 0
+    open_fds, peak_open_fds, path_opens = 0, 0, 0
+
+    # (parent DirHandle or None, name, parent path); the root opens by its full path.
+    pending_dirs = [(None, root_dir, None)]
+    active_futures = {}
+    inflight_limit = max(thread_count * 4, 8)
+    pruned_baseline = rules.pruned_counts() if rules is not None else None
+    limiter = resolve_rate_limiter(throttle_ms, limiter)
+    start_time = time.time()
+
+    def release(handle):
+        nonlocal open_fds
+        handle.refs -= 1
+        if handle.refs == 0:
+            os.close(handle.fd)
+            open_fds -= 1
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        try:
+            while pending_dirs or active_futures:
+                while pending_dirs and len(active_futures) < inflight_limit:
+                    parent_handle, name, parent_path = pending_dirs.pop()
+                    dirpath = name if parent_path is None else os.path.join(parent_path, name)
+                    keep_fd = open_fds < fd_budget
+                    if keep_fd:
+                        open_fds += 1
+                        peak_open_fds = max(peak_open_fds, open_fds)
+                    parent_fd = parent_handle.fd if parent_handle is not None else None
+                    if parent_fd is None:
+                        path_opens += 1
+                    future = executor.submit(traverse_directory_fd, parent_fd, name, dirpath, keep_fd, rules, limiter)
+                    active_futures[future] = (dirpath, parent_handle, keep_fd)
+
+                completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    dirpath, parent_handle, keep_fd = active_futures.pop(future)
+                    if parent_handle is not None:
+                        release(parent_handle)
+                    try:
+                        fd, folder_names, file_names, denied, errors = future.result()
+                    except Exception as error:
+                        other_error_count += 1
+                        print(f"Error processing '{dirpath}': {error}")
+                        fd, folder_names, file_names, denied, errors = None, [], [], 0, 0
+
+                    if keep_fd and fd is None:
+                        open_fds -= 1
+                    handle = DirHandle(fd, len(folder_names)) if fd is not None else None
+                    pending_dirs.extend((handle, folder_name, dirpath) for folder_name in folder_names)
+
+                    folder_count += len(folder_names)
+                    file_count += len(file_names)
+                    permission_denied_count += denied
+                    other_error_count += errors
+                    yield dirpath, folder_names, file_names
+        finally:
+            # Abandoned early: close whatever the in-flight work and remaining frontier still hold.
+            handles = {item[0] for item in pending_dirs} | {item[1] for item in active_futures.values()}
+            for future in list(active_futures):
+                try:
+                    fd = future.result()[0]
+                except Exception:
+                    fd = None
+                if fd is not None:
+                    os.close(fd)
+            for handle in handles - {None}:
+                os.close(handle.fd)
+
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": folder_count,
+                "files": file_count,
+                "permissions_skipped": permission_denied_count,
+                "other_errors": other_error_count,
+                "elapsed": time.time() - start_time,
+                "workers": thread_count,
+                "throttle_ms": throttle_ms,
+                "fd_budget": fd_budget,
+                "peak_open_fds": peak_open_fds,
+                "path_opens": path_opens,
+            }
+        )
+        record_pruned_stats(stats, rules, pruned_baseline)
+        record_rate_limit_stats(stats, limiter)
+
+
+def iter_dirfd_scan_records(
+    root_dir, thread_count, throttle_ms=0, stats=None, fd_budget=DIRFD_OPEN_BUDGET, rules=None, limiter=None
+):
+    """Yields (folder, subfolders, files) full-path records from the fd-relative engine."""
+    if not dirfd_supported():
+        print("fd-relative scanning is not supported on this platform; using the multithread engine.")
+        yield from iter_multithread_scan_records(
+            root_dir, thread_count, throttle_ms=throttle_ms, stats=stats, rules=rules, limiter=limiter
+        )
+        return
+    for folder, folder_names, file_names in iter_dirfd_scan(
+        root_dir, thread_count, throttle_ms=throttle_ms, stats=stats, fd_budget=fd_budget, rules=rules, limiter=limiter
+    ):
+        yield (
+            folder,
+            [os.path.join(folder, name) for name in folder_names],
+            [os.path.join(folder, name) for name in file_names],
+        )
+
+
+def dirfd_scan(
+    root_dir, thread_count, throttle_ms=0, compact=False, fd_budget=DIRFD_OPEN_BUDGET, rules=None, limiter=None
+):
+    """fd-relative traversal; same (result, stats) contract as multithread_scan."""
+    stats = {}
+    if not compact or not dirfd_supported():
+        records = iter_dirfd_scan_records(
+            root_dir,
+            thread_count,
+            throttle_ms=throttle_ms,
+            stats=stats,
+            fd_budget=fd_budget,
+            rules=rules,
+            limiter=limiter,
+        )
+        return collect_scan_records(root_dir, records, compact), stats
+
+    tree = CompactTree(root_dir)
+    open_dirs = {root_dir: 0}
+    for folder, folder_names, file_names in iter_dirfd_scan(
+        root_dir, thread_count, throttle_ms=throttle_ms, stats=stats, fd_budget=fd_budget, rules=rules, limiter=limiter
+    ):
+        dir_id = open_dirs.pop(folder)
+        tree.set_files(dir_id, file_names)
+        for name in folder_names:
+            open_dirs[os.path.join(folder, name)] = tree.add_dir(dir_id, name)
+    tree.release_intern_cache()
+    return tree, stats
+
+
+def find_mount_point(path):
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def load_device_profiles(output_folder):
+    """Best worker counts per mount point, recorded by earlier benchmark runs."""
+    try:
+        with open(os.path.join(output_folder, DEVICE_PROFILES_FILENAME), "r", encoding="utf-8") as profile_file:
+            return json.load(profile_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_device_profile(output_folder, root_dir, best_result):
+    profiles = load_device_profiles(output_folder)
+    profiles[find_mount_point(root_dir)] = {
+        "best_workers": best_result["workers"],
+        "engine": best_result.get("engine", "multithread"),
+        "files_per_sec": best_result.get("throughput_files_per_sec"),
         "root": root_dir,
-        "folders": folder_count,
-        "files": file_count,
-        "permissions_skipped": permission_denied_count,
-        "other_errors": other_error_count,
-        "elapsed": elapsed_time,
-        "workers": thread_count,
-        "throttle_ms": throttle_ms,
+        "updated": datetime.datetime.now().isoformat(),
     }
-    return folder_files_map, stats
+    with open(os.path.join(output_folder, DEVICE_PROFILES_FILENAME), "w", encoding="utf-8") as profile_file:
+        json.dump(profiles, profile_file, indent=2)
+
+
+def subtree_history_path(output_folder, root_dir):
+    return os.path.join(output_folder, f"directorynator_subtree_history_{root_key(root_dir)}.json")
+
+
+def load_subtree_history(history_path):
+    """[directories, depth] per subtree from this root's last full largest-first scan; empty when there is none."""
+    try:
+        with open(history_path, "r", encoding="utf-8") as history_file:
+            return json.load(history_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_subtree_history(history_path, history):
+    with open(history_path + ".tmp", "w", encoding="utf-8") as history_file:
+        json.dump(history, history_file)
+    os.replace(history_path + ".tmp", history_path)
 
 
-def generate_directory_report_multithread(thread_count=None, root_dir=None, throttle_ms=0):
+def traverse_directory_devices(dirpath, dev, rules=None, limiter=None):
+    """Like traverse_directory, but subfolders come back as (path, st_dev) pairs from lstat."""
+    folder_devices, file_paths = [], []
+    permission_denied_count, other_error_count = 0, 0
+    entry_count = 0
+
+    if limiter is not None:
+        limiter.before_directory()
+    try:
+        for entry in os.scandir(dirpath):
+            entry_count += 1
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if rules is None or not rules.prune(dirpath, entry.name, True, entry.path):
+                        folder_devices.append((entry.path, entry.stat(follow_symlinks=False).st_dev))
+                elif entry.is_file(follow_symlinks=False):
+                    if rules is None or not rules.prune(dirpath, entry.name, False, entry.path):
+                        file_paths.append(entry.path)
+            except PermissionError:
+                permission_denied_count += 1
+            except OSError:
+                other_error_count += 1
+    except PermissionError:
+        permission_denied_count += 1
+    except OSError:
+        other_error_count += 1
+
+    if limiter is not None:
+        limiter.after_listing(entry_count)
+    return folder_devices, file_paths, permission_denied_count, other_error_count
+
+
+def iter_device_scan_records(
+    root_dir,
+    thread_count,
+    throttle_ms=0,
+    stats=None,
+    rules=None,
+    one_file_system=False,
+    device_profiles=None,
+    limiter=None,
+):
+    """Device-aware traversal with one queue, in-flight limit and thread pool per filesystem."""
+    # The mount table only names devices (fs type, mount point); boundaries come from st_dev.
+    fs_types = dict(read_mount_table())
+    device_profiles = device_profiles or {}
+    folder_count, file_count = 0, 0
+    permission_denied_count, other_error_count = 0, 0
+    mounts_skipped = 0
+    pruned_baseline = rules.pruned_counts() if rules is not None else None
+    limiter = resolve_rate_limiter(throttle_ms, limiter)
+    start_time = time.time()
+
+    try:
+        root_dev = os.stat(root_dir).st_dev
+    except OSError as error:
+        print(f"Error reading '{root_dir}': {error}")
+        root_dev = None
+    devices = {}
+    active_futures = {}
+
+    def device_state(dev, first_path):
+        state = devices.get(dev)
+        if state is None:
+            mount_point = find_mount_point(first_path)
+            profile = device_profiles.get(mount_point, {})
+            fs_type = fs_types.get(mount_point, "unknown")
+            default_workers = thread_count if fs_type not in NETWORK_FILESYSTEM_TYPES else max(2, thread_count // 2)
+            workers = max(1, int(profile.get("best_workers") or default_workers))
+            state = devices[dev] = {
+                "mount_point": mount_point,
+                "fs_type": fs_type,
+                "workers": workers,
+                "inflight_limit": max(workers * 4, 8),
+                "profiled": bool(profile),
+                "pending": deque(),
+                "active": 0,
+                "folders": 0,
+                "files": 0,
+                "started": time.time(),
+                "finished": None,
+                "pool": ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"directorynator-dev{dev}"),
+            }
+        return state
+
+    device_state(root_dev, root_dir)["pending"].append(root_dir)
+    try:
+        while active_futures or any(state["pending"] for state in devices.values()):
+            for dev, state in devices.items():
+                pending = state["pending"]
+                while pending and state["active"] < state["inflight_limit"]:
+                    current_dir = pending.popleft()
+                    future = state["pool"].submit(traverse_directory_devices, current_dir, dev, rules, limiter)
+                    active_futures[future] = (current_dir, dev)
+                    state["active"] += 1
+
+            if not active_futures:
+                continue
+
+            completed, _ = wait(active_futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                current_dir, dev = active_futures.pop(future)
+                state = devices[dev]
+                state["active"] -= 1
+                state["finished"] = time.time()
+                try:
+                    folder_devices, result_files, denied, errors = future.result()
+                except Exception as error:
+                    other_error_count += 1
+                    print(f"Error processing '{current_dir}': {error}")
+                    yield current_dir, [], []
+                    continue
+
+                result_folders = []
+                for folder, folder_dev in folder_devices:
+                    if one_file_system and folder_dev != root_dev:
+                        mounts_skipped += 1
+                        continue
+                    target = state if folder_dev == dev else device_state(folder_dev, folder)
+                    target["pending"].append(folder)
+                    result_folders.append(folder)
+
+                state["folders"] += len(result_folders)
+                state["files"] += len(result_files)
+                folder_count += len(result_folders)
+                file_count += len(result_files)
+                permission_denied_count += denied
+                other_error_count += errors
+                yield current_dir, result_folders, result_files
+    finally:
+        for state in devices.values():
+            state["pool"].shutdown(wait=True)
+
+    if stats is not None:
+        stats.update(
+            {
+                "root": root_dir,
+                "folders": folder_count,
+                "files": file_count,
+                "permissions_skipped": permission_denied_count,
+                "other_errors": other_error_count,
+                "elapsed": time.time() - start_time,
+                "workers": sum(state["workers"] for state in devices.values()),
+                "throttle_ms": throttle_ms,
+                "one_file_system": one_file_system,
+                "mounts_skipped": mounts_skipped,
+                "devices": {
+                    state["mount_point"]: {
+                        "dev": dev,
+                        "fs_type": state["fs_type"],
+                        "workers": state["workers"],
+                        "profiled": state["profiled"],
+                        "folders": state["folders"],
+                        "files": state["files"],
+                        "elapsed": (state["finished"] or state["started"]) - state["started"],
+                    }
+                    for dev, state in devices.items()
+                },
+            }
+        )
+        record_pruned_stats(stats, rules, pruned_baseline)
+        record_rate_limit_stats(stats, limiter)
+
+
+def device_scan(root_dir, thread_count, throttle_ms=0, compact=False, rules=None, one_file_system=False, limiter=None):
+    """Device-aware traversal; same (result, stats) contract as multithread_scan."""
+    stats = {}
+    records = iter_device_scan_records(
+        root_dir,
+        thread_count,
+        throttle_ms=throttle_ms,
+        stats=stats,
+        rules=rules,
+        one_file_system=one_file_system,
+        device_profiles=load_device_profiles(ensure_output_folder()),
+        limiter=limiter,
+    )
+    return collect_scan_records(root_dir, records, compact), stats
+
+
+SCAN_ENGINES = {
+    "multithread": multithread_scan,
+    "multiprocess": multiprocess_scan,
+    "workstealing": workstealing_scan,
+    "dirfd": dirfd_scan,
+    "device": device_scan,
+}
+SCAN_RECORD_ITERATORS = {
+    "multithread": iter_multithread_scan_records,
+    "multiprocess": iter_multiprocess_scan_records,
+    "workstealing": iter_workstealing_scan_records,
+    "dirfd": iter_dirfd_scan_records,
+    "device": iter_device_scan_records,
+}
+
+
+def resolve_index_path(output_folder, index_path=None):
+    return index_path or os.path.join(output_folder, SCAN_INDEX_FILENAME)
+
+
+def generate_directory_report_multithread(
+    thread_count=None,
+    root_dir=None,
+    throttle_ms=0,
+    index_path=None,
+    engine="multithread",
+    engine_options=None,
+    rules=None,
+    rate_limits=None,
+    report_format="text",
+    diff=False,
+    search_index_path=None,
+    checkpoint=False,
+    resume=False,
+):
+    """Scans root_dir into a streamed report and a JSON summary; returns (stats, report, summary)."""
     root_dir = root_dir or os.path.abspath(os.sep)
     output_folder = ensure_output_folder()
     workers = detect_recommended_threads(thread_count)
 
-    folder_files_map, stats = multithread_scan(root_dir, workers, throttle_ms=throttle_ms)
-
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    report_path = os.path.join(output_folder, f"directorynator_multithread_{workers}threads_{timestamp}.txt")
-    write_report(report_path, folder_files_map)
+    report_base = os.path.join(output_folder, f"directorynator_{engine}_{workers}threads_{timestamp}")
+    text_path = report_base + ".txt" if report_format in {"text", "both"} else None
+    binary_path = report_base + BINARY_REPORT_EXTENSION if report_format in {"binary", "both"} else None
+    report_path = text_path or binary_path
+
+    # Stream results straight into the report so memory tracks the scan frontier, not the tree size.
+    stats = {}
+    scan_options = {
+        "throttle_ms": throttle_ms,
+        "stats": stats,
+        "rules": rules,
+        "limiter": build_rate_limiter(throttle_ms, rate_limits),
+        **(engine_options or {}),
+    }
+    scan_index = None
+    if index_path and engine == "multithread":
+        scan_index = scan_options["scan_index"] = ScanIndex(index_path)
+    elif index_path:
+        print(f"Scan index is not supported by the {engine} engine; running a full scan.")
+    history_path = None
+    if scan_options.get("priority") and engine != "multithread":
+        print(f"Largest-first scheduling is not supported by the {engine} engine; using its default order.")
+        del scan_options["priority"]
+    elif scan_options.get("priority"):
+        history_path = subtree_history_path(output_folder, root_dir)
+        scan_options["subtree_history"] = load_subtree_history(history_path)
+        stats["history_subtrees"] = len(scan_options["subtree_history"])
+    if scan_options.get("executor") is not None and engine != "multithread":
+        del scan_options["executor"]
+    progress = scan_options.get("progress")
+    if progress is not None and engine != "multithread":
+        print(f"Live progress is not supported by the {engine} engine; running without it.")
+        del scan_options["progress"]
+        progress = None
+    if scan_options.get("profile") and engine != "multithread":
+        print(f"Instrumentation is not supported by the {engine} engine; running without it.")
+        del scan_options["profile"]
+    rollup = None
+    if scan_options.get("metadata"):
+        if engine != "multithread" or scan_index is not None:
+            print("Metadata mode needs the multithread engine without --incremental; running without it.")
+            del scan_options["metadata"]
+        else:
+            rollup = DiskUsageRollup(root_dir, scan_options.pop("top_subtrees", LARGEST_SUBTREES_TOP))
+    scan_options.pop("top_subtrees", None)
+    timings = {} if scan_options.get("profile") else None
+    journal = None
+    replay = {"dirs": 0, "folders": 0, "files": 0}
+    if (checkpoint or resume) and engine != "multithread":
+        print(f"Checkpoints are not supported by the {engine} engine; running without them.")
+    elif checkpoint or resume:
+        journal = CheckpointJournal(
+            os.path.join(output_folder, f"directorynator_checkpoint_{root_key(root_dir)}.jsonl")
+        )
+        metadata = bool(scan_options.get("metadata"))
+        header = journal.header() if resume else {}
+        resuming = header.get("root") == root_dir and header.get("metadata", False) == metadata
+        if resume and not resuming:
+            print(f"No matching checkpoint for {root_dir} (metadata={metadata}); starting a full scan.")
+        if resuming:
+            scan_options["start_dirs"] = journal.frontier(root_dir)
+            print(f"Resuming from checkpoint: {len(scan_options['start_dirs'])} directories left in the frontier.")
+        journal.open(root_dir, metadata=metadata, append=resuming)
+    if progress is not None:
+        progress.begin(root_dir)
+    records = SCAN_RECORD_ITERATORS[engine](root_dir, workers, **scan_options)
+    if journal is not None:
+        records = journal.track(records)
+        if "start_dirs" in scan_options:
+            records = itertools.chain(replay_journal(journal, replay), records)
+    snapshot_path = snapshot_path_for(output_folder, root_dir) if diff else None
+    sorter = SnapshotSorter(snapshot_path + ".new", rules_digest=rules_fingerprint(rules)) if diff else None
+    if sorter is not None:
+        records = sorter.track(records)
+    search_builder = SearchIndexBuilder(search_index_path + ".new", root_dir) if search_index_path else None
+    if search_builder is not None:
+        records = search_builder.track(records)
+    scan_completed = False
+    try:
+        if rollup is not None:
+            write_report_stream(
+                text_path,
+                rollup.track(records),
+                timings=timings,
+                formatter=format_metadata_report_block,
+                binary_path=binary_path,
+            )
+        else:
+            write_report_stream(
+                text_path,
+                ((folder, files) for folder, _, files in records),
+                timings=timings,
+                binary_path=binary_path,
+            )
+        scan_completed = True
+    finally:
+        if scan_index is not None:
+            scan_index.close()
+        if journal is not None:
+            # Only a scan that ran to the end drops its journal; errors and Ctrl-C leave it for --resume.
+            journal.close(completed=scan_completed)
+    if progress is not None:
+        progress.finish(persist="start_dirs" not in scan_options)
+    if history_path is not None and "start_dirs" not in scan_options:
+        save_subtree_history(history_path, scan_options["subtree_history"])
+    if replay["dirs"]:
+        stats["folders"] += replay["folders"]
+        stats["files"] += replay["files"]
+        stats["resumed_dirs"] = replay["dirs"]
+    if rollup is not None:
+        stats["disk_usage"] = rollup.summary()
+        if text_path is not None:
+            append_largest_subtrees(text_path, stats["disk_usage"])
+    if sorter is not None:
+        sorter.finish()
+        if os.path.exists(snapshot_path):
+            previous_rules = read_snapshot_rules(snapshot_path)
+            if previous_rules == sorter.rules_digest:
+                stats["diff_path"] = report_base + ".diff"
+                stats["diff"] = diff_snapshots(snapshot_path, sorter.snapshot_path, stats["diff_path"])
+            else:
+                # Entries excluded by only one of the two rule sets would show up as spurious adds/removes.
+                stats["diff_skipped"] = (
+                    "exclusion rules differ from the previous snapshot"
+                    if previous_rules is not None
+                    else "previous snapshot has an older format"
+                )
+        os.replace(sorter.snapshot_path, snapshot_path)
+    if search_builder is not None:
+        stats["search_index_entries"] = search_builder.finish()
+        os.replace(search_builder.db_path, search_index_path)
+        stats["search_index_path"] = search_index_path
 
-    summary_payload = {"mode": "multithread", "report_path": report_path, "stats": stats}
-    summary_path = write_small_results_file(output_folder, summary_payload, "run")
+    summary_payload = {"mode": engine, "report_path": report_path, "stats": stats}
+    if binary_path is not None:
+        summary_payload["binary_report_path"] = binary_path
+    if timings is not None:
+        stats["profile"].update(timings)
+        started = time.perf_counter()
+        summary_path = write_small_results_file(output_folder, summary_payload, "run")
+        # The summary cannot time its own write, so it records the first write and is written again.
+        stats["profile"]["summary_write_seconds"] = round(time.perf_counter() - started, 4)
+        summary_path = write_small_results_file(output_folder, summary_payload, "run")
+    else:
+        summary_path = write_small_results_file(output_folder, summary_payload, "run")
 
     print("\nSummary:")
     print(f"Workers used: {stats['workers']}")
+    if "rate_limit" in stats:
+        rate_limit = stats["rate_limit"]
+        print(
+            f"Rate limit: dirs/s {rate_limit['observed_dirs_per_sec']} observed vs "
+            f"{rate_limit['target_dirs_per_sec'] or 'unlimited'} target, entries/s "
+            f"{rate_limit['observed_entries_per_sec']} observed vs "
+            f"{rate_limit['target_entries_per_sec'] or 'unlimited'} target "
+            f"({rate_limit['throttled_worker_seconds']}s of worker time throttled)"
+        )
+    if "pruned" in stats:
+        print(f"Entries pruned by exclusion rules: {stats['pruned_total']}")
+        for label, count in sorted(stats["pruned"].items(), key=lambda item: -item[1]):
+            print(f"    {label}: {count}")
+    if stats.get("adaptive"):
+        print(
+            f"Adaptive workers: {stats['workers_initial']} -> {stats['workers_final']} "
+            f"(best {stats['workers_best']} at {stats['best_dirs_per_sec']} dirs/s, "
+            f"{len(stats['concurrency_trajectory'])} adjustments)"
+        )
+    if "devices" in stats:
+        for mount_point, device in stats["devices"].items():
+            print(
+                f"Device {mount_point} ({device['fs_type']}): {device['workers']} workers"
+                f"{' from benchmark history' if device['profiled'] else ''}, "
+                f"{device['folders']} folders, {device['files']} files in {device['elapsed']:.2f}s"
+            )
+        if stats["one_file_system"]:
+            print(f"Mount points not crossed (--one-file-system): {stats['mounts_skipped']}")
+    if "profile" in stats:
+        profile = stats["profile"]
+        print(
+            f"Profile: scandir p50 <= {profile['scandir_latency_p50_us_max']}us, "
+            f"p99 <= {profile['scandir_latency_p99_us_max']}us, worker utilization "
+            f"{profile['worker_utilization']:.1%}, dispatcher waited {profile['dispatcher_wait_seconds']}s, "
+            f"report writer {profile['report_write_seconds']}s (producer blocked "
+            f"{profile['report_producer_blocked_seconds']}s)"
+        )
+        for item in profile["slowest_dirs"][:5]:
+            print(f"    slow: {item['seconds'] * 1000:.2f} ms  {item['entries']} entries  {item['path']}")
+    if "disk_usage" in stats:
+        disk_usage = stats["disk_usage"]
+        if disk_usage["total_bytes"] is not None:
+            print(
+                f"Disk usage: {format_size(disk_usage['total_bytes'])} apparent, "
+                f"{format_size(disk_usage['allocated_bytes'])} allocated "
+                f"({disk_usage['hardlinks_deduplicated']} extra hardlinks counted once)"
+            )
+        for item in disk_usage["largest_subtrees"][:5]:
+            print(f"    {format_size(item['bytes']):>12}  {item['path']}")
+    if "diff" in stats:
+        changes = stats["diff"]
+        print(
+            f"Changes since last snapshot: +{changes['added_dirs']} dirs / +{changes['added_files']} files, "
+            f"-{changes['removed_dirs']} dirs / -{changes['removed_files']} files, "
+            f"{changes['changed_files']} files changed ({stats['diff_path']})"
+        )
+    elif "diff_skipped" in stats:
+        print(f"Diff skipped: {stats['diff_skipped']}; this run is the new diff baseline.")
+    elif diff:
+        print("No previous snapshot for this root; this run is the diff baseline.")
+    if "resumed_dirs" in stats:
+        print(f"Directories replayed from checkpoint: {stats['resumed_dirs']}")
+    if "search_index_path" in stats:
+        print(f"Search index: {stats['search_index_entries']} names in {stats['search_index_path']}")
+    if "steals" in stats:
+        print(f"Work-stealing: {stats['steals']} steals, {stats['result_batches']} result batches")
+    if "peak_open_fds" in stats:
+        print(
+            f"fd-relative opens: peak {stats['peak_open_fds']}/{stats['fd_budget']} fds held, "
+            f"{stats['path_opens']} path fallbacks"
+        )
+    if "processes" in stats:
+        print(f"Processes x threads: {stats['processes']} x {stats['threads_per_process']} ({stats['shards']} shards)")
     print(f"Total number of folders: {stats['folders']}")
     print(f"Total number of files: {stats['files']}")
     print(f"Permission-denied entries skipped: {stats['permissions_skipped']}")
     print(f"Other IO errors: {stats['other_errors']}")
     print(f"Throttle per submit: {stats['throttle_ms']} ms")
     print(f"Time taken: {stats['elapsed']:.2f} seconds")
+    if "straggler_tail_seconds" in stats:
+        print(
+            f"Straggler tail ({stats['scheduler']}): {stats['straggler_tail_seconds']:.2f} seconds with idle workers"
+            + (f", {stats['history_subtrees']} subtree sizes from history" if "history_subtrees" in stats else "")
+        )
+    if "index_hit_ratio" in stats:
+        print(
+            f"Scan index reuse: {stats['index_hits']} cached / {stats['index_misses']} rescanned "
+            f"(hit ratio {stats['index_hit_ratio']:.2%})"
+        )
     print(f"Directory report saved to: {report_path} successfully!")
+    if binary_path is not None and binary_path != report_path:
+        print(f"Binary report saved to: {binary_path}")
+    print(f"Small results file saved to: {summary_path}")
+    return stats, report_path, summary_path
+
+
+def load_manifest(manifest_path, base_options=None):
+    """Reads a JSON manifest into per-root scan specs; raises ValueError on duplicate roots."""
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if isinstance(manifest, list):
+        manifest = {"roots": manifest}
+    base_options = base_options or {}
+    specs = []
+    seen_roots = {}
+    for entry in manifest.get("roots", []):
+        entry = {"root": entry} if isinstance(entry, str) else entry
+        # Symlinked or relative spellings of one directory would scan it twice into two reports.
+        root_dir = os.path.realpath(entry["root"])
+        if root_dir in seen_roots:
+            raise ValueError(
+                f"Manifest {manifest_path} lists {root_dir} twice "
+                f"(as '{seen_roots[root_dir]}' and '{entry['root']}')"
+            )
+        seen_roots[root_dir] = entry["root"]
+        throttle_ms = max(0, entry.get("throttle_ms", 0))
+        rate_limits = None
+        if entry.get("max_dirs_per_sec") or entry.get("max_entries_per_sec"):
+            rate_limits = {
+                "dirs_per_sec": entry.get("max_dirs_per_sec"),
+                "entries_per_sec": entry.get("max_entries_per_sec"),
+                "burst_seconds": base_options.get("burst_seconds", 1.0),
+            }
+        specs.append(
+            {
+                "root": root_dir,
+                "weight": max(0.001, float(entry.get("weight", 1))),
+                "throttle_ms": throttle_ms,
+                "rules": load_scan_rules(
+                    root_dir,
+                    patterns=list(base_options.get("patterns", ())) + list(entry.get("exclude", [])),
+                    prefixes=list(base_options.get("prefixes", ())) + list(entry.get("exclude_prefixes", [])),
+                    fstypes=list(base_options.get("fstypes", ())) + list(entry.get("exclude_fstypes", [])),
+                    rules_file=entry.get("rules_file") or base_options.get("rules_file"),
+                    skip_pseudo_fs=base_options.get("skip_pseudo_fs", False),
+                ),
+                "limiter": build_rate_limiter(throttle_ms, rate_limits),
+            }
+        )
+    return specs, manifest.get("workers")
+
+
+def iter_shared_pool_scan_records(specs, thread_count, root_stats=None):
+    """Scans many roots on one weighted fair-share pool; yields (root_index, folder, subfolders, files)."""
+    states = [{"pending": deque([spec["root"]]), "active": 0, "dispatched": 0, "started": None} for spec in specs]
+    counters = [{"folders": 0, "files": 0, "permissions_skipped": 0, "other_errors": 0} for _ in specs]
+    pruned_baselines = [spec["rules"].pruned_counts() if spec["rules"] is not None else None for spec in specs]
+    active_futures = {}
+    inflight_limit = max(thread_count * 2, 8)
+    start_time = time.time()
+
+    def share(index):
+        return states[index]["active"] / specs[index]["weight"], states[index]["dispatched"] / specs[index]["weight"]
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        while active_futures or any(state["pending"] for state in states):
+            throttled_wait = None
+            while len(active_futures) < inflight_limit:
+                ready = []
+                for index, state in enumerate(states):
+                    if not state["pending"]:
+                        continue
+                    limiter = specs[index]["limiter"]
+                    delay = limiter.dispatch_delay() if limiter is not None else 0.0
+                    if delay > 0:
+                        throttled_wait = delay if throttled_wait is None else min(throttled_wait, delay)
+                    else:
+                        ready.append(index)
+                if not ready:
+                    break
+                index = min(ready, key=share)
+                state, spec = states[index], specs[index]
+                if state["started"] is None:
+                    state["started"] = time.time()
+                current_dir = state["pending"].popleft()
+                state["active"] += 1
+                state["dispatched"] += 1
+                if spec["limiter"] is not None:
+                    spec["limiter"].charge_directory()
+                future = executor.submit(traverse_directory, current_dir, spec["rules"])
+                active_futures[future] = (index, current_dir)
+
+            if not active_futures:
+                time.sleep(throttled_wait)
+                continue
+            completed, _ = wait(active_futures, timeout=throttled_wait, return_when=FIRST_COMPLETED)
+            for future in completed:
+                index, current_dir = active_futures.pop(future)
+                state, counter = states[index], counters[index]
+                state["active"] -= 1
+                try:
+                    result_folders, result_files, denied, errors = future.result()
+                except Exception as error:
+                    counter["other_errors"] += 1
+                    print(f"Error processing '{current_dir}': {error}")
+                    result_folders, result_files, denied, errors = [], [], 0, 0
+                if specs[index]["limiter"] is not None:
+                    specs[index]["limiter"].charge_entries(len(result_folders) + len(result_files))
+                counter["files"] += len(result_files)
+                counter["folders"] += len(result_folders)
+                counter["permissions_skipped"] += denied
+                counter["other_errors"] += errors
+                state["pending"].extend(result_folders)
+                yield index, current_dir, result_folders, result_files
+                if not state["pending"] and not state["active"]:
+                    counter["finished_after"] = time.time() - start_time
+                    counter["elapsed"] = time.time() - state["started"]
+                    yield index, None, None, None
+
+    if root_stats is not None:
+        for spec, state, counter, baseline in zip(specs, states, counters, pruned_baselines):
+            entry = {"root": spec["root"], "weight": spec["weight"], "throttle_ms": spec["throttle_ms"], **counter}
+            entry["dirs_dispatched"] = state["dispatched"]
+            record_pruned_stats(entry, spec["rules"], baseline)
+            record_rate_limit_stats(entry, spec["limiter"])
+            root_stats.append(entry)
+
+
+def generate_manifest_report(manifest_path, thread_count=None, base_options=None):
+    """Scans every manifest root on one shared pool into per-root reports and one combined summary JSON."""
+    specs, manifest_workers = load_manifest(manifest_path, base_options)
+    if not specs:
+        print(f"Manifest {manifest_path} lists no roots.")
+        return None
+    output_folder = ensure_output_folder()
+    workers = detect_recommended_threads(thread_count or manifest_workers)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    report_paths = [
+        os.path.join(
+            output_folder,
+            f"directorynator_manifest_{report_label(spec['root'])}_{root_key(spec['root'])}_{timestamp}.txt",
+        )
+        for spec in specs
+    ]
+    # A single writer thread serves every root's report, fed from the dispatcher through one bounded buffer;
+    # (index, None) closes that root's report as soon as the root finishes.
+    buffer = queue.Queue(maxsize=REPORT_STREAM_BUFFER)
+
+    def writer():
+        report_files = {}
+        try:
+            while True:
+                item = buffer.get()
+                if item is None:
+                    return
+                index, block = item
+                if block is None:
+                    report_files.pop(index).close()
+                    continue
+                if index not in report_files:
+                    report_files[index] = open(report_paths[index], "w", encoding="latin-1", errors="replace")
+                report_files[index].write(format_report_block(*block))
+        except Exception as error:
+            print(f"Error writing report: {error}")
+            # Keep draining so the dispatcher never blocks on a dead writer.
+            while buffer.get() is not None:
+                pass
+        finally:
+            for report_file in report_files.values():
+                report_file.close()
+
+    writer_thread = threading.Thread(target=writer, name="directorynator-report-writer", daemon=True)
+    writer_thread.start()
+
+    print(f"\nManifest scan => {len(specs)} roots on one pool of {workers} workers")
+    root_stats = []
+    start_time = time.time()
+    try:
+        for index, folder, _, files in iter_shared_pool_scan_records(specs, workers, root_stats):
+            if folder is None:
+                buffer.put((index, None))
+                print(f"Finished {specs[index]['root']} after {time.time() - start_time:.2f}s")
+            else:
+                buffer.put((index, (folder, files)))
+    finally:
+        buffer.put(None)
+        writer_thread.join()
+    elapsed = time.time() - start_time
+
+    for entry, report_path in zip(root_stats, report_paths):
+        entry["report_path"] = report_path
+    payload = {
+        "mode": "manifest",
+        "manifest": os.path.abspath(manifest_path),
+        "workers": workers,
+        "elapsed": elapsed,
+        "roots_scanned": len(root_stats),
+        "folders": sum(entry["folders"] for entry in root_stats),
+        "files": sum(entry["files"] for entry in root_stats),
+        "permissions_skipped": sum(entry["permissions_skipped"] for entry in root_stats),
+        "other_errors": sum(entry["other_errors"] for entry in root_stats),
+        "roots": root_stats,
+    }
+    summary_path = write_small_results_file(output_folder, payload, "manifest")
+
+    print("\nSummary:")
+    for entry in root_stats:
+        print(
+            f"    {entry['root']} (weight {entry['weight']:g}): {entry['folders']} folders, {entry['files']} files "
+            f"in {entry.get('elapsed', 0.0):.2f}s -> {entry['report_path']}"
+        )
+    print(f"Workers used: {workers}")
+    print(f"Total number of folders: {payload['folders']}")
+    print(f"Total number of files: {payload['files']}")
+    print(f"Permission-denied entries skipped: {payload['permissions_skipped']}")
+    print(f"Other IO errors: {payload['other_errors']}")
+    print(f"Time taken: {elapsed:.2f} seconds")
+    print(f"Small results file saved to: {summary_path}")
+    return payload, summary_path
+
+
+def index_text(value):
+    """sqlite TEXT cannot hold surrogate-escaped bytes; undecodable names are stored with U+FFFD."""
+    try:
+        value.encode("utf-8")
+        return value
+    except UnicodeEncodeError:
+        return os.fsencode(value).decode("utf-8", "replace")
+
+
+def name_trigrams(name_lower):
+    return {name_lower[index : index + 3] for index in range(len(name_lower) - 2)}
+
+
+class SearchIndexBuilder:
+    """Builds the filename search index from scan records into a fresh sqlite3 file."""
+
+    def __init__(self, db_path, root_dir):
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.executescript(
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE dirs (id INTEGER PRIMARY KEY, path TEXT);"
+            "CREATE TABLE terms (id INTEGER PRIMARY KEY, name_lower TEXT);"
+            "CREATE TABLE names (dir_id INTEGER, term_id INTEGER, name TEXT, ext TEXT, is_dir INTEGER, size INTEGER);"
+            "CREATE TABLE trigrams (gram TEXT, term_id INTEGER);"
+        )
+        self.root_dir = root_dir
+        self.term_cache = {}
+        self.next_term_id = 0
+        self.next_dir_id = 0
+        self.open_dirs = {}
+        self.pending = {"dirs": [], "terms": [], "names": [], "trigrams": []}
+        self.entries = 0
+
+    def term_id(self, name_lower):
+        term_id = self.term_cache.get(name_lower)
+        if term_id is None:
+            if len(self.term_cache) >= COMPACT_TREE_INTERN_LIMIT:
+                self.term_cache.clear()
+            term_id = self.term_cache[name_lower] = self.next_term_id
+            self.next_term_id += 1
+            self.pending["terms"].append((term_id, name_lower))
+            self.pending["trigrams"].extend((gram, term_id) for gram in name_trigrams(name_lower))
+        return term_id
+
+    def add_name(self, dir_id, name, is_dir, size=None):
+        name = index_text(name)
+        name_lower = name.lower()
+        extension = os.path.splitext(name_lower)[1][1:] if not is_dir else ""
+        self.pending["names"].append((dir_id, self.term_id(name_lower), name, extension, is_dir, size))
+        self.entries += 1
+        if len(self.pending["names"]) >= SEARCH_INDEX_BATCH:
+            self.flush()
+
+    def track(self, records):
+        """Passes (folder, subfolders, files) records through while indexing their names."""
+        for record in records:
+            folder, subfolders, files = record
+            dir_id = self.next_dir_id
+            self.next_dir_id += 1
+            self.pending["dirs"].append((dir_id, index_text(folder)))
+            parent_id = self.open_dirs.pop(folder, None)
+            if parent_id is not None:
+                self.add_name(parent_id, os.path.basename(folder), 1)
+            for subfolder in subfolders:
+                self.open_dirs[subfolder] = dir_id
+            for file in files:
+                if isinstance(file, FileMeta):
+                    self.add_name(dir_id, os.path.basename(file.path), 0, file.size)
+                else:
+                    self.add_name(dir_id, os.path.basename(file), 0)
+            yield record
+
+    def flush(self):
+        self.conn.executemany("INSERT INTO dirs VALUES (?, ?)", self.pending["dirs"])
+        self.conn.executemany("INSERT INTO terms VALUES (?, ?)", self.pending["terms"])
+        self.conn.executemany("INSERT INTO names VALUES (?, ?, ?, ?, ?, ?)", self.pending["names"])
+        self.conn.executemany("INSERT INTO trigrams VALUES (?, ?)", self.pending["trigrams"])
+        self.pending = {"dirs": [], "terms": [], "names": [], "trigrams": []}
+
+    def finish(self):
+        self.flush()
+        self.conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("root", index_text(self.root_dir)),
+                ("created", datetime.datetime.now().isoformat()),
+                ("entries", str(self.entries)),
+            ],
+        )
+        self.conn.executescript(
+            "CREATE INDEX terms_name ON terms (name_lower);"
+            "CREATE INDEX names_term ON names (term_id);"
+            "CREATE INDEX names_ext ON names (ext);"
+            "CREATE INDEX trigrams_gram ON trigrams (gram, term_id);"
+        )
+        self.conn.commit()
+        self.conn.close()
+        return self.entries
+
+
+class SearchIndex:
+    """Read side of the search index: prefix, glob, substring and extension queries."""
+
+    QUERY_TYPES = ("prefix", "glob", "substring", "ext")
+
+    def __init__(self, db_path):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"No search index at {db_path}; scan with --search-index first.")
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def trigram_filter(literal):
+        grams = sorted(name_trigrams(literal))
+        placeholders = ", ".join("?" * len(grams))
+        clause = (
+            f"t.id IN (SELECT term_id FROM trigrams WHERE gram IN ({placeholders}) "
+            f"GROUP BY term_id HAVING COUNT(*) = {len(grams)})"
+        )
+        return clause, grams
+
+    def query(self, query_type, pattern, limit=100):
+        """Returns [(path, is_dir, size)] for names matching `pattern`; every query type ignores case."""
+        clauses, params = [], []
+        if query_type == "prefix":
+            prefix = pattern.lower()
+            clauses.append("t.name_lower >= ? AND t.name_lower < ?")
+            params += [prefix, prefix + "\U0010ffff"]
+        elif query_type == "substring":
+            literal = pattern.lower()
+            if len(literal) >= 3:
+                clause, grams = self.trigram_filter(literal)
+                clauses.append(clause)
+                params += grams
+            clauses.append("instr(t.name_lower, ?) > 0")
+            params.append(literal)
+        elif query_type == "glob":
+            pattern = pattern.lower()
+            literal_prefix = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+            # Whole [...] classes are wildcards too; only text outside them must appear in the name.
+            longest_literal = max(re.split(r"\[\]?[^\]]*\]|[*?\[\]]", pattern), key=len)
+            if literal_prefix:
+                clauses.append("t.name_lower >= ? AND t.name_lower < ?")
+                params += [literal_prefix, literal_prefix + "\U0010ffff"]
+            elif len(longest_literal) >= 3:
+                clause, grams = self.trigram_filter(longest_literal)
+                clauses.append(clause)
+                params += grams
+            clauses.append("t.name_lower GLOB ?")
+            params.append(pattern)
+        elif query_type == "ext":
+            clauses.append("n.ext = ?")
+            params.append(pattern.lower().lstrip("."))
+        else:
+            raise ValueError(f"Unknown query type '{query_type}'; expected one of {self.QUERY_TYPES}")
+
+        rows = self.conn.execute(
+            "SELECT d.path, n.name, n.is_dir, n.size FROM names n "
+            "JOIN terms t ON t.id = n.term_id JOIN dirs d ON d.id = n.dir_id "
+            f"WHERE {' AND '.join(clauses)} LIMIT ?",
+            (*params, limit),
+        )
+        return [(os.path.join(folder, name), bool(is_dir), size) for folder, name, is_dir, size in rows]
+
+
+def run_search_query(index_path, query_type, pattern, limit=100):
+    started = time.perf_counter()
+    with SearchIndex(index_path) as index:
+        results = index.query(query_type, pattern, limit)
+        root = index.meta.get("root")
+        created = index.meta.get("created")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for path, is_dir, size in results:
+        print(f"{path}{os.sep if is_dir else ''}{f'  ({size} bytes)' if size is not None else ''}")
+    print(
+        f"\n{len(results)} match(es){' (limit reached)' if len(results) >= limit else ''} for {query_type} "
+        f"'{pattern}' in {elapsed_ms:.1f} ms (index of {root}, built {created})"
+    )
+    return results
+
+
+class HashCache:
+    """Persistent sqlite3 cache of partial/full file hashes, valid while (size, mtime_ns) still match."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, partial TEXT, full TEXT, "
+            "PRIMARY KEY (dev, inode))"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lookup(self, meta):
+        """Returns [partial, full] digests (either may be None) for an unchanged file, else None."""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, partial, full FROM hashes WHERE dev = ? AND inode = ?", (meta.dev, meta.inode)
+        ).fetchone()
+        if row is None or (row[0], row[1]) != (meta.size, meta.mtime_ns):
+            return None
+        return [row[2], row[3]]
+
+    def store(self, rows):
+        """rows: (meta, [partial, full]) pairs."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+            ((meta.dev, meta.inode, meta.size, meta.mtime_ns, *digests) for meta, digests in rows),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def partial_hash(meta, io_budget=None):
+    """Hash of the first and last PARTIAL_HASH_BYTES; for files no larger than both, the whole content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(meta.path, "rb") as handle:
+        head = handle.read(PARTIAL_HASH_BYTES)
+        digest.update(head)
+        read_bytes = len(head)
+        if meta.size > 2 * PARTIAL_HASH_BYTES:
+            handle.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            tail = handle.read(PARTIAL_HASH_BYTES)
+            digest.update(tail)
+            read_bytes += len(tail)
+        elif meta.size > PARTIAL_HASH_BYTES:
+            rest = handle.read()
+            digest.update(rest)
+            read_bytes += len(rest)
+    if io_budget is not None:
+        io_budget.acquire(read_bytes)
+    return digest.hexdigest()
+
+
+def full_hash(meta, io_budget=None):
+    """Whole-file hash: mmap for large files, 1 MiB buffered reads otherwise; hashlib releases the GIL."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(meta.path, "rb", buffering=0) as handle:
+        if meta.size >= MMAP_HASH_MIN_BYTES:
+            try:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    for offset in range(0, len(mapped), HASH_CHUNK_BYTES):
+                        with view[offset : offset + HASH_CHUNK_BYTES] as chunk:
+                            if io_budget is not None:
+                                io_budget.acquire(len(chunk))
+                            digest.update(chunk)
+                return digest.hexdigest()
+            except (ValueError, OSError):
+                digest = hashlib.blake2b(digest_size=20)
+                handle.seek(0)
+        buffer = bytearray(HASH_CHUNK_BYTES)
+        view = memoryview(buffer)
+        while True:
+            read_bytes = handle.readinto(buffer)
+            if not read_bytes:
+                break
+            if io_budget is not None:
+                io_budget.acquire(read_bytes)
+            digest.update(view[:read_bytes])
+    return digest.hexdigest()
+
+
+def refine_groups(groups, stage, executor, digests, cache_rows, io_budget, counters):
+    """Splits candidate groups by their stage digest ("partial" or "full"); returns groups of 2+."""
+    slot = 0 if stage == "partial" else 1
+    hasher = partial_hash if stage == "partial" else full_hash
+    futures = {}
+    for group in groups:
+        for meta in group:
+            if digests[meta][slot] is not None:
+                counters[f"{stage}_cache_hits"] += 1
+            else:
+                futures[executor.submit(hasher, meta, io_budget)] = meta
+    for future in futures:
+        meta = futures[future]
+        try:
+            digests[meta][slot] = future.result()
+        except OSError:
+            counters["hash_errors"] += 1
+            continue
+        counters[f"{stage}_hashed_bytes"] += min(meta.size, 2 * PARTIAL_HASH_BYTES) if stage == "partial" else meta.size
+        cache_rows.append(meta)
+
+    refined = []
+    for group in groups:
+        by_digest = {}
+        for meta in group:
+            if digests[meta][slot] is not None:
+                by_digest.setdefault(digests[meta][slot], []).append(meta)
+        refined.extend(members for members in by_digest.values() if len(members) > 1)
+    return refined
+
+
+def find_duplicate_files(
+    root_dir, thread_count=None, min_size=1, io_bytes_per_sec=None, cache_path=None, rules=None, limiter=None
+):
+    """Finds groups of identical files by size, partial hash and full hash; returns (groups, stats)."""
+    workers = detect_recommended_threads(thread_count)
+    scan_stats = {}
+    by_size = {}
+    seen_links = set()
+    hardlinks_skipped = 0
+    for _, _, files in iter_multithread_scan_records(
+        root_dir, workers, stats=scan_stats, rules=rules, limiter=limiter, metadata=True
+    ):
+        for meta in files:
+            if meta.size < min_size:
+                continue
+            if meta.nlink > 1:
+                link_key = (meta.dev, meta.inode)
+                if link_key in seen_links:
+                    hardlinks_skipped += 1
+                    continue
+                seen_links.add(link_key)
+            by_size.setdefault(meta.size, []).append(meta)
+    seen_links = None
+    size_groups = [group for group in by_size.values() if len(group) > 1]
+    by_size = None
+
+    started = time.time()
+    counters = {
+        "partial_cache_hits": 0,
+        "full_cache_hits": 0,
+        "partial_hashed_bytes": 0,
+        "full_hashed_bytes": 0,
+        "hash_errors": 0,
+    }
+    cache = HashCache(cache_path) if cache_path else None
+    io_budget = TokenBucket(io_bytes_per_sec) if io_bytes_per_sec else None
+    digests = {}
+    for group in size_groups:
+        for meta in group:
+            cached = cache.lookup(meta) if cache is not None else None
+            digests[meta] = cached or [None, None]
+    cache_rows = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partial_groups = refine_groups(size_groups, "partial", executor, digests, cache_rows, io_budget, counters)
+            # Small files were hashed whole by the partial stage; only larger ones need a full pass.
+            confirmed = [group for group in partial_groups if group[0].size <= 2 * PARTIAL_HASH_BYTES]
+            confirmed += refine_groups(
+                [group for group in partial_groups if group[0].size > 2 * PARTIAL_HASH_BYTES],
+                "full",
+                executor,
+                digests,
+                cache_rows,
+                io_budget,
+                counters,
+            )
+        if cache is not None:
+            cache.store((meta, digests[meta]) for meta in dict.fromkeys(cache_rows))
+    finally:
+        if cache is not None:
+            cache.close()
+
+    confirmed.sort(key=lambda group: group[0].size * (len(group) - 1), reverse=True)
+    stats = {
+        "root": root_dir,
+        "folders": scan_stats["folders"],
+        "files": scan_stats["files"],
+        "scan_elapsed": scan_stats["elapsed"],
+        "hash_elapsed": time.time() - started,
+        "workers": workers,
+        "min_size": min_size,
+        "io_bytes_per_sec": io_bytes_per_sec,
+        "hardlinks_skipped": hardlinks_skipped,
+        "size_candidates": sum(len(group) for group in size_groups),
+        "partial_candidates": sum(len(group) for group in partial_groups),
+        "duplicate_groups": len(confirmed),
+        "duplicate_files": sum(len(group) for group in confirmed),
+        "wasted_bytes": sum(group[0].size * (len(group) - 1) for group in confirmed),
+        **counters,
+    }
+    if io_budget is not None:
+        stats["io_throttled_seconds"] = round(io_budget.waited, 3)
+    return confirmed, stats
+
+
+def generate_duplicates_report(
+    root_dir=None,
+    thread_count=None,
+    min_size=1,
+    io_bytes_per_sec=None,
+    cache_path=None,
+    rules=None,
+    throttle_ms=0,
+    rate_limits=None,
+):
+    root_dir = root_dir or os.path.abspath(os.sep)
+    output_folder = ensure_output_folder()
+    groups, stats = find_duplicate_files(
+        root_dir,
+        thread_count,
+        min_size=min_size,
+        io_bytes_per_sec=io_bytes_per_sec,
+        cache_path=cache_path,
+        rules=rules,
+        limiter=build_rate_limiter(throttle_ms, rate_limits),
+    )
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    report_path = os.path.join(output_folder, f"directorynator_duplicates_{timestamp}.txt")
+    try:
+        with open(report_path, "w", encoding="latin-1", errors="replace") as report_file:
+            report_file.write(f"Duplicate files under: {root_dir}\n")
+            report_file.write(
+                f"Groups: {stats['duplicate_groups']} | files: {stats['duplicate_files']} | "
+                f"wasted: {format_size(stats['wasted_bytes'])} ({stats['wasted_bytes']} bytes)\n\n"
+            )
+            for index, group in enumerate(groups, start=1):
+                report_file.write(
+                    f"{index}. {len(group)} copies x {group[0].size} bytes | "
+                    f"wasted {format_size(group[0].size * (len(group) - 1))}\n"
+                )
+                report_file.writelines(f"    {meta.path}\n" for meta in group)
+                report_file.write("\n")
+    except Exception as error:
+        print(f"Error writing report: {error}")
+
+    summary_payload = {
+        "mode": "duplicates",
+        "report_path": report_path,
+        "stats": stats,
+        "largest_groups": [
+            {
+                "size": group[0].size,
+                "copies": len(group),
+                "wasted_bytes": group[0].size * (len(group) - 1),
+                "paths": [meta.path for meta in group],
+            }
+            for group in groups[:DUPLICATE_SUMMARY_GROUPS]
+        ],
+    }
+    summary_path = write_small_results_file(output_folder, summary_payload, "duplicates")
+
+    print("\nSummary:")
+    print(f"Files scanned: {stats['files']} in {stats['folders']} folders ({stats['scan_elapsed']:.2f}s)")
+    print(
+        f"Candidates: {stats['size_candidates']} by size -> {stats['partial_candidates']} by partial hash -> "
+        f"{stats['duplicate_files']} confirmed"
+    )
+    print(
+        f"Hashed: {format_size(stats['partial_hashed_bytes'])} partial, {format_size(stats['full_hashed_bytes'])} full "
+        f"(cache hits {stats['partial_cache_hits']} partial / {stats['full_cache_hits']} full) "
+        f"in {stats['hash_elapsed']:.2f}s"
+    )
+    print(f"Duplicate groups: {stats['duplicate_groups']}, wasted: {format_size(stats['wasted_bytes'])}")
+    if stats["hash_errors"]:
+        print(f"Unreadable files skipped: {stats['hash_errors']}")
+    print(f"Duplicates report saved to: {report_path} successfully!")
     print(f"Small results file saved to: {summary_path}")
     return stats, report_path, summary_path
 
 
-def get_benchmark_thread_candidates():
-    cores = os.cpu_count() or 4
-    candidates = {1, max(2, cores // 2), cores, detect_recommended_threads(), min(128, cores * 2)}
-    return sorted(candidates)
+def get_benchmark_thread_candidates():
+    cores = os.cpu_count() or 4
+    candidates = {1, max(2, cores // 2), cores, detect_recommended_threads(), min(128, cores * 2)}
+    return sorted(candidates)
+
+
+def get_benchmark_engine_candidates(engines=None):
+    """(engine, workers) pairs: threaded engines sweep worker counts, others run at the recommended count."""
+    candidates = []
+    for engine in engines or DEFAULT_BENCHMARK_ENGINES:
+        if engine in THREAD_SWEEP_ENGINES:
+            candidates.extend((engine, workers) for workers in get_benchmark_thread_candidates())
+        else:
+            candidates.append((engine, detect_recommended_threads()))
+    return candidates
+
+
+def run_benchmark_candidate(engine, workers, scan_root, throttle_ms, rules, rate_limits, progress=None):
+    options = {}
+    if progress is not None:
+        progress.begin(scan_root, phase=f"benchmark {engine} x{workers}")
+        if engine == "multithread":
+            options["progress"] = progress
+    _, run_stats = SCAN_ENGINES[engine](
+        scan_root,
+        workers,
+        throttle_ms=throttle_ms,
+        rules=rules,
+        limiter=build_rate_limiter(throttle_ms, rate_limits),
+        **options,
+    )
+    if progress is not None:
+        progress.update(
+            run_stats["folders"] + 1, run_stats["folders"], run_stats["files"], run_stats["other_errors"], 0, 0
+        )
+        progress.finish()
+    return run_stats
+
+
+def rotated(items, offset):
+    """Round-robin order so no candidate always runs first (cold) or last (warmest page cache)."""
+    offset %= max(1, len(items))
+    return items[offset:] + items[:offset]
+
+
+def select_sample_subtrees(root_dir, sample_size, rules=None, seed=0):
+    """Picks up to sample_size disjoint subtrees spread across the size range of the root's children."""
+    frontier = [root_dir]
+    sized = []
+    for _ in range(BENCHMARK_SAMPLE_MAX_DEPTH):
+        level = []
+        for dirpath in frontier:
+            try:
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                        if rules is not None and rules.prune(dirpath, entry.name, True, entry.path):
+                            continue
+                        try:
+                            with os.scandir(entry.path) as children:
+                                entry_count = sum(1 for _ in children)
+                        except OSError:
+                            continue
+                        level.append((entry_count, entry.path))
+            except OSError:
+                continue
+        if not level:
+            break
+        sized = level
+        if len(sized) >= sample_size * 2:
+            break
+        frontier = [path for _, path in sized]
+    if not sized:
+        return [root_dir]
+
+    random.Random(seed).shuffle(sized)
+    sized.sort(key=lambda item: item[0])
+    if len(sized) <= sample_size:
+        sample_size = len(sized)
+    step = (len(sized) - 1) / max(1, sample_size - 1)
+    picks = [sized[round(index * step)][1] for index in range(sample_size)]
+    # Bit-reversed order: every power-of-two prefix (an early halving round) still spans the size range.
+    bits = max(1, (len(picks) - 1).bit_length())
+    return [picks[index] for index in sorted(range(len(picks)), key=lambda i: int(f"{i:0{bits}b}"[::-1], 2))]
+
+
+def benchmark_successive_halving(
+    root_dir, candidates, iterations, throttle_ms, rules, rate_limits, sample_size, finalists, progress=None
+):
+    """Ranks candidates on sampled subtrees by successive halving, then times finalists on the full tree."""
+    sample = select_sample_subtrees(root_dir, sample_size, rules)
+    print(f"Sampled {len(sample)} subtrees for successive halving")
+    # Warm with an engine under test: a multithread warm-up leaves e.g. a multiprocess-only field cold.
+    for subtree in sample:
+        run_benchmark_candidate(*candidates[0], subtree, throttle_ms, rules, rate_limits, progress)
+
+    survivors = list(candidates)
+    eliminated = []
+    rounds = max(1, math.ceil(math.log2(max(1, len(survivors) / finalists)))) if len(survivors) > finalists else 0
+    for round_number in range(rounds):
+        subset = sample[: max(1, math.ceil(len(sample) / 2 ** (rounds - 1 - round_number)))]
+        totals = {candidate: {"elapsed": 0.0, "files": 0} for candidate in survivors}
+        for position, subtree in enumerate(subset):
+            for candidate in rotated(survivors, position + round_number):
+                run_stats = run_benchmark_candidate(*candidate, subtree, throttle_ms, rules, rate_limits, progress)
+                totals[candidate]["elapsed"] += run_stats["elapsed"]
+                totals[candidate]["files"] += run_stats["files"]
+
+        ranked = sorted(survivors, key=lambda candidate: totals[candidate]["elapsed"])
+        # Halving can leave more than `finalists` when the field is not a power of two; the last round trims it.
+        keep = finalists if round_number == rounds - 1 else max(finalists, math.ceil(len(ranked) / 2))
+        for engine, workers in ranked[keep:]:
+            sample_total = totals[(engine, workers)]
+            eliminated.append(
+                {
+                    "engine": engine,
+                    "workers": workers,
+                    "round": round_number + 1,
+                    "sample_subtrees": len(subset),
+                    "sample_elapsed": round(sample_total["elapsed"], 4),
+                    "sample_files": sample_total["files"],
+                }
+            )
+            print(
+                f"Round {round_number + 1}: dropped engine={engine} workers={workers} "
+                f"sample_time={sample_total['elapsed']:.3f}s"
+            )
+        survivors = ranked[:keep]
+
+    run_times = {candidate: [] for candidate in survivors}
+    last_stats = {}
+    for iteration in range(iterations):
+        for candidate in rotated(survivors, iteration):
+            last_stats[candidate] = run_benchmark_candidate(
+                *candidate, root_dir, throttle_ms, rules, rate_limits, progress
+            )
+            run_times[candidate].append(last_stats[candidate]["elapsed"])
+
+    results = []
+    for candidate in survivors:
+        run_stats = last_stats[candidate]
+        average_time = sum(run_times[candidate]) / len(run_times[candidate])
+        run_stats["engine"] = candidate[0]
+        run_stats["elapsed"] = average_time
+        run_stats["throughput_files_per_sec"] = round(run_stats["files"] / average_time, 2) if average_time > 0 else 0
+        results.append(run_stats)
+    return results, {"sample_subtrees": sample, "eliminated": eliminated}
 
 
-def benchmark_multithread(root_dir=None, iterations=1, throttle_ms=0):
+def benchmark_multithread(
+    root_dir=None,
+    iterations=1,
+    throttle_ms=0,
+    engines=None,
+    rules=None,
+    rate_limits=None,
+    strategy="full",
+    sample_size=BENCHMARK_SAMPLE_SUBTREES,
+    finalists=BENCHMARK_FINALISTS,
+    progress=None,
+):
     root_dir = root_dir or os.path.abspath(os.sep)
     output_folder = ensure_output_folder()
-    candidates = get_benchmark_thread_candidates()
+    candidates = get_benchmark_engine_candidates(engines)
     results = []
+    halving = None
 
     print(f"\nRunning benchmark on: {root_dir}")
     print(f"CPU logical cores detected: {os.cpu_count() or 'unknown'}")
     print(f"Worker candidates: {candidates}")
 
-    for workers in candidates:
-        run_times, run_stats = [], None
-        for _ in range(iterations):
-            _, run_stats = multithread_scan(root_dir, workers, throttle_ms=throttle_ms)
-            run_times.append(run_stats["elapsed"])
+    if strategy == "halving":
+        results, halving = benchmark_successive_halving(
+            root_dir, candidates, iterations, throttle_ms, rules, rate_limits, sample_size, max(1, finalists), progress
+        )
+    else:
+        for engine, workers in candidates:
+            run_times, run_stats = [], None
+            for _ in range(iterations):
+                run_stats = run_benchmark_candidate(
+                    engine, workers, root_dir, throttle_ms, rules, rate_limits, progress
+                )
+                run_times.append(run_stats["elapsed"])
 
-        average_time = sum(run_times) / len(run_times)
-        run_stats["elapsed"] = average_time
-        run_stats["throughput_files_per_sec"] = round(run_stats["files"] / average_time, 2) if average_time > 0 else 0
-        results.append(run_stats)
+            average_time = sum(run_times) / len(run_times)
+            run_stats["engine"] = engine
+            run_stats["elapsed"] = average_time
+            run_stats["throughput_files_per_sec"] = (
+                round(run_stats["files"] / average_time, 2) if average_time > 0 else 0
+            )
+            results.append(run_stats)
+    for run_stats in results:
         print(
-            f"Workers={workers:>3} | avg={average_time:.2f}s | "
+            f"Engine={run_stats['engine']:<12} | workers={run_stats['workers']:>3} | avg={run_stats['elapsed']:.2f}s | "
             f"files/s={run_stats['throughput_files_per_sec']}"
         )
 
@@ -221,15 +4130,23 @@ def benchmark_multithread(root_dir=None, iterations=1, throttle_ms=0):
         benchmark_file.write(f"Benchmark root: {root_dir}\n")
         benchmark_file.write(f"Logical CPU cores: {os.cpu_count() or 'unknown'}\n")
         benchmark_file.write(f"Iterations per worker count: {iterations}\n")
-        benchmark_file.write(f"Throttle per submit: {throttle_ms} ms\n\n")
+        benchmark_file.write(f"Throttle per submit: {throttle_ms} ms\n")
+        benchmark_file.write(f"Strategy: {strategy}\n\n")
         benchmark_file.write("Ranked results (fastest first):\n")
         for index, item in enumerate(results, start=1):
             benchmark_file.write(
-                f"{index}. workers={item['workers']} | avg_time={item['elapsed']:.2f}s "
+                f"{index}. engine={item['engine']} | workers={item['workers']} | avg_time={item['elapsed']:.2f}s "
                 f"| files_per_sec={item['throughput_files_per_sec']} "
                 f"| folders={item['folders']} | files={item['files']} "
                 f"| permissions_skipped={item['permissions_skipped']} | errors={item['other_errors']}\n"
             )
+        if halving:
+            benchmark_file.write(f"\nEliminated on {len(halving['sample_subtrees'])} sampled subtrees:\n")
+            for item in halving["eliminated"]:
+                benchmark_file.write(
+                    f"- round {item['round']}: engine={item['engine']} | workers={item['workers']} "
+                    f"| sample_time={item['sample_elapsed']:.3f}s over {item['sample_subtrees']} subtrees\n"
+                )
 
     fastest = results[0] if results else None
     payload = {
@@ -237,21 +4154,27 @@ def benchmark_multithread(root_dir=None, iterations=1, throttle_ms=0):
         "root": root_dir,
         "iterations": iterations,
         "throttle_ms": throttle_ms,
+        "rate_limits": rate_limits,
+        "strategy": strategy,
         "fastest": fastest,
         "results": results,
         "benchmark_path": benchmark_path,
     }
+    if halving:
+        payload["halving"] = halving
     small_result_path = write_small_results_file(output_folder, payload, "benchmark")
+    if fastest:
+        update_device_profile(output_folder, root_dir, fastest)
 
     print("\nBenchmark ranking (fastest first):")
     for index, item in enumerate(results, start=1):
         print(
-            f"{index}. workers={item['workers']} | avg={item['elapsed']:.2f}s | "
+            f"{index}. engine={item['engine']} | workers={item['workers']} | avg={item['elapsed']:.2f}s | "
             f"files/s={item['throughput_files_per_sec']}"
         )
     if fastest:
         print(
-            f"Best profile => workers={fastest['workers']} avg={fastest['elapsed']:.2f}s "
+            f"Best profile => engine={fastest['engine']} workers={fastest['workers']} avg={fastest['elapsed']:.2f}s "
             f"files/s={fastest['throughput_files_per_sec']}"
         )
 
@@ -260,9 +4183,27 @@ def benchmark_multithread(root_dir=None, iterations=1, throttle_ms=0):
     return results, benchmark_path, small_result_path
 
 
-def run_automation_campaign(root_dir, runs, interval_seconds, mode="multithread", iterations=1, throttle_ms=0):
+def run_automation_campaign(
+    root_dir,
+    runs,
+    interval_seconds,
+    mode="multithread",
+    iterations=1,
+    throttle_ms=0,
+    incremental=False,
+    index_path=None,
+    rules=None,
+    engine="multithread",
+    engine_options=None,
+    rate_limits=None,
+    benchmark_strategy="full",
+    report_format="text",
+    diff=False,
+    search_index_path=None,
+):
     output_folder = ensure_output_folder()
     automation_log = []
+    index_path = resolve_index_path(output_folder, index_path) if incremental else None
 
     print(
         f"\nAutomation start => mode={mode}, runs={runs}, interval={interval_seconds}s, "
@@ -278,6 +4219,9 @@ def run_automation_campaign(root_dir, runs, interval_seconds, mode="multithread"
                 root_dir=root_dir,
                 iterations=iterations,
                 throttle_ms=throttle_ms,
+                rules=rules,
+                rate_limits=rate_limits,
+                strategy=benchmark_strategy,
             )
             best_workers = results[0]["workers"] if results else None
             elapsed = results[0]["elapsed"] if results else None
@@ -297,20 +4241,39 @@ def run_automation_campaign(root_dir, runs, interval_seconds, mode="multithread"
                 root_dir=root_dir,
                 thread_count=None,
                 throttle_ms=throttle_ms,
+                index_path=index_path,
+                rules=rules,
+                engine=engine,
+                engine_options=engine_options,
+                rate_limits=rate_limits,
+                report_format=report_format,
+                diff=diff,
+                search_index_path=search_index_path,
             )
-            automation_log.append(
-                {
-                    "run": run_number,
-                    "mode": mode,
-                    "started": started,
-                    "workers": stats["workers"],
-                    "elapsed": stats["elapsed"],
-                    "files": stats["files"],
-                    "folders": stats["folders"],
-                    "report_path": report_path,
-                    "summary_path": summary_path,
-                }
-            )
+            entry = {
+                "run": run_number,
+                "mode": mode,
+                "started": started,
+                "workers": stats["workers"],
+                "elapsed": stats["elapsed"],
+                "files": stats["files"],
+                "folders": stats["folders"],
+                "report_path": report_path,
+                "summary_path": summary_path,
+            }
+            if "index_hit_ratio" in stats:
+                # Engines without scan index support run a full scan and report no hit ratio.
+                entry["index_hit_ratio"] = stats["index_hit_ratio"]
+            if "pruned" in stats:
+                entry["pruned"] = stats["pruned"]
+            if "rate_limit" in stats:
+                entry["rate_limit"] = stats["rate_limit"]
+            if "diff" in stats:
+                entry["diff"] = stats["diff"]
+                entry["diff_path"] = stats["diff_path"]
+            if "diff_skipped" in stats:
+                entry["diff_skipped"] = stats["diff_skipped"]
+            automation_log.append(entry)
 
         if run_number < runs:
             time.sleep(interval_seconds)
@@ -321,127 +4284,814 @@ def run_automation_campaign(root_dir, runs, interval_seconds, mode="multithread"
         "runs": runs,
         "interval_seconds": interval_seconds,
         "throttle_ms": throttle_ms,
+        "rate_limits": rate_limits,
         "history": automation_log,
     }
+    if index_path:
+        hit_ratios = [item["index_hit_ratio"] for item in automation_log if "index_hit_ratio" in item]
+        payload["index_path"] = index_path
+        payload["index_hit_ratio"] = round(sum(hit_ratios) / len(hit_ratios), 4) if hit_ratios else 0.0
+    if diff:
+        payload["total_changes"] = sum(item["diff"]["total_changes"] for item in automation_log if "diff" in item)
     summary_path = write_small_results_file(output_folder, payload, "automation")
     print(f"\nAutomation complete. Summary written to: {summary_path}")
 
 
-def bfs_traverse_directory(root_dir):
+def rotate_artifacts(output_folder, keep=0, max_age_seconds=0):
+    """Deletes timestamped artifacts beyond the newest `keep` per kind or older than `max_age_seconds`."""
+    series = {}
+    for entry in os.scandir(output_folder):
+        match = ARTIFACT_TIMESTAMP.search(entry.name)
+        if match and entry.is_file(follow_symlinks=False):
+            kind = entry.name[: match.start()] + entry.name[match.end() :]
+            series.setdefault(kind, []).append((match.group(), entry.stat().st_mtime, entry.path))
+    cutoff = time.time() - max_age_seconds if max_age_seconds > 0 else None
+    removed = 0
+    for artifacts in series.values():
+        artifacts.sort(reverse=True)
+        for position, (_, mtime, path) in enumerate(artifacts):
+            if (keep > 0 and position >= keep) or (cutoff is not None and mtime < cutoff):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as error:
+                    print(f"Could not rotate '{path}': {error}")
+    return removed
+
+
+def run_daemon(
+    root_dir,
+    interval_seconds,
+    max_runs=0,
+    overlap="skip",
+    thread_count=None,
+    keep_artifacts=0,
+    max_artifact_age_seconds=0,
+    benchmark_first=False,
+    iterations=1,
+    benchmark_strategy="halving",
+    engine="multithread",
+    engine_options=None,
+    **report_options,
+):
+    """Long-lived scan loop with fixed-rate starts, overlap protection, one warm pool and artifact rotation."""
     output_folder = ensure_output_folder()
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    file_path = os.path.join(output_folder, f"directorynator_bfs_{timestamp}.txt")
+    if benchmark_first:
+        results, _, _ = benchmark_multithread(
+            root_dir=root_dir,
+            iterations=iterations,
+            throttle_ms=report_options.get("throttle_ms", 0),
+            rules=report_options.get("rules"),
+            rate_limits=report_options.get("rate_limits"),
+            strategy=benchmark_strategy,
+        )
+        thread_count = results[0]["workers"] if results else thread_count
+    workers = detect_recommended_threads(thread_count)
+    engine_options = dict(engine_options or {})
+    stop = threading.Event()
+    previous_handler = signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    log_path = os.path.join(output_folder, DAEMON_LOG_FILENAME)
+    counters = {
+        "runs": 0,
+        "failed_runs": 0,
+        "skipped_slots": 0,
+        "queued_runs": 0,
+        "artifacts_removed": 0,
+        "rotation_errors": 0,
+        "log_write_errors": 0,
+    }
+    log_file = None
 
-    folder_files_map = {}
-    queue = deque([root_dir])
-    folder_count, file_count = 0, 0
-    start_time = time.time()
+    def append_log(entry):
+        nonlocal log_file
+        try:
+            if log_file is None or not os.path.exists(log_path):
+                # First entry, or the log (or its folder) was removed underneath the daemon.
+                if log_file is not None:
+                    log_file.close()
+                log_file = None
+                ensure_output_folder()
+                log_file = open(log_path, "a", encoding="utf-8")
+            log_file.write(json.dumps(entry) + "\n")
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        except OSError as error:
+            counters["log_write_errors"] += 1
+            print(f"[Daemon] Could not append to '{log_path}': {error}")
+
+    pool = None
+    if engine == "multithread":
+        pool = ThreadPoolExecutor(max_workers=ADAPTIVE_MAX_WORKERS if engine_options.get("adaptive") else workers)
+        engine_options["executor"] = pool
 
+    print(
+        f"\nDaemon start => root={root_dir}, interval={interval_seconds}s, overlap={overlap}, workers={workers}, "
+        f"max_runs={max_runs or 'unlimited'} (pid {os.getpid()})"
+    )
+    origin = time.monotonic()
+    slot = 0
     try:
-        while queue:
-            current_path = queue.popleft()
+        while not stop.is_set() and (not max_runs or counters["runs"] < max_runs):
+            delay = origin + slot * interval_seconds - time.monotonic()
+            if delay > 0 and stop.wait(delay):
+                break
+            started = time.monotonic()
+            entry = {
+                "run": counters["runs"] + 1,
+                "slot": slot,
+                "started": datetime.datetime.now().isoformat(),
+                "start_lag_seconds": round(started - (origin + slot * interval_seconds), 3),
+            }
             try:
-                folder_files_map[current_path] = []
-                for entry in os.scandir(current_path):
-                    if entry.is_dir(follow_symlinks=False):
-                        queue.append(entry.path)
-                        folder_files_map[entry.path] = []
-                        folder_count += 1
-                    elif entry.is_file(follow_symlinks=False):
-                        folder_files_map[current_path].append(entry.path)
-                        file_count += 1
-            except PermissionError:
-                pass
+                stats, report_path, summary_path = generate_directory_report_multithread(
+                    thread_count=workers,
+                    root_dir=root_dir,
+                    engine=engine,
+                    engine_options=engine_options,
+                    **report_options,
+                )
+                entry.update(
+                    {
+                        "elapsed": stats["elapsed"],
+                        "folders": stats["folders"],
+                        "files": stats["files"],
+                        "report_path": report_path,
+                        "summary_path": summary_path,
+                    }
+                )
+                if "diff" in stats:
+                    entry["diff"] = stats["diff"]
+            except Exception as error:
+                counters["failed_runs"] += 1
+                entry["error"] = str(error)
+                print(f"[Daemon] Run {entry['run']} failed: {error}")
+            counters["runs"] += 1
+            if keep_artifacts or max_artifact_age_seconds:
+                try:
+                    entry["artifacts_removed"] = rotate_artifacts(
+                        output_folder, keep_artifacts, max_artifact_age_seconds
+                    )
+                    counters["artifacts_removed"] += entry["artifacts_removed"]
+                except OSError as error:
+                    counters["rotation_errors"] += 1
+                    entry["rotation_error"] = str(error)
+                    print(f"[Daemon] Artifact rotation failed: {error}")
+            append_log(entry)
 
-        elapsed_time = time.time() - start_time
-        write_report(file_path, folder_files_map)
-        print(f"\nSummary:\nTotal number of folders: {folder_count}")
-        print(f"Total number of files: {file_count}")
-        print(f"Time taken: {elapsed_time:.2f} seconds")
-        print(f"BFS directory report saved to: {file_path} successfully!")
-    except Exception as error:
-        print(f"Error creating BFS report: {error}")
+            slot += 1
+            overdue = time.monotonic() - (origin + slot * interval_seconds)
+            if overdue > 0:
+                missed = math.floor(overdue / interval_seconds) + 1
+                if overlap == "queue":
+                    # Missed slots collapse into one catch-up run that starts right away.
+                    counters["queued_runs"] += 1
+                    missed -= 1
+                counters["skipped_slots"] += missed
+                slot += missed
+    except KeyboardInterrupt:
+        print("\nDaemon interrupted.")
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        if pool is not None:
+            pool.shutdown()
+        if log_file is not None:
+            log_file.close()
+
+    payload = {
+        "mode": "daemon",
+        "root": root_dir,
+        "interval_seconds": interval_seconds,
+        "overlap": overlap,
+        "workers": workers,
+        "log_path": log_path,
+        **counters,
+    }
+    summary_path = write_small_results_file(output_folder, payload, "daemon")
+    print(f"\nDaemon stopped after {counters['runs']} runs. Summary written to: {summary_path}")
+    return payload
 
 
-def dfs_traverse_directory(root_dir):
+class InotifyWatcher:
+    """Thin ctypes wrapper over Linux inotify: add/remove directory watches and read decoded events."""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add(self, path):
+        """Returns the watch descriptor, or raises OSError (ENOSPC when max_user_watches is exhausted)."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), INOTIFY_DIR_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove(self, wd):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout):
+        """Yields (wd, mask, name) for every queued event, waiting up to `timeout` seconds for the first."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, INOTIFY_READ_BYTES)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            yield wd, mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LiveTree:
+    """In-memory inventory of root_dir kept current from inotify events instead of periodic rescans."""
+
+    def __init__(self, root_dir, thread_count, rules=None):
+        self.root_dir = root_dir
+        self.thread_count = thread_count
+        self.rules = rules
+        self.watcher = InotifyWatcher()
+        self.tree = {}
+        self.watches = {}
+        self.watched = {}
+        self.unwatched = 0
+        self.recent_events = {}
+        self.pending_walks = deque()
+        self.root_lost = False
+        self.counters = {
+            "events": 0,
+            "overflows": 0,
+            "overflow_checked_dirs": 0,
+            "relisted_dirs": 0,
+            "subtrees_added": 0,
+            "subtrees_removed": 0,
+            "walked_dirs": 0,
+        }
+
+    def seed(self):
+        stats = {}
+        walk_started = time.time_ns() - WATCH_MTIME_SLACK_NS
+        for folder, subfolders, files in iter_multithread_scan_records(
+            self.root_dir, self.thread_count, stats=stats, rules=self.rules
+        ):
+            self.watch(folder)
+            self.tree[folder] = [
+                {os.path.basename(sub) for sub in subfolders},
+                {os.path.basename(name) for name in files},
+                None,
+            ]
+        # Listings ran before their watches existed; anything modified since the scan began is relisted.
+        for folder in list(self.tree):
+            mtime_ns = self.mtime(folder)
+            if folder in self.tree and mtime_ns is not None:
+                if mtime_ns >= walk_started:
+                    self.relist(folder)
+                else:
+                    self.tree[folder][2] = mtime_ns
+        return stats
+
+    def watch(self, folder):
+        try:
+            wd = self.watcher.add(folder)
+            self.watches[wd] = folder
+            self.watched[folder] = wd
+        except OSError as error:
+            self.unwatched += 1
+            if self.unwatched == 1:
+                print(
+                    f"Cannot watch '{folder}' ({error.strerror}); "
+                    "raise fs.inotify.max_user_watches if this is ENOSPC."
+                )
+
+    def add_subtree(self, path):
+        """Queues a created or moved-in directory for walk_pending()."""
+        self.pending_walks.append(path)
+        self.counters["subtrees_added"] += 1
+
+    def walk_pending(self, budget=WATCH_WALK_BATCH):
+        """Watches, then lists, up to `budget` queued directories; returns how many were walked."""
+        walked = 0
+        while self.pending_walks and walked < budget:
+            folder = self.pending_walks.popleft()
+            parent = self.tree.get(os.path.dirname(folder))
+            # Deleted or moved away (or already walked) while it waited in the queue.
+            if folder in self.tree or parent is None or os.path.basename(folder) not in parent[0]:
+                continue
+            self.watch(folder)
+            mtime_ns = self.mtime(folder)
+            result_folders, result_files, _, _ = traverse_directory(folder, self.rules)
+            self.tree[folder] = [
+                {os.path.basename(sub) for sub in result_folders},
+                {os.path.basename(name) for name in result_files},
+                mtime_ns,
+            ]
+            self.pending_walks.extend(result_folders)
+            walked += 1
+        self.counters["walked_dirs"] += walked
+        return walked
+
+    def drop_subtree(self, path):
+        stack = [path]
+        while stack:
+            folder = stack.pop()
+            node = self.tree.pop(folder, None)
+            if node is not None:
+                stack.extend(os.path.join(folder, name) for name in node[0])
+            wd = self.watched.pop(folder, None)
+            if wd is not None:
+                # A moved-away directory keeps its watch; drop it so events stop arriving under a stale path.
+                self.watcher.remove(wd)
+        self.counters["subtrees_removed"] += 1
+
+    def mtime(self, folder):
+        try:
+            return os.stat(folder, follow_symlinks=False).st_mtime_ns
+        except OSError:
+            return None
+
+    def relist(self, folder):
+        """Lists `folder` again, adding and dropping subtrees for subfolders that appeared or vanished."""
+        node = self.tree.get(folder)
+        if node is None:
+            return
+        self.counters["relisted_dirs"] += 1
+        node[2] = self.mtime(folder)
+        result_folders, result_files, _, _ = traverse_directory(folder, self.rules)
+        current = {os.path.basename(sub) for sub in result_folders}
+        for name in node[0] - current:
+            self.drop_subtree(os.path.join(folder, name))
+        for name in current - node[0]:
+            self.add_subtree(os.path.join(folder, name))
+        node[0] = current
+        node[1] = {os.path.basename(name) for name in result_files}
+
+    def subtree_folders(self, roots):
+        seen, stack = set(), list(roots)
+        while stack:
+            folder = stack.pop()
+            node = self.tree.get(folder)
+            if node is None or folder in seen:
+                continue
+            seen.add(folder)
+            stack.extend(os.path.join(folder, name) for name in node[0])
+        return seen
+
+    def reconcile(self, roots=None):
+        """Relists the directories under `roots` (default: the whole tree) whose mtime moved since last listed."""
+        folders = self.subtree_folders(roots) if roots is not None else list(self.tree)
+        self.counters["overflow_checked_dirs"] += len(folders)
+        changed = [folder for folder in folders if folder in self.tree and self.mtime(folder) != self.tree[folder][2]]
+        for folder in changed:
+            self.relist(folder)
+
+    def recover_overflow(self):
+        """Re-stats the subtrees active just before a queue overflow, or the whole tree without recent activity."""
+        cutoff = time.monotonic() - WATCH_HOT_WINDOW_SECONDS
+        hot = [folder for folder, seen_at in self.recent_events.items() if seen_at >= cutoff and folder in self.tree]
+        self.recent_events.clear()
+        self.reconcile(hot or None)
+
+    def apply(self, wd, mask, name):
+        self.counters["events"] += 1
+        if mask & IN_Q_OVERFLOW:
+            self.counters["overflows"] += 1
+            self.recover_overflow()
+            return
+        root_gone = mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED)
+        if root_gone and not self.root_lost and self.watches.get(wd) == self.root_dir:
+            # Every path in the tree hangs off the root, so none of them is valid any more.
+            self.root_lost = True
+            self.pending_walks.clear()
+            self.drop_subtree(self.root_dir)
+            return
+        if mask & IN_IGNORED:
+            folder = self.watches.pop(wd, None)
+            if self.watched.get(folder) == wd:
+                del self.watched[folder]
+            return
+        folder = self.watches.get(wd)
+        node = self.tree.get(folder)
+        if node is None or not name:
+            return
+        self.recent_events[folder] = time.monotonic()
+        path = os.path.join(folder, name)
+        is_dir = bool(mask & IN_ISDIR)
+        if self.rules is not None and self.rules.prune(folder, name, is_dir, path):
+            return
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            if is_dir and name not in node[0]:
+                node[0].add(name)
+                self.add_subtree(path)
+            elif not is_dir and not os.path.islink(path) and os.path.isfile(path):
+                node[1].add(name)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            if is_dir:
+                node[0].discard(name)
+                self.drop_subtree(path)
+            else:
+                node[1].discard(name)
+
+    def write_snapshot(self, output_folder):
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        report_path = os.path.join(output_folder, f"directorynator_watch_{timestamp}.txt")
+        write_report_stream(
+            report_path,
+            (
+                (folder, [os.path.join(folder, name) for name in sorted(node[1])])
+                for folder, node in list(self.tree.items())
+            ),
+        )
+        return report_path
+
+    def close(self):
+        self.watcher.close()
+
+
+def run_watch_mode(root_dir, thread_count=None, rules=None, watch_seconds=0, snapshot_interval=0):
+    """Seeds a LiveTree, then applies inotify events until watch_seconds pass, the root goes or Ctrl-C."""
     output_folder = ensure_output_folder()
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    file_path = os.path.join(output_folder, f"directorynator_dfs_{timestamp}.txt")
+    workers = detect_recommended_threads(thread_count)
+    live = LiveTree(root_dir, workers, rules)
+    snapshot_requested = threading.Event()
+    previous_handler = signal.signal(signal.SIGUSR1, lambda *_: snapshot_requested.set())
+    started = time.monotonic()
+    seed_stats = {"elapsed": 0.0}
+    snapshots = []
+    try:
+        seed_stats = live.seed()
+        print(
+            f"Watching {root_dir}: {len(live.tree)} directories seeded in {seed_stats['elapsed']:.2f}s, "
+            f"{len(live.watches)} watches ({live.unwatched} unwatched). "
+            f"Send SIGUSR1 (pid {os.getpid()}) for a snapshot."
+        )
+        next_snapshot = time.monotonic() + snapshot_interval if snapshot_interval > 0 else None
+        while not watch_seconds or time.monotonic() - started < watch_seconds:
+            # Queued walks continue between event reads; only an idle tree blocks waiting for events.
+            for wd, mask, name in live.watcher.read(timeout=0 if live.pending_walks else 0.5):
+                live.apply(wd, mask, name)
+            live.walk_pending()
+            if live.root_lost:
+                print(f"Watch root {root_dir} was deleted, moved or unmounted; stopping.")
+                break
+            if next_snapshot is not None and time.monotonic() >= next_snapshot:
+                snapshot_requested.set()
+                next_snapshot += snapshot_interval
+            if snapshot_requested.is_set():
+                snapshot_requested.clear()
+                snapshots.append(live.write_snapshot(output_folder))
+                print(f"Snapshot report saved to: {snapshots[-1]}")
+    except KeyboardInterrupt:
+        print("\nWatch stopped.")
+    finally:
+        signal.signal(signal.SIGUSR1, previous_handler)
+        live.close()
+    snapshots.append(live.write_snapshot(output_folder))
+    payload = {
+        "mode": "watch",
+        "root": root_dir,
+        "workers": workers,
+        "seed_elapsed": round(seed_stats["elapsed"], 3),
+        "watched_seconds": round(time.monotonic() - started, 3),
+        "folders": max(0, len(live.tree) - 1),
+        "files": sum(len(node[1]) for node in live.tree.values()),
+        "watches": len(live.watches),
+        "unwatched_dirs": live.unwatched,
+        "root_lost": live.root_lost,
+        "pending_walks": len(live.pending_walks),
+        **live.counters,
+        "snapshots": snapshots,
+    }
+    summary_path = write_small_results_file(output_folder, payload, "watch")
+    print(f"Snapshot report saved to: {snapshots[-1]}")
+    print(f"Small results file saved to: {summary_path}")
+    return payload
 
-    folder_files_map = {}
-    stack = [root_dir]
+
+def bfs_scan(root_dir):
+    """Breadth-first traversal into a CompactTree; returns (tree, stats)."""
+    tree = CompactTree(root_dir)
+    queue_dirs = deque([(root_dir, 0)])
     folder_count, file_count = 0, 0
     start_time = time.time()
 
-    try:
-        while stack:
-            current_path = stack.pop()
-            try:
-                folder_files_map[current_path] = []
-                for entry in os.scandir(current_path):
-                    if entry.is_dir(follow_symlinks=False):
-                        stack.append(entry.path)
-                        folder_files_map[entry.path] = []
-                        folder_count += 1
-                    elif entry.is_file(follow_symlinks=False):
-                        folder_files_map[current_path].append(entry.path)
-                        file_count += 1
-            except PermissionError:
-                pass
+    while queue_dirs:
+        current_path, dir_id = queue_dirs.popleft()
+        file_names = []
+        try:
+            for entry in os.scandir(current_path):
+                if entry.is_dir(follow_symlinks=False):
+                    queue_dirs.append((entry.path, tree.add_dir(dir_id, entry.name)))
+                    folder_count += 1
+                elif entry.is_file(follow_symlinks=False):
+                    file_names.append(entry.name)
+                    file_count += 1
+        except PermissionError:
+            pass
+        tree.set_files(dir_id, file_names)
 
-        elapsed_time = time.time() - start_time
-        write_report(file_path, folder_files_map)
-        print(f"\nSummary:\nTotal number of folders: {folder_count}")
-        print(f"Total number of files: {file_count}")
-        print(f"Time taken: {elapsed_time:.2f} seconds")
-        print(f"DFS directory report saved to: {file_path} successfully!")
-    except Exception as error:
-        print(f"Error creating DFS report: {error}")
+    tree.release_intern_cache()
+    stats = {"root": root_dir, "folders": folder_count, "files": file_count, "elapsed": time.time() - start_time}
+    return tree, stats
 
 
-def trie_traverse_directory(root_dir):
-    output_folder = ensure_output_folder()
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    file_path = os.path.join(output_folder, f"directorynator_trie_{timestamp}.txt")
+def dfs_scan(root_dir):
+    """Depth-first traversal into a CompactTree; returns (tree, stats)."""
+    tree = CompactTree(root_dir)
+    stack = [(root_dir, 0)]
+    folder_count, file_count = 0, 0
+    start_time = time.time()
 
-    folder_files_map = {}
+    while stack:
+        current_path, dir_id = stack.pop()
+        file_names = []
+        try:
+            for entry in os.scandir(current_path):
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, tree.add_dir(dir_id, entry.name)))
+                    folder_count += 1
+                elif entry.is_file(follow_symlinks=False):
+                    file_names.append(entry.name)
+                    file_count += 1
+        except PermissionError:
+            pass
+        tree.set_files(dir_id, file_names)
+
+    tree.release_intern_cache()
+    stats = {"root": root_dir, "folders": folder_count, "files": file_count, "elapsed": time.time() - start_time}
+    return tree, stats
+
+
+def trie_scan(root_dir):
+    """Builds a name-component trie of the tree, then flattens it into a CompactTree; returns (tree, stats)."""
     trie = {}
     stack = [(root_dir, trie)]
     folder_count, file_count = 0, 0
     start_time = time.time()
 
-    try:
-        while stack:
-            current_path, current_trie = stack.pop()
-            try:
-                current_trie["folders"] = {}
-                current_trie["files"] = []
-                for entry in os.scandir(current_path):
-                    if entry.is_dir(follow_symlinks=False):
-                        folder_name = os.path.basename(entry.path)
-                        current_trie["folders"][folder_name] = {}
-                        stack.append((entry.path, current_trie["folders"][folder_name]))
-                        folder_count += 1
-                    elif entry.is_file(follow_symlinks=False):
-                        current_trie["files"].append(entry.path)
-                        file_count += 1
-            except PermissionError:
-                pass
+    while stack:
+        current_path, current_trie = stack.pop()
+        current_trie["folders"] = {}
+        current_trie["files"] = []
+        try:
+            for entry in os.scandir(current_path):
+                if entry.is_dir(follow_symlinks=False):
+                    current_trie["folders"][entry.name] = {}
+                    stack.append((entry.path, current_trie["folders"][entry.name]))
+                    folder_count += 1
+                elif entry.is_file(follow_symlinks=False):
+                    current_trie["files"].append(entry.name)
+                    file_count += 1
+        except PermissionError:
+            pass
+
+    tree = CompactTree(root_dir)
+    pending = [(trie, 0)]
+    while pending:
+        current_trie, dir_id = pending.pop()
+        tree.set_files(dir_id, current_trie["files"])
+        for folder_name, subtrie in current_trie["folders"].items():
+            pending.append((subtrie, tree.add_dir(dir_id, folder_name)))
+    tree.release_intern_cache()
+
+    stats = {"root": root_dir, "folders": folder_count, "files": file_count, "elapsed": time.time() - start_time}
+    return tree, stats
+
+
+def generate_algorithm_report(label, title, scan_function, root_dir):
+    output_folder = ensure_output_folder()
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    file_path = os.path.join(output_folder, f"directorynator_{label}_{timestamp}.txt")
 
-        def flatten_trie(current_trie, path):
-            folder_files_map[path] = current_trie["files"]
-            for folder, subtrie in current_trie["folders"].items():
-                flatten_trie(subtrie, os.path.join(path, folder))
-
-        flatten_trie(trie, root_dir)
-        elapsed_time = time.time() - start_time
-        write_report(file_path, folder_files_map)
-        print(f"\nSummary:\nTotal number of folders: {folder_count}")
-        print(f"Total number of files: {file_count}")
-        print(f"Time taken: {elapsed_time:.2f} seconds")
-        print(f"Trie directory report saved to: {file_path} successfully!")
+    try:
+        tree, stats = scan_function(root_dir)
+        write_report(file_path, tree)
+        print(f"\nSummary:\nTotal number of folders: {stats['folders']}")
+        print(f"Total number of files: {stats['files']}")
+        print(f"Time taken: {stats['elapsed']:.2f} seconds")
+        print(f"{title} directory report saved to: {file_path} successfully!")
     except Exception as error:
-        print(f"Error creating Trie report: {error}")
+        print(f"Error creating {title} report: {error}")
+
+
+def bfs_traverse_directory(root_dir):
+    generate_algorithm_report("bfs", "BFS", bfs_scan, root_dir)
+
+
+def dfs_traverse_directory(root_dir):
+    generate_algorithm_report("dfs", "DFS", dfs_scan, root_dir)
+
+
+def trie_traverse_directory(root_dir):
+    generate_algorithm_report("trie", "Trie", trie_scan, root_dir)
+
+
+def synthetic_name(rng, length, index, extension=""):
+    suffix = str(index)
+    stem = "".join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(max(1, length - len(suffix))))
+    return f"{stem}{suffix}{extension}"
+
+
+def generate_synthetic_tree(base_dir, root_fanout, fanout, depth, files_per_dir, name_length, seed=0, file_size=0):
+    """Creates a deterministic tree under base_dir; returns (folder_count, file_count)."""
+    rng = random.Random(seed)
+    payload = b"\0" * file_size
+    folder_count, file_count = 0, 0
+    pending = [(base_dir, 0)]
+    while pending:
+        current_dir, level = pending.pop()
+        for index in range(files_per_dir):
+            extension = SYNTHETIC_FILE_EXTENSIONS[index % len(SYNTHETIC_FILE_EXTENSIONS)]
+            with open(os.path.join(current_dir, synthetic_name(rng, name_length, index, extension)), "wb") as handle:
+                handle.write(payload)
+            file_count += 1
+        if level >= depth:
+            continue
+        for index in range(root_fanout if level == 0 else fanout):
+            child = os.path.join(current_dir, synthetic_name(rng, name_length, index))
+            os.mkdir(child)
+            folder_count += 1
+            pending.append((child, level + 1))
+    return folder_count, file_count
+
+
+def algorithm_engine(scan_function):
+    def run(root_dir, thread_count, **options):
+        return scan_function(root_dir)
+
+    return run
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure_engine(scan, root_dir, workers, warmup, trials):
+    """Warmup runs, timed trials, then one tracemalloc trial so tracing never skews the timings."""
+    if trials < 1:
+        raise ValueError(f"At least one timed trial is required, got {trials}")
+    for _ in range(warmup):
+        scan(root_dir, workers)
+
+    timings, run_stats = [], None
+    for _ in range(trials):
+        started = time.perf_counter()
+        _, run_stats = scan(root_dir, workers)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        result, _ = scan(root_dir, workers)
+        del result
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    measurement = {
+        "trials": trials,
+        "warmup": warmup,
+        "median_s": round(median, 6),
+        "p95_s": round(percentile(timings, 0.95), 6),
+        "mean_s": round(statistics.fmean(timings), 6),
+        "min_s": round(min(timings), 6),
+        "stddev_s": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+        "folders": run_stats["folders"],
+        "files": run_stats["files"],
+        "files_per_sec": round(run_stats["files"] / median, 2) if median > 0 else 0,
+        "peak_traced_bytes": peak_bytes,
+    }
+    if resource is not None:
+        # ru_maxrss is a process-wide high-water mark (KiB on Linux, bytes on macOS).
+        measurement["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return measurement
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Matches (shape, engine, workers) rows; a median slower than baseline * (1 + tolerance) is a regression."""
+    previous = {(item["shape"], item["engine"], item["workers"]): item for item in baseline.get("results", [])}
+    comparison = []
+    for item in results:
+        before = previous.get((item["shape"], item["engine"], item["workers"]))
+        if before is None or not before.get("median_s"):
+            continue
+        ratio = item["median_s"] / before["median_s"]
+        comparison.append(
+            {
+                "shape": item["shape"],
+                "engine": item["engine"],
+                "workers": item["workers"],
+                "baseline_median_s": before["median_s"],
+                "median_s": item["median_s"],
+                "ratio": round(ratio, 4),
+                "regression": ratio > 1 + tolerance,
+            }
+        )
+    return comparison
+
+
+def run_benchmark_suite(
+    shapes=None,
+    engines=None,
+    workers=None,
+    warmup=1,
+    trials=5,
+    seed=0,
+    suite_dir=None,
+    keep_tree=False,
+    baseline_path=None,
+    save_baseline_path=None,
+    tolerance=0.10,
+    custom_shape=None,
+):
+    """Runs every engine on generated trees; returns (payload, summary_path)."""
+    output_folder = ensure_output_folder()
+    shape_specs = {name: SYNTHETIC_TREE_SHAPES[name] for name in (shapes or SYNTHETIC_TREE_SHAPES)}
+    if custom_shape:
+        shape_specs = {"custom": custom_shape}
+    suite_engines = {
+        **SCAN_ENGINES,
+        "bfs": algorithm_engine(bfs_scan),
+        "dfs": algorithm_engine(dfs_scan),
+        "trie": algorithm_engine(trie_scan),
+    }
+    engine_names = engines or list(suite_engines)
+    workers = workers or detect_recommended_threads()
+    results = []
+
+    print(f"\nBenchmark suite: shapes={list(shape_specs)} engines={engine_names} workers={workers}")
+    for shape, spec in shape_specs.items():
+        tree_root = tempfile.mkdtemp(prefix=f"directorynator_suite_{shape}_", dir=suite_dir)
+        try:
+            expected_folders, expected_files = generate_synthetic_tree(tree_root, seed=seed, **spec)
+            print(f"[{shape}] generated {expected_folders} folders / {expected_files} files in {tree_root}")
+            for engine in engine_names:
+                measurement = measure_engine(suite_engines[engine], tree_root, workers, warmup, trials)
+                measurement.update({"shape": shape, "engine": engine, "workers": workers})
+                measurement["count_mismatch"] = (measurement["folders"], measurement["files"]) != (
+                    expected_folders,
+                    expected_files,
+                )
+                results.append(measurement)
+                print(
+                    f"[{shape}] {engine:<12} median={measurement['median_s']:.4f}s p95={measurement['p95_s']:.4f}s "
+                    f"sd={measurement['stddev_s']:.4f}s files/s={measurement['files_per_sec']} "
+                    f"peak={measurement['peak_traced_bytes'] / 1048576:.1f}MiB"
+                    f"{' COUNT MISMATCH' if measurement['count_mismatch'] else ''}"
+                )
+        finally:
+            if not keep_tree:
+                shutil.rmtree(tree_root, ignore_errors=True)
+
+    payload = {
+        "mode": "suite",
+        "format_version": SUITE_FORMAT_VERSION,
+        "created": datetime.datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "shapes": shape_specs,
+            "engines": engine_names,
+            "workers": workers,
+            "warmup": warmup,
+            "trials": trials,
+            "seed": seed,
+        },
+        "results": results,
+    }
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+            comparison = compare_with_baseline(results, json.load(baseline_file), tolerance)
+        payload["baseline_path"] = baseline_path
+        payload["tolerance"] = tolerance
+        payload["comparison"] = comparison
+        payload["regressions"] = [item for item in comparison if item["regression"]]
+        for item in comparison:
+            print(
+                f"[{item['shape']}] {item['engine']:<12} {item['ratio']:.2f}x baseline"
+                f"{' REGRESSION' if item['regression'] else ''}"
+            )
+
+    summary_path = write_small_results_file(output_folder, payload, "suite")
+    if save_baseline_path:
+        with open(save_baseline_path, "w", encoding="utf-8") as baseline_file:
+            json.dump(payload, baseline_file, indent=2)
+        print(f"Baseline saved to: {save_baseline_path}")
+    print(f"Suite results saved to: {summary_path}")
+    return payload, summary_path
 
 
 def get_root_path_input(default_root):
@@ -534,44 +5184,487 @@ def cli_interface():
             print("Invalid choice, please try again.")
 
 
+def parse_engine_list(raw_engines):
+    engines = [engine.strip() for engine in raw_engines.split(",") if engine.strip()]
+    unknown = [engine for engine in engines if engine not in SCAN_ENGINES]
+    if unknown:
+        raise SystemExit(f"Unknown scan engine(s): {', '.join(unknown)} (choose from {', '.join(SCAN_ENGINES)})")
+    return engines or None
+
+
+def positive_int(raw_value):
+    value = int(raw_value)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def add_scan_arguments(parser):
+    group = parser.add_argument_group("scan engine")
+    group.add_argument(
+        "--engine",
+        choices=["multithread", "workstealing", "dirfd"],
+        default="multithread",
+        help="Threaded engine for multithread mode (dispatcher futures, work-stealing workers, fd-relative opens)",
+    )
+    group.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Retune the worker count at runtime from observed dirs/sec and scandir latency (multithread engine)",
+    )
+    group.add_argument(
+        "--schedule",
+        choices=["fifo", "largest-first"],
+        default="fifo",
+        help="Directory order for the multithread engine; largest-first uses subtree sizes from earlier runs",
+    )
+    group.add_argument(
+        "--device-aware",
+        action="store_true",
+        help="Use one queue and worker pool per filesystem, sized from each device's benchmark history",
+    )
+    group.add_argument(
+        "--one-file-system", action="store_true", help="Do not descend into other filesystems (implies --device-aware)"
+    )
+    group.add_argument(
+        "--fd-budget", type=int, default=DIRFD_OPEN_BUDGET, help="Max directory fds held open by the dirfd engine"
+    )
+    group.add_argument(
+        "--throttle-ms", type=int, default=0, help="Legacy pacing: at most one directory per N ms (1000/N dirs/sec)"
+    )
+    group.add_argument("--max-dirs-per-sec", type=float, default=None, help="Token-bucket cap on directory opens")
+    group.add_argument("--max-entries-per-sec", type=float, default=None, help="Token-bucket cap on listed entries")
+    group.add_argument("--rate-burst", type=float, default=1.0, help="Seconds of budget allowed as a burst")
+    group.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse cached listings of unchanged directories from the persistent scan index",
+    )
+    group.add_argument("--index-path", default=None, help="Scan index location (default: output folder)")
+    group.add_argument(
+        "--checkpoint", action="store_true", help="Journal finished directories so an interrupted scan can resume"
+    )
+    group.add_argument("--resume", action="store_true", help="Continue from this root's last checkpoint")
+
+
+def add_rule_arguments(parser):
+    group = parser.add_argument_group("exclusion rules")
+    group.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="Gitignore-style pattern to prune (repeatable; prefix with ! to re-include)",
+    )
+    group.add_argument("--exclude-prefix", action="append", default=[], help="Absolute path subtree to skip")
+    group.add_argument("--exclude-fstype", action="append", default=[], help="Filesystem type to skip (e.g. nfs)")
+    group.add_argument("--rules-file", default=None, help="JSON or gitignore-style file with exclusion rules")
+    group.add_argument(
+        "--skip-pseudo-fs",
+        action="store_true",
+        help="Skip /proc, /sys, /dev, /run and pseudo/overlay filesystem mounts",
+    )
+
+
+def add_output_arguments(parser):
+    group = parser.add_argument_group("reports and instrumentation")
+    group.add_argument(
+        "--report-format",
+        choices=["text", "binary", "both"],
+        default="text",
+        help="Directory report format: text, indexed binary (.dnrb), or both",
+    )
+    group.add_argument(
+        "--diff",
+        action="store_true",
+        help="Keep a sorted snapshot per root and report changes since the previous run",
+    )
+    group.add_argument("--search-index", action="store_true", help="Rebuild the filename search index from this scan")
+    group.add_argument("--search-index-path", default=None, help="Search index path (default: output folder)")
+    group.add_argument(
+        "--metadata",
+        action="store_true",
+        help="Capture file size/mtime/inode/nlink, add a sizes column and recursive disk-usage rollups",
+    )
+    group.add_argument(
+        "--top-subtrees", type=int, default=LARGEST_SUBTREES_TOP, help="Largest subtrees listed by --metadata"
+    )
+    group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record scandir latency/entry histograms, queue depth, worker utilization and write timings",
+    )
+    group.add_argument(
+        "--profile-top", type=int, default=PROFILE_TOP_DIRS, help="Slowest directories kept by --profile"
+    )
+    group.add_argument(
+        "--progress-port", type=int, default=0, help="Serve live progress on 127.0.0.1:PORT (/progress, /metrics)"
+    )
+    group.add_argument("--status-file", default=None, help="Periodically rewrite live progress JSON to this file")
+    group.add_argument("--status-interval", type=float, default=2.0, help="Status file refresh period in seconds")
+
+
+def add_benchmark_arguments(parser):
+    group = parser.add_argument_group("benchmark and automation")
+    group.add_argument("--iterations", type=int, default=1, help="Iterations for benchmark mode")
+    group.add_argument(
+        "--engines",
+        default=",".join(DEFAULT_BENCHMARK_ENGINES),
+        help="Comma-separated scan engines to compare in benchmark mode",
+    )
+    group.add_argument(
+        "--benchmark-strategy",
+        choices=["full", "halving"],
+        default="full",
+        help="full: every candidate scans the whole tree; halving: successive halving on sampled subtrees",
+    )
+    group.add_argument(
+        "--sample-subtrees", type=int, default=BENCHMARK_SAMPLE_SUBTREES, help="Subtrees sampled by halving"
+    )
+    group.add_argument(
+        "--finalists", type=int, default=BENCHMARK_FINALISTS, help="Candidates confirmed on the full tree"
+    )
+    group.add_argument("--runs", type=int, default=3, help="Automation run count")
+    group.add_argument("--interval", type=int, default=60, help="Automation interval in seconds")
+    group.add_argument("--automation-mode", choices=["multithread", "benchmark"], default="multithread")
+
+
+def add_suite_arguments(parser):
+    group = parser.add_argument_group("benchmark suite")
+    group.add_argument(
+        "--suite-shapes",
+        default=",".join(SYNTHETIC_TREE_SHAPES),
+        help="Comma-separated synthetic tree shapes for suite mode",
+    )
+    group.add_argument("--suite-engines", default=None, help="Comma-separated engines for suite mode (default: all)")
+    group.add_argument("--suite-dir", default=None, help="Directory to generate synthetic trees in (default: temp)")
+    group.add_argument("--keep-tree", action="store_true", help="Keep generated synthetic trees")
+    group.add_argument("--trials", type=positive_int, default=5, help="Timed trials per engine in suite mode")
+    group.add_argument("--warmup", type=int, default=1, help="Warmup runs per engine in suite mode")
+    group.add_argument("--seed", type=int, default=0, help="Seed for synthetic tree names")
+    group.add_argument("--fanout", type=int, default=None, help="Custom shape: subfolders per directory")
+    group.add_argument("--depth", type=int, default=None, help="Custom shape: tree depth")
+    group.add_argument("--files-per-dir", type=int, default=None, help="Custom shape: files per directory")
+    group.add_argument("--name-length", type=int, default=12, help="Custom shape: name length")
+    group.add_argument("--baseline", default=None, help="Suite results JSON to compare against")
+    group.add_argument("--save-baseline", default=None, help="Write this suite run's results to a baseline file")
+    group.add_argument(
+        "--regression-tolerance", type=float, default=0.10, help="Allowed median slowdown vs baseline (0.10 = 10%%)"
+    )
+
+
+def add_service_arguments(parser):
+    group = parser.add_argument_group("daemon, watch and manifest modes")
+    group.add_argument("--manifest", default=None, help="JSON manifest of roots for --mode manifest")
+    group.add_argument("--max-runs", type=int, default=0, help="Daemon mode: stop after N runs (0: run until stopped)")
+    group.add_argument(
+        "--overlap",
+        choices=["skip", "queue"],
+        default="skip",
+        help="Daemon mode: when a run overruns its slot, skip missed slots or queue one catch-up run",
+    )
+    group.add_argument(
+        "--keep-artifacts", type=int, default=0, help="Daemon mode: keep the newest N files of each artifact kind"
+    )
+    group.add_argument(
+        "--max-artifact-age-hours", type=float, default=0, help="Daemon mode: delete artifacts older than this"
+    )
+    group.add_argument(
+        "--watch-seconds", type=float, default=0, help="Stop watch mode after this many seconds (0: until Ctrl-C)"
+    )
+    group.add_argument(
+        "--snapshot-interval",
+        type=float,
+        default=0,
+        help="Watch mode snapshot report period in seconds (0: only on SIGUSR1 and exit)",
+    )
+
+
+def add_tool_arguments(parser):
+    group = parser.add_argument_group("query, convert and duplicates modes")
+    group.add_argument("--query", default=None, help="Name pattern for query mode")
+    group.add_argument(
+        "--query-type",
+        choices=list(SearchIndex.QUERY_TYPES),
+        default="substring",
+        help="Query mode match type; all types ignore case",
+    )
+    group.add_argument("--limit", type=int, default=100, help="Maximum query results")
+    group.add_argument("--input", default=None, help="Report to convert (convert mode)")
+    group.add_argument("--output", default=None, help="Converted report path (convert mode)")
+    group.add_argument("--min-size", type=int, default=1, help="Smallest file size considered by duplicates mode")
+    group.add_argument(
+        "--io-budget-mb", type=float, default=0, help="Duplicates mode hashing read budget in MB/s (0 = unlimited)"
+    )
+    group.add_argument(
+        "--hash-cache", default=None, help="Hash cache path (default: output folder); 'none' disables it"
+    )
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="DirectoryNator filesystem mapper and benchmark tool")
-    parser.add_argument("--mode", choices=["cli", "multithread", "benchmark", "automation"], default="cli")
+    parser.add_argument(
+        "--mode",
+        choices=[
+            "cli",
+            "multithread",
+            "multiprocess",
+            "benchmark",
+            "automation",
+            "suite",
+            "duplicates",
+            "convert",
+            "query",
+            "watch",
+            "daemon",
+            "manifest",
+        ],
+        default="cli",
+    )
     parser.add_argument("--root", default=os.path.abspath(os.sep), help="Root path to scan")
     parser.add_argument("--threads", type=int, default=None, help="Worker count for multithread mode")
-    parser.add_argument("--iterations", type=int, default=1, help="Iterations for benchmark mode")
-    parser.add_argument("--runs", type=int, default=3, help="Automation run count")
-    parser.add_argument("--interval", type=int, default=60, help="Automation interval in seconds")
-    parser.add_argument("--automation-mode", choices=["multithread", "benchmark"], default="multithread")
-    parser.add_argument("--throttle-ms", type=int, default=0, help="Pause between task submissions in ms")
+    add_scan_arguments(parser)
+    add_rule_arguments(parser)
+    add_output_arguments(parser)
+    add_benchmark_arguments(parser)
+    add_suite_arguments(parser)
+    add_service_arguments(parser)
+    add_tool_arguments(parser)
     return parser.parse_args()
 
 
+def build_rate_limits(args):
+    if not (args.max_dirs_per_sec or args.max_entries_per_sec):
+        return None
+    return {
+        "dirs_per_sec": args.max_dirs_per_sec,
+        "entries_per_sec": args.max_entries_per_sec,
+        "burst_seconds": max(0.001, args.rate_burst),
+    }
+
+
+def build_engine_options(args):
+    """Returns (engine, engine_options) for the scan flags; exits with status 2 on conflicting flags."""
+    engine = args.mode if args.mode == "multiprocess" else args.engine
+    engine_options = {}
+    if engine == "dirfd":
+        engine_options["fd_budget"] = max(1, args.fd_budget)
+    if engine == "multithread" and args.adaptive:
+        engine_options["adaptive"] = True
+    if args.device_aware or args.one_file_system:
+        if engine != "multithread" or args.adaptive:
+            # The device engine runs its own per-filesystem pools; it has no fd budget, shards or adaptive controller.
+            if engine == "multiprocess":
+                conflict = "--mode multiprocess"
+            else:
+                conflict = "--adaptive" if engine == "multithread" else f"--engine {engine}"
+            print(f"--device-aware/--one-file-system cannot be combined with {conflict}")
+            raise SystemExit(2)
+        engine = "device"
+        engine_options.update(
+            {
+                "one_file_system": args.one_file_system,
+                "device_profiles": load_device_profiles(ensure_output_folder()),
+            }
+        )
+    if args.schedule == "largest-first":
+        engine_options["priority"] = True
+    if args.profile:
+        engine_options["profile"] = max(1, args.profile_top)
+    if args.metadata:
+        engine_options.update({"metadata": True, "top_subtrees": max(1, args.top_subtrees)})
+    return engine, engine_options
+
+
+def build_custom_shape(args):
+    if args.fanout is None and args.depth is None and args.files_per_dir is None:
+        return None
+    fanout = args.fanout if args.fanout is not None else 4
+    return {
+        "root_fanout": fanout,
+        "fanout": fanout,
+        "depth": args.depth if args.depth is not None else 4,
+        "files_per_dir": args.files_per_dir if args.files_per_dir is not None else 10,
+        "name_length": max(2, args.name_length),
+    }
+
+
 def main():
     args = parse_args()
+    root_dir = os.path.abspath(args.root)
+    rules = load_scan_rules(
+        root_dir,
+        patterns=args.exclude,
+        prefixes=args.exclude_prefix,
+        fstypes=args.exclude_fstype,
+        rules_file=args.rules_file,
+        skip_pseudo_fs=args.skip_pseudo_fs,
+    )
+    rate_limits = build_rate_limits(args)
+    engine, engine_options = build_engine_options(args)
+
+    progress = None
+    progress_reporting = contextlib.nullcontext()
+    if (args.progress_port or args.status_file) and args.mode in {"multithread", "multiprocess", "benchmark"}:
+        progress = ScanProgress(os.path.join(ensure_output_folder(), PROGRESS_HISTORY_FILENAME))
+        progress_reporting = ProgressReporter(progress, args.progress_port, args.status_file, args.status_interval)
+        engine_options["progress"] = progress
+
+    search_index_path = None
+    if args.search_index or args.mode == "query":
+        search_index_path = args.search_index_path or os.path.join(ensure_output_folder(), SEARCH_INDEX_FILENAME)
+
     if args.mode == "cli":
         cli_interface()
-    elif args.mode == "multithread":
-        generate_directory_report_multithread(
-            thread_count=args.threads,
-            root_dir=os.path.abspath(args.root),
-            throttle_ms=max(0, args.throttle_ms),
-        )
+    elif args.mode in {"multithread", "multiprocess"}:
+        with progress_reporting:
+            generate_directory_report_multithread(
+                thread_count=args.threads,
+                root_dir=root_dir,
+                throttle_ms=max(0, args.throttle_ms),
+                index_path=resolve_index_path(ensure_output_folder(), args.index_path) if args.incremental else None,
+                engine=engine,
+                engine_options=engine_options,
+                rules=rules,
+                rate_limits=rate_limits,
+                report_format=args.report_format,
+                diff=args.diff,
+                search_index_path=search_index_path,
+                checkpoint=args.checkpoint,
+                resume=args.resume,
+            )
     elif args.mode == "benchmark":
-        benchmark_multithread(
-            root_dir=os.path.abspath(args.root),
-            iterations=max(1, args.iterations),
-            throttle_ms=max(0, args.throttle_ms),
-        )
+        with progress_reporting:
+            benchmark_multithread(
+                root_dir=root_dir,
+                iterations=max(1, args.iterations),
+                throttle_ms=max(0, args.throttle_ms),
+                engines=parse_engine_list(args.engines),
+                rules=rules,
+                rate_limits=rate_limits,
+                strategy=args.benchmark_strategy,
+                sample_size=max(1, args.sample_subtrees),
+                finalists=max(1, args.finalists),
+                progress=progress,
+            )
     elif args.mode == "automation":
         run_automation_campaign(
-            root_dir=os.path.abspath(args.root),
+            root_dir=root_dir,
             runs=max(1, args.runs),
             interval_seconds=max(1, args.interval),
             mode=args.automation_mode,
             iterations=max(1, args.iterations),
             throttle_ms=max(0, args.throttle_ms),
+            incremental=args.incremental,
+            index_path=args.index_path,
+            rules=rules,
+            engine=engine,
+            engine_options=engine_options,
+            rate_limits=rate_limits,
+            benchmark_strategy=args.benchmark_strategy,
+            report_format=args.report_format,
+            diff=args.diff,
+            search_index_path=search_index_path,
+        )
+    elif args.mode == "manifest":
+        if not args.manifest:
+            print("--mode manifest needs --manifest FILE")
+            raise SystemExit(2)
+        try:
+            generate_manifest_report(
+                args.manifest,
+                thread_count=args.threads,
+                base_options={
+                    "patterns": args.exclude,
+                    "prefixes": args.exclude_prefix,
+                    "fstypes": args.exclude_fstype,
+                    "rules_file": args.rules_file,
+                    "skip_pseudo_fs": args.skip_pseudo_fs,
+                    "burst_seconds": max(0.001, args.rate_burst),
+                },
+            )
+        except ValueError as error:
+            print(error)
+            raise SystemExit(2)
+    elif args.mode == "daemon":
+        run_daemon(
+            root_dir,
+            interval_seconds=max(1, args.interval),
+            max_runs=max(0, args.max_runs),
+            overlap=args.overlap,
+            thread_count=args.threads,
+            keep_artifacts=max(0, args.keep_artifacts),
+            max_artifact_age_seconds=max(0.0, args.max_artifact_age_hours) * 3600,
+            benchmark_first=args.automation_mode == "benchmark",
+            iterations=max(1, args.iterations),
+            benchmark_strategy=args.benchmark_strategy,
+            engine=engine,
+            engine_options=engine_options,
+            throttle_ms=max(0, args.throttle_ms),
+            index_path=resolve_index_path(ensure_output_folder(), args.index_path) if args.incremental else None,
+            rules=rules,
+            rate_limits=rate_limits,
+            report_format=args.report_format,
+            diff=args.diff,
+            search_index_path=search_index_path,
+        )
+    elif args.mode == "watch":
+        try:
+            run_watch_mode(
+                root_dir,
+                thread_count=args.threads,
+                rules=rules,
+                watch_seconds=max(0.0, args.watch_seconds),
+                snapshot_interval=max(0.0, args.snapshot_interval),
+            )
+        except OSError as error:
+            print(f"Watch mode unavailable: {error}")
+            raise SystemExit(1)
+    elif args.mode == "query":
+        if args.query is None:
+            print("--mode query needs --query PATTERN")
+            raise SystemExit(2)
+        try:
+            run_search_query(search_index_path, args.query_type, args.query, max(1, args.limit))
+        except FileNotFoundError as error:
+            print(error)
+            raise SystemExit(1)
+    elif args.mode == "convert":
+        if not args.input:
+            print("--mode convert needs --input REPORT")
+            raise SystemExit(2)
+        output_path = convert_report(args.input, args.output)
+        print(f"Converted report saved to: {output_path}")
+    elif args.mode == "duplicates":
+        cache_path = None
+        if (args.hash_cache or "").lower() != "none":
+            cache_path = args.hash_cache or os.path.join(ensure_output_folder(), HASH_CACHE_FILENAME)
+        generate_duplicates_report(
+            root_dir=root_dir,
+            thread_count=args.threads,
+            min_size=max(0, args.min_size),
+            io_bytes_per_sec=int(args.io_budget_mb * 1_000_000) if args.io_budget_mb > 0 else None,
+            cache_path=cache_path,
+            rules=rules,
+            throttle_ms=max(0, args.throttle_ms),
+            rate_limits=rate_limits,
+        )
+    elif args.mode == "suite":
+        payload, _ = run_benchmark_suite(
+            shapes=[shape.strip() for shape in args.suite_shapes.split(",") if shape.strip()],
+            engines=[engine.strip() for engine in args.suite_engines.split(",")] if args.suite_engines else None,
+            workers=args.threads,
+            warmup=max(0, args.warmup),
+            trials=max(1, args.trials),
+            seed=args.seed,
+            suite_dir=args.suite_dir,
+            keep_tree=args.keep_tree,
+            baseline_path=args.baseline,
+            save_baseline_path=args.save_baseline,
+            tolerance=args.regression_tolerance,
+            custom_shape=build_custom_shape(args),
         )
+        if payload.get("regressions"):
+            raise SystemExit(1)
 
 
 if __name__ == "__main__":
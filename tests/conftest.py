@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A small tree: nested directories, an empty directory and files at several depths.
+SAMPLE_TREE = {
+    "alpha": {"a1.txt": "one", "a2.log": "two", "nested": {"deep.txt": "deep", "deeper": {"x.py": "x"}}},
+    "beta": {"b1.txt": "b", "node_modules": {"pkg.js": "js"}},
+    "empty": {},
+    "top.txt": "top",
+}
+
+
+def build_tree(base, spec):
+    os.makedirs(base, exist_ok=True)
+    for name, content in spec.items():
+        path = os.path.join(base, name)
+        if isinstance(content, dict):
+            build_tree(path, content)
+        else:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(content)
+    return str(base)
+
+
+def walk_listing(root_dir):
+    """{folder: sorted file paths} for every directory under root_dir, from os.walk."""
+    listing = {}
+    for folder, _, files in os.walk(root_dir):
+        listing[folder] = sorted(os.path.join(folder, name) for name in files)
+    return listing
+
+
+def records_listing(records):
+    return {folder: sorted(getattr(file, "path", file) for file in files) for folder, _, files in records}
+
+
+def run_main(monkeypatch, *argv):
+    """Runs DirectoryNator_v1.main() with the given command line."""
+    import DirectoryNator_v1
+
+    monkeypatch.setattr(sys, "argv", ["DirectoryNator_v1.py", *argv])
+    return DirectoryNator_v1.main()
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Runs each test from its own directory so reports land in tmp_path/work/directorynator."""
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    return work
+
+
+@pytest.fixture
+def sample_tree(tmp_path):
+    return build_tree(tmp_path / "tree", SAMPLE_TREE)
@@ -0,0 +1,56 @@
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing, walk_listing
+
+
+def controller(initial=8):
+    controller = dn.ConcurrencyController(initial, window_seconds=1.0)
+    controller.started = controller.window_start = 0.0
+    return controller
+
+
+def close_window(controller, now, latency, dirs=dn.ADAPTIVE_MIN_WINDOW_DIRS):
+    for _ in range(dirs):
+        controller.record(latency)
+    return controller.maybe_adjust(now=now)
+
+
+def test_window_stays_open_until_it_is_long_enough():
+    adaptive = controller()
+    # now=0.0 is a real timestamp here, not "use the clock".
+    assert close_window(adaptive, 0.0, 0.001) is False
+    assert adaptive.window_dirs == dn.ADAPTIVE_MIN_WINDOW_DIRS
+    assert close_window(adaptive, 1.0, 0.001) is True
+    assert adaptive.trajectory[0]["t"] == 1.0
+
+
+def test_throughput_drop_reverses_direction():
+    adaptive = controller()
+    close_window(adaptive, 1.0, 0.001, dirs=100)
+    assert adaptive.active == 10
+    close_window(adaptive, 2.0, 0.001, dirs=50)
+    assert adaptive.direction == -1
+    assert adaptive.active == 9
+    assert adaptive.best_workers == 8
+
+
+def test_latency_cut_rebaselines_instead_of_cutting_again():
+    adaptive = controller(16)
+    close_window(adaptive, 1.0, 0.001, dirs=100)
+    assert adaptive.active == 20
+    close_window(adaptive, 2.0, 0.010, dirs=100)
+    assert adaptive.active == 10
+    assert adaptive.best_latency is None
+    # The device is simply slower now; the same latency must not halve the workers again.
+    close_window(adaptive, 3.0, 0.010, dirs=100)
+    assert adaptive.active == 11
+    assert adaptive.best_latency == pytest.approx(0.010)
+
+
+def test_adaptive_scan_matches_tree(sample_tree):
+    stats = {}
+    records = list(dn.iter_multithread_scan_records(sample_tree, 4, stats=stats, adaptive=True))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["adaptive"] is True
+    assert stats["workers_initial"] == 4
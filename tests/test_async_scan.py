@@ -0,0 +1,90 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, records_listing, walk_listing
+
+REAL_TRAVERSE = dn.traverse_directory
+
+
+class RunningCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def traverse(self, dirpath, *args):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            if os.path.basename(dirpath).startswith("slow"):
+                time.sleep(0.3)
+            return REAL_TRAVERSE(dirpath, *args)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+async def collect(root, **options):
+    stats = {}
+    records = [record async for record in dn.iter_async_scan_records(root, stats=stats, **options)]
+    return records, stats
+
+
+def test_async_records_match_tree(sample_tree):
+    records, stats = asyncio.run(collect(sample_tree, concurrency=3))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["files"] == 7
+    assert stats["timeouts"] == 0
+
+
+def test_timed_out_listings_keep_their_slot(tmp_path, monkeypatch):
+    spec = {**{f"slow{i}": {} for i in range(4)}, **{f"fast{i}": {"f": "x"} for i in range(6)}}
+    root = build_tree(tmp_path / "tree", spec)
+    counter = RunningCounter()
+    monkeypatch.setattr(dn, "traverse_directory", counter.traverse)
+    executor = ThreadPoolExecutor(8)
+    try:
+        records, stats = asyncio.run(collect(root, executor=executor, concurrency=2, dir_timeout=0.05))
+    finally:
+        executor.shutdown(wait=True)
+    assert stats["timeouts"] == 4
+    assert len(records) == 11
+    # The executor has eight threads, but timed-out listings still count against the budget of two.
+    assert counter.peak <= 2
+
+
+def test_shared_semaphore_bounds_concurrent_scans(tmp_path, monkeypatch):
+    roots = [build_tree(tmp_path / name, {f"d{i}": {"f": "x"} for i in range(8)}) for name in ("a", "b")]
+    counter = RunningCounter()
+    monkeypatch.setattr(dn, "traverse_directory", counter.traverse)
+
+    async def both():
+        budget = asyncio.Semaphore(3)
+        return await asyncio.gather(*(dn.async_scan(root, semaphore=budget, concurrency=3) for root in roots))
+
+    results = asyncio.run(both())
+    assert [len(folder_map) for folder_map, _ in results] == [9, 9]
+    assert all(stats["concurrency"] == "shared" for _, stats in results)
+    assert counter.peak <= 3
+
+
+def test_closing_the_generator_returns_every_slot(tmp_path):
+    root = build_tree(tmp_path / "tree", {f"d{i}": {f"s{j}": {} for j in range(4)} for i in range(8)})
+
+    async def partial_scan():
+        budget = asyncio.Semaphore(2)
+        records = dn.iter_async_scan_records(root, semaphore=budget)
+        await records.__anext__()
+        await records.aclose()
+        for _ in range(50):
+            if budget._value == 2:
+                break
+            await asyncio.sleep(0.01)
+        return budget._value
+
+    assert asyncio.run(partial_scan()) == 2
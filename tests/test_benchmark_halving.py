@@ -0,0 +1,71 @@
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree
+
+
+def fake_candidate_runs(monkeypatch, speeds):
+    """Replaces real scans with elapsed = files * speed[candidate]; returns the (engine, workers, root) calls."""
+    calls = []
+
+    def run(engine, workers, scan_root, throttle_ms, rules, rate_limits, progress=None):
+        calls.append((engine, workers, scan_root))
+        files = sum(len(names) for _, _, names in dn.os.walk(scan_root))
+        return {
+            "folders": 1,
+            "files": files,
+            "elapsed": files * speeds[(engine, workers)],
+            "workers": workers,
+            "permissions_skipped": 0,
+            "other_errors": 0,
+        }
+
+    monkeypatch.setattr(dn, "run_benchmark_candidate", run)
+    return calls
+
+
+def wide_tree(tmp_path):
+    return build_tree(tmp_path / "tree", {f"d{i}": {f"f{j}.txt": "x" for j in range(i + 1)} for i in range(8)})
+
+
+def test_warm_pass_uses_the_first_candidate_engine(tmp_path, monkeypatch):
+    root = wide_tree(tmp_path)
+    candidates = [("multiprocess", 2), ("dirfd", 4)]
+    calls = fake_candidate_runs(monkeypatch, {candidate: 1.0 for candidate in candidates})
+    dn.benchmark_successive_halving(root, candidates, 1, 0, None, None, sample_size=4, finalists=2)
+    assert calls
+    assert all(engine in {"multiprocess", "dirfd"} for engine, _, _ in calls)
+    assert calls[0][:2] == ("multiprocess", 2)
+
+
+@pytest.mark.parametrize("field, finalists", [(5, 2), (6, 4), (7, 3), (9, 1), (13, 3)])
+def test_final_round_keeps_exactly_the_finalists(tmp_path, monkeypatch, field, finalists):
+    root = wide_tree(tmp_path)
+    candidates = [("multithread", workers) for workers in range(1, field + 1)]
+    speeds = {candidate: 1.0 / candidate[1] for candidate in candidates}
+    calls = fake_candidate_runs(monkeypatch, speeds)
+    results, halving = dn.benchmark_successive_halving(
+        root, candidates, 2, 0, None, None, sample_size=4, finalists=finalists
+    )
+    assert sorted(item["workers"] for item in results) == list(range(field - finalists + 1, field + 1))
+    assert len(halving["eliminated"]) == field - finalists
+    full_runs = [call for call in calls if call[2] == root]
+    assert len(full_runs) == 2 * finalists
+
+
+def test_halving_skips_rounds_when_the_field_is_small(tmp_path, monkeypatch):
+    root = wide_tree(tmp_path)
+    candidates = [("multithread", 1), ("multithread", 2)]
+    fake_candidate_runs(monkeypatch, {candidate: 1.0 for candidate in candidates})
+    results, halving = dn.benchmark_successive_halving(root, candidates, 1, 0, None, None, 4, finalists=3)
+    assert len(results) == 2
+    assert halving["eliminated"] == []
+
+
+def test_sample_subtrees_span_sizes(tmp_path):
+    root = wide_tree(tmp_path)
+    sample = dn.select_sample_subtrees(root, 3)
+    assert len(sample) == 3
+    assert len(set(sample)) == 3
+    sizes = sorted(len(dn.os.listdir(path)) for path in sample)
+    assert sizes[0] <= 2 and sizes[-1] >= 7
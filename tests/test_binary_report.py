@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import walk_listing
+
+RAW_NAME = os.fsdecode(b"caf\xe9-\xff.bin")
+
+
+def write_binary(path, blocks):
+    with dn.BinaryReportWriter(str(path)) as writer:
+        for folder, files in blocks:
+            writer.add(folder, files)
+    return str(path)
+
+
+def test_round_trip_keeps_scan_order_and_bytes(tmp_path):
+    blocks = [
+        ("/r", ["/r/a.txt", f"/r/{RAW_NAME}"]),
+        ("/r/z", ["/r/z/a.txt"]),
+        ("/r/b", []),
+        ("/r/b/c", ["/r/b/c/a.txt", "/r/b/c/d.txt"]),
+    ]
+    with dn.BinaryReportReader(write_binary(tmp_path / "r.dnb", blocks)) as reader:
+        assert list(reader.items()) == blocks
+        assert len(reader) == 4
+        assert reader.file_count == 5
+        # "a.txt" recurs in three folders but is stored once.
+        assert reader.string_count == 4 + 3
+
+
+def test_listing_and_subtree_lookups(tmp_path):
+    blocks = [("/r", ["/r/f"]), ("/r/a", ["/r/a/x"]), ("/r/a/b", []), ("/r/ab", ["/r/ab/y"]), ("/r/a-c", [])]
+    with dn.BinaryReportReader(write_binary(tmp_path / "r.dnb", blocks)) as reader:
+        assert reader.listing("/r/a") == ["/r/a/x"]
+        assert reader.listing("/r/b") is None
+        assert reader.listing("/r/a/b") == []
+        # Siblings sharing the prefix ("/r/ab", "/r/a-c") are not part of /r/a's subtree.
+        assert [folder for folder, _ in reader.iter_subtree("/r/a/")] == ["/r/a", "/r/a/b"]
+        assert list(reader.iter_subtree("/q")) == []
+        assert len(list(reader.iter_subtree("/"))) == 5
+        assert {folder for folder, _ in reader.iter_subtree("/r")} == {folder for folder, _ in blocks}
+
+
+def test_reader_rejects_other_files(tmp_path):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        dn.BinaryReportReader(str(other))
+
+
+def test_convert_text_binary_text(tmp_path, sample_tree):
+    _, report_path, _ = dn.generate_directory_report_multithread(2, sample_tree, report_format="both")
+    binary_path = os.path.splitext(report_path)[0] + dn.BINARY_REPORT_EXTENSION
+    with dn.BinaryReportReader(binary_path) as reader:
+        assert {folder: sorted(files) for folder, files in reader.items()} == walk_listing(sample_tree)
+
+    converted = dn.convert_report(report_path, str(tmp_path / "converted.dnb"))
+    back = dn.convert_report(converted, str(tmp_path / "back.txt"))
+    with open(report_path, "rb") as original, open(back, "rb") as round_tripped:
+        assert original.read() == round_tripped.read()
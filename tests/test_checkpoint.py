@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, walk_listing
+
+WIDE_TREE = {f"d{i}": {f"s{j}": {"f.txt": "x"} for j in range(3)} for i in range(6)}
+
+
+class Crash(Exception):
+    pass
+
+
+def journal_path(root):
+    return os.path.join(dn.ensure_output_folder(), f"directorynator_checkpoint_{dn.root_key(root)}.jsonl")
+
+
+def crash_after(monkeypatch, directories, torn=b'{"d":"/half'):
+    """Makes the next checkpointed scan die after journaling `directories` records, leaving a torn line."""
+    real_track = dn.CheckpointJournal.track
+
+    def track(journal, records):
+        for count, record in enumerate(real_track(journal, records), start=1):
+            yield record
+            if count == directories:
+                journal.sync()
+                with open(journal.journal_path, "ab") as journal_file:
+                    journal_file.write(torn)
+                raise Crash()
+
+    monkeypatch.setattr(dn.CheckpointJournal, "track", track)
+
+
+def report_listing(report_path):
+    return {folder: sorted(files) for folder, files in dn.iter_text_report(report_path)}
+
+
+def test_frontier_is_announced_minus_finished(tmp_path):
+    journal = dn.CheckpointJournal(str(tmp_path / "journal.jsonl"))
+    journal.open("/r")
+    list(journal.track([("/r", ["/r/a", "/r/b"], ["/r/f"]), ("/r/a", ["/r/a/c"], [])]))
+    journal.close()
+    assert journal.frontier("/r") == ["/r/b", "/r/a/c"]
+    assert [folder for folder, _, _ in journal.entries()] == ["/r", "/r/a"]
+
+
+def test_torn_tail_is_truncated_before_appending(tmp_path):
+    journal = dn.CheckpointJournal(str(tmp_path / "journal.jsonl"))
+    journal.open("/r")
+    list(journal.track([("/r", ["/r/a"], [])]))
+    journal.close()
+    with open(journal.journal_path, "ab") as journal_file:
+        journal_file.write(b'{"d":"/r/a","s":[]')
+    journal.open("/r", append=True)
+    list(journal.track([("/r/a", [], ["/r/a/x"])]))
+    journal.close()
+    assert [folder for folder, _, _ in journal.entries()] == ["/r", "/r/a"]
+    assert journal.frontier("/r") == []
+
+
+def test_truncate_scans_back_across_chunks(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_bytes(b"header\n" + b"x" * 300)
+    assert dn.CheckpointJournal(str(path)).truncate_torn_tail(chunk_size=64) == 300
+    assert path.read_bytes() == b"header\n"
+
+
+def test_resume_twice_after_crashes_matches_a_full_scan(tmp_path, monkeypatch):
+    root = build_tree(tmp_path / "tree", WIDE_TREE)
+    with monkeypatch.context() as patch:
+        crash_after(patch, 5)
+        with pytest.raises(Crash):
+            dn.generate_directory_report_multithread(2, root, checkpoint=True)
+    with monkeypatch.context() as patch:
+        crash_after(patch, 4, torn=b'{"d":"' + os.fsencode(root) + b'/d0","s":["s0"')
+        with pytest.raises(Crash):
+            dn.generate_directory_report_multithread(2, root, checkpoint=True, resume=True)
+
+    journal = dn.CheckpointJournal(journal_path(root))
+    assert len(list(journal.entries())) == 9
+    stats, report_path, _ = dn.generate_directory_report_multithread(2, root, checkpoint=True, resume=True)
+    assert stats["resumed_dirs"] == 9
+    assert stats["folders"] == 24
+    assert stats["files"] == 18
+    assert report_listing(report_path) == walk_listing(root)
+    assert not os.path.exists(journal_path(root))
@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+
+import DirectoryNator_v1 as dn
+
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["DirectoryNator_v1.py", *argv])
+    return dn.parse_args()
+
+
+def test_defaults_build_plain_multithread_options(monkeypatch):
+    args = parse(monkeypatch, "--mode", "multithread")
+
+    assert dn.build_engine_options(args) == ("multithread", {})
+    assert dn.build_rate_limits(args) is None
+    assert dn.build_custom_shape(args) is None
+
+
+def test_scan_flags_map_to_engine_options(monkeypatch):
+    args = parse(
+        monkeypatch,
+        "--mode",
+        "multithread",
+        "--adaptive",
+        "--schedule",
+        "largest-first",
+        "--profile",
+        "--profile-top",
+        "0",
+        "--metadata",
+    )
+    engine, options = dn.build_engine_options(args)
+
+    assert engine == "multithread"
+    assert options == {"adaptive": True, "priority": True, "profile": 1, "metadata": True, "top_subtrees": 20}
+
+
+def test_multiprocess_mode_and_dirfd_engine(monkeypatch):
+    assert dn.build_engine_options(parse(monkeypatch, "--mode", "multiprocess"))[0] == "multiprocess"
+    engine, options = dn.build_engine_options(parse(monkeypatch, "--engine", "dirfd", "--fd-budget", "0"))
+    assert (engine, options) == ("dirfd", {"fd_budget": 1})
+
+
+def test_device_aware_conflict_exits_2(monkeypatch):
+    with pytest.raises(SystemExit) as excinfo:
+        dn.build_engine_options(parse(monkeypatch, "--engine", "workstealing", "--one-file-system"))
+    assert excinfo.value.code == 2
+
+
+def test_rate_limits_and_custom_shape(monkeypatch):
+    args = parse(monkeypatch, "--max-dirs-per-sec", "50", "--rate-burst", "0", "--depth", "2")
+
+    assert dn.build_rate_limits(args) == {"dirs_per_sec": 50.0, "entries_per_sec": None, "burst_seconds": 0.001}
+    assert dn.build_custom_shape(args) == {
+        "root_fanout": 4,
+        "fanout": 4,
+        "depth": 2,
+        "files_per_dir": 10,
+        "name_length": 12,
+    }
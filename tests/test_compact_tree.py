@@ -0,0 +1,61 @@
+import gc
+import os
+import tracemalloc
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, walk_listing
+
+
+def tree_listing(tree):
+    return {folder: sorted(files) for folder, files in tree.items()}
+
+
+def test_compact_scan_matches_path_dict(sample_tree):
+    tree, stats = dn.multithread_scan(sample_tree, 4, compact=True)
+    folder_map, _ = dn.multithread_scan(sample_tree, 4)
+
+    assert isinstance(tree, dn.CompactTree)
+    assert tree_listing(tree) == tree_listing(folder_map) == walk_listing(sample_tree)
+    assert len(tree) == stats["folders"] + 1
+    assert tree.file_total == stats["files"]
+
+
+def test_algorithm_scans_build_the_same_tree(sample_tree):
+    for scan in (dn.bfs_scan, dn.dfs_scan, dn.trie_scan):
+        tree, _ = scan(sample_tree)
+        assert tree_listing(tree) == walk_listing(sample_tree)
+
+
+def test_recurring_names_stay_interned_past_the_lru_size(monkeypatch):
+    monkeypatch.setattr(dn, "COMPACT_TREE_NAME_LRU", 8)
+    tree = dn.CompactTree("/root")
+    shared = tree.intern("__init__.py")
+    for index in range(100):
+        tree.intern(f"unique_{index}.py")
+        assert tree.intern("__init__.py") == shared
+    assert len(tree.intern_cache) <= 8
+
+
+def test_compact_tree_retains_less_than_path_dict(tmp_path):
+    spec = {f"pkg{index}": {"__init__.py": "", "module.py": "", "sub": {"__init__.py": ""}} for index in range(150)}
+    root_dir = build_tree(tmp_path / "tree", spec)
+    retained = {}
+    for compact in (False, True):
+        gc.collect()
+        tracemalloc.start()
+        result, _ = dn.multithread_scan(root_dir, 4, compact=compact)
+        gc.collect()
+        retained[compact] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+    assert retained[True] * 3 < retained[False]
+
+
+def test_write_report_accepts_compact_tree(sample_tree, tmp_path):
+    tree, _ = dn.dfs_scan(sample_tree)
+    report_path = str(tmp_path / "report.txt")
+    dn.write_report(report_path, tree)
+
+    parsed = {folder: sorted(files) for folder, files in dn.iter_text_report(report_path)}
+    assert parsed == walk_listing(sample_tree)
+    assert os.path.getsize(report_path) > 0
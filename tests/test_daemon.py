@@ -0,0 +1,55 @@
+import json
+import os
+
+import DirectoryNator_v1 as dn
+
+
+def read_log(work_dir):
+    with open(work_dir / "directorynator" / dn.DAEMON_LOG_FILENAME, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_each_run_appends_one_log_line(sample_tree, work_dir):
+    payload = dn.run_daemon(sample_tree, 0.01, max_runs=2, thread_count=2)
+
+    entries = read_log(work_dir)
+    assert [entry["run"] for entry in entries] == [1, 2]
+    assert all(entry["folders"] == 6 and entry["files"] == 7 for entry in entries)
+    assert payload["runs"] == 2 and payload["failed_runs"] == 0 and payload["log_write_errors"] == 0
+
+
+def test_log_is_recreated_after_it_is_deleted(sample_tree, work_dir, monkeypatch):
+    generate = dn.generate_directory_report_multithread
+    calls = []
+
+    def generate_then_clear(**kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            os.remove(work_dir / "directorynator" / dn.DAEMON_LOG_FILENAME)
+        return generate(**kwargs)
+
+    monkeypatch.setattr(dn, "generate_directory_report_multithread", generate_then_clear)
+    payload = dn.run_daemon(sample_tree, 0.01, max_runs=2, thread_count=2)
+
+    assert [entry["run"] for entry in read_log(work_dir)] == [2]
+    assert payload["log_write_errors"] == 0
+
+
+def test_rotation_failure_is_counted_and_the_daemon_continues(sample_tree, work_dir, monkeypatch):
+    def failing_rotation(*args):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(dn, "rotate_artifacts", failing_rotation)
+    payload = dn.run_daemon(sample_tree, 0.01, max_runs=2, thread_count=2, keep_artifacts=1)
+
+    entries = read_log(work_dir)
+    assert payload["runs"] == 2 and payload["rotation_errors"] == 2
+    assert all("Permission denied" in entry["rotation_error"] for entry in entries)
+
+
+def test_log_write_failure_is_counted_and_the_daemon_continues(sample_tree, work_dir):
+    (work_dir / "directorynator" / dn.DAEMON_LOG_FILENAME).mkdir(parents=True)
+    payload = dn.run_daemon(sample_tree, 0.01, max_runs=2, thread_count=2)
+
+    assert payload["runs"] == 2 and payload["failed_runs"] == 0
+    assert payload["log_write_errors"] == 2
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing, run_main, walk_listing
+
+
+def test_device_records_match_tree(sample_tree):
+    stats = {}
+    records = list(dn.iter_device_scan_records(sample_tree, 4, stats=stats))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["files"] == 7
+    assert len(stats["devices"]) == 1
+
+
+def submount_under(parent):
+    parent_dev = os.stat(parent).st_dev
+    for entry in os.scandir(parent):
+        if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_dev != parent_dev:
+            return entry.path
+    return None
+
+
+@pytest.mark.parametrize("hide_mount", [False, True])
+def test_one_file_system_stops_at_device_boundaries(monkeypatch, hide_mount):
+    submount = submount_under("/dev")
+    if submount is None:
+        pytest.skip("no filesystem mounted directly under /dev")
+    if hide_mount:
+        # Boundaries come from st_dev, so a mount table that misses the mount must not matter.
+        mounts = [mount for mount in dn.read_mount_table() if mount[0] != submount]
+        monkeypatch.setattr(dn, "read_mount_table", lambda: mounts)
+    stats = {}
+    records = list(dn.iter_device_scan_records("/dev", 2, stats=stats, one_file_system=True))
+    folders = {folder for folder, _, _ in records}
+    assert submount not in folders
+    assert not any(folder.startswith(submount + os.sep) for folder in folders)
+    assert stats["mounts_skipped"] >= 1
+
+
+def test_device_aware_spans_devices_with_own_pools():
+    submount = submount_under("/dev")
+    if submount is None:
+        pytest.skip("no filesystem mounted directly under /dev")
+    stats = {}
+    records = list(dn.iter_device_scan_records("/dev", 2, stats=stats))
+    assert submount in {folder for folder, _, _ in records}
+    assert len(stats["devices"]) >= 2
+
+
+@pytest.mark.parametrize(
+    "argv, conflict",
+    [
+        (["--mode", "multiprocess"], "--mode multiprocess"),
+        (["--mode", "multithread", "--adaptive"], "--adaptive"),
+        (["--mode", "multithread", "--engine", "dirfd"], "--engine dirfd"),
+    ],
+)
+def test_device_aware_rejects_conflicting_engines(sample_tree, monkeypatch, capsys, argv, conflict):
+    with pytest.raises(SystemExit) as excinfo:
+        run_main(monkeypatch, "--root", sample_tree, "--device-aware", *argv)
+    assert excinfo.value.code == 2
+    assert conflict in capsys.readouterr().out
+    assert not os.path.exists("directorynator") or not os.listdir("directorynator")
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, records_listing, walk_listing
+
+pytestmark = pytest.mark.skipif(not dn.dirfd_supported(), reason="fd-relative opens are not supported here")
+
+
+def open_fd_count():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_dirfd_records_match_tree(sample_tree):
+    stats = {}
+    records = list(dn.iter_dirfd_scan_records(sample_tree, 4, stats=stats))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["folders"] == 6
+    assert stats["files"] == 7
+    assert stats["path_opens"] == 1
+
+
+def test_dirfd_respects_fd_budget_and_closes_everything(tmp_path):
+    spec = {f"d{i}": {f"s{j}": {"deep": {"f.txt": "x"}} for j in range(4)} for i in range(10)}
+    root = build_tree(tmp_path / "wide", spec)
+    before = open_fd_count()
+    stats = {}
+    records = list(dn.iter_dirfd_scan_records(root, 4, stats=stats, fd_budget=3))
+    assert records_listing(records) == walk_listing(root)
+    assert stats["peak_open_fds"] <= 3
+    assert stats["path_opens"] > 1
+    assert open_fd_count() == before
+
+
+def test_dirfd_abandoned_scan_closes_fds(tmp_path):
+    spec = {f"d{i}": {f"s{j}": {"deep": {}} for j in range(4)} for i in range(10)}
+    root = build_tree(tmp_path / "wide", spec)
+    before = open_fd_count()
+    records = dn.iter_dirfd_scan(root, 4)
+    next(records)
+    next(records)
+    records.close()
+    assert open_fd_count() == before
+
+
+def test_dirfd_compact_scan_matches_dict_scan(sample_tree):
+    compact, _ = dn.dirfd_scan(sample_tree, 4, compact=True)
+    assert isinstance(compact, dn.CompactTree)
+    assert {folder: sorted(files) for folder, files in compact.items()} == walk_listing(sample_tree)
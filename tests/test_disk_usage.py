@@ -0,0 +1,60 @@
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree
+
+
+def sized_tree(tmp_path):
+    root = build_tree(
+        tmp_path / "tree",
+        {"big": {"a.bin": "x" * 4000, "inner": {"b.bin": "x" * 3000}}, "small": {"c.bin": "x" * 10}, "d.bin": "x"},
+    )
+    os.link(os.path.join(root, "big", "a.bin"), os.path.join(root, "big", "a-link.bin"))
+    return root
+
+
+def test_rollup_totals_and_largest_subtrees(tmp_path):
+    root = sized_tree(tmp_path)
+    rollup = dn.DiskUsageRollup(root, top_n=3)
+    records = dn.iter_multithread_scan_records(root, 2, metadata=True)
+    folders = [folder for folder, _ in rollup.track(records)]
+    summary = rollup.summary()
+    assert len(folders) == 4
+    # The hardlink next to big/a.bin is counted once.
+    assert summary["total_bytes"] == 4000 + 3000 + 10 + 1
+    assert summary["files"] == 5
+    assert summary["hardlinks_deduplicated"] == 1
+    assert summary["incomplete_dirs"] == 0
+    assert [item["path"] for item in summary["largest_subtrees"]] == [
+        root,
+        os.path.join(root, "big"),
+        os.path.join(root, "big", "inner"),
+    ]
+    assert summary["largest_subtrees"][1]["bytes"] == 7000
+
+
+def meta(path, size):
+    return dn.FileMeta(path, size, 8, 0, hash(path), 1, 1)
+
+
+def test_rollup_folds_directories_in_any_completion_order():
+    rollup = dn.DiskUsageRollup("/r")
+    rollup.add("/r", 2, [meta("/r/top", 1)])
+    rollup.add("/r/b", 0, [meta("/r/b/f", 5)])
+    assert rollup.total is None
+    rollup.add("/r/a", 1, [])
+    rollup.add("/r/a/x", 0, [meta("/r/a/x/f", 7)])
+    assert rollup.summary()["total_bytes"] == 13
+    assert rollup.summary()["allocated_bytes"] == 3 * 8 * 512
+
+
+def test_metadata_report_lists_sizes_and_largest_subtrees(tmp_path):
+    root = sized_tree(tmp_path)
+    stats, report_path, _ = dn.generate_directory_report_multithread(
+        2, root, engine_options={"metadata": True, "top_subtrees": 2}
+    )
+    assert stats["disk_usage"]["total_bytes"] == 7011
+    with open(report_path, "r", encoding="latin-1") as report_file:
+        report = report_file.read()
+    assert f"{4000:>14}  {os.path.join(root, 'big', 'a.bin')}" in report
+    assert "Largest subtrees (top 2):" in report
@@ -0,0 +1,87 @@
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree
+
+BLOCK = dn.PARTIAL_HASH_BYTES
+LARGE = "h" * BLOCK + "m" * BLOCK + "t" * BLOCK
+
+
+def duplicate_tree(tmp_path):
+    return build_tree(
+        tmp_path / "tree",
+        {
+            "a": {"same.txt": "duplicate", "large.bin": LARGE, "solo.txt": "unique"},
+            "b": {"copy.txt": "duplicate", "large-copy.bin": LARGE},
+            # Same size, head and tail as LARGE: only the full hash can tell them apart.
+            "c": {"large-near.bin": "h" * BLOCK + "M" * BLOCK + "t" * BLOCK, "other.txt": "duplicatX", "empty": ""},
+        },
+    )
+
+
+def group_names(groups):
+    return sorted(sorted(os.path.basename(meta.path) for meta in group) for group in groups)
+
+
+def test_duplicates_are_confirmed_by_content(tmp_path):
+    root = duplicate_tree(tmp_path)
+    groups, stats = dn.find_duplicate_files(root, 2)
+    assert group_names(groups) == [["copy.txt", "same.txt"], ["large-copy.bin", "large.bin"]]
+    # Largest waste first.
+    assert groups[0][0].size == len(LARGE)
+    assert stats["wasted_bytes"] == len(LARGE) + len("duplicate")
+    assert stats["size_candidates"] == 6
+    assert stats["partial_candidates"] == 5
+    assert stats["full_hashed_bytes"] == 3 * len(LARGE)
+
+
+def test_hardlinks_and_min_size(tmp_path):
+    root = duplicate_tree(tmp_path)
+    os.link(os.path.join(root, "a", "solo.txt"), os.path.join(root, "b", "solo-link.txt"))
+    groups, stats = dn.find_duplicate_files(root, 2, min_size=100)
+    assert group_names(groups) == [["large-copy.bin", "large.bin"]]
+    _, stats = dn.find_duplicate_files(root, 2)
+    assert stats["hardlinks_skipped"] == 1
+
+
+def test_hash_cache_is_reused_until_a_file_changes(tmp_path):
+    root = duplicate_tree(tmp_path)
+    cache_path = str(tmp_path / "hashes.sqlite3")
+    _, first = dn.find_duplicate_files(root, 2, cache_path=cache_path)
+    assert first["partial_cache_hits"] == first["full_cache_hits"] == 0
+
+    _, second = dn.find_duplicate_files(root, 2, cache_path=cache_path)
+    assert second["partial_cache_hits"] == 6
+    assert second["full_cache_hits"] == 3
+    assert second["partial_hashed_bytes"] == second["full_hashed_bytes"] == 0
+
+    # Same size, new mtime: the cached digests no longer apply.
+    changed = os.path.join(root, "b", "large-copy.bin")
+    with open(changed, "w", encoding="utf-8") as handle:
+        handle.write("h" * BLOCK + "X" * BLOCK + "t" * BLOCK)
+    os.utime(changed, ns=(1, 1))
+    groups, third = dn.find_duplicate_files(root, 2, cache_path=cache_path)
+    assert group_names(groups) == [["copy.txt", "same.txt"]]
+    assert third["partial_cache_hits"] == 5
+    assert third["full_cache_hits"] == 2
+    assert third["full_hashed_bytes"] == len(LARGE)
+
+
+def test_hash_cache_lookup_checks_size_and_mtime(tmp_path):
+    meta = dn.FileMeta("/x", 10, 0, 5, 42, 1, 1)
+    with dn.HashCache(str(tmp_path / "hashes.sqlite3")) as cache:
+        cache.store([(meta, ["p", "f"])])
+        assert cache.lookup(meta) == ["p", "f"]
+        assert cache.lookup(meta._replace(size=11)) is None
+        assert cache.lookup(meta._replace(mtime_ns=6)) is None
+        assert cache.lookup(meta._replace(inode=43)) is None
+
+
+def test_duplicates_report(tmp_path):
+    root = duplicate_tree(tmp_path)
+    stats, report_path, _ = dn.generate_duplicates_report(root, 2)
+    assert stats["duplicate_groups"] == 2
+    with open(report_path, "r", encoding="latin-1") as report_file:
+        report = report_file.read()
+    assert f"1. 2 copies x {len(LARGE)} bytes" in report
+    assert os.path.join(root, "b", "copy.txt") in report
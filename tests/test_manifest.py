@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, run_main, walk_listing
+
+
+def write_manifest(path, roots, workers=2):
+    path.write_text(json.dumps({"workers": workers, "roots": roots}), encoding="utf-8")
+    return str(path)
+
+
+def test_roots_are_resolved_to_real_paths(sample_tree, tmp_path):
+    os.symlink(sample_tree, tmp_path / "link")
+    specs, workers = dn.load_manifest(write_manifest(tmp_path / "m.json", [str(tmp_path / "link")]))
+
+    assert [spec["root"] for spec in specs] == [os.path.realpath(sample_tree)]
+    assert workers == 2
+
+
+def test_same_root_listed_twice_is_rejected(sample_tree, tmp_path):
+    os.symlink(sample_tree, tmp_path / "link")
+    manifest = write_manifest(tmp_path / "m.json", [sample_tree, {"root": str(tmp_path / "link"), "weight": 2}])
+
+    with pytest.raises(ValueError, match="twice"):
+        dn.load_manifest(manifest)
+
+
+def test_cli_exits_2_on_a_duplicate_root(sample_tree, tmp_path, monkeypatch, capsys):
+    manifest = write_manifest(tmp_path / "m.json", [sample_tree, sample_tree + os.sep])
+
+    with pytest.raises(SystemExit) as excinfo:
+        run_main(monkeypatch, "--mode", "manifest", "--manifest", manifest)
+    assert excinfo.value.code == 2
+    assert "twice" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "root_dir, label",
+    [("/srv/data", "data"), ("/srv/my data!", "my_data"), ("/home/.cache", "cache"), ("/", "root")],
+)
+def test_report_label_is_a_safe_basename(root_dir, label):
+    assert dn.report_label(root_dir) == label
+
+
+def test_each_root_gets_a_named_report(tmp_path):
+    first = build_tree(tmp_path / "first root", {"a": {"a.txt": "a"}})
+    second = build_tree(tmp_path / "second", {"b.txt": "b"})
+    payload, _ = dn.generate_manifest_report(write_manifest(tmp_path / "m.json", [first, second]))
+
+    for entry, root_dir, label in zip(payload["roots"], (first, second), ("first_root", "second")):
+        name = os.path.basename(entry["report_path"])
+        assert name.startswith(f"directorynator_manifest_{label}_{dn.root_key(root_dir)}_")
+        parsed = {folder: sorted(files) for folder, files in dn.iter_text_report(entry["report_path"])}
+        assert parsed == walk_listing(root_dir)
@@ -0,0 +1,46 @@
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing, walk_listing
+
+REAL_SCAN_SHARD = dn.scan_shard
+
+
+def failing_beta_shard(shard_dirs, *args, **kwargs):
+    if os.path.basename(shard_dirs[0]) == "beta":
+        raise RuntimeError("shard failed")
+    return REAL_SCAN_SHARD(shard_dirs, *args, **kwargs)
+
+
+def crashing_beta_shard(shard_dirs, *args, **kwargs):
+    if os.path.basename(shard_dirs[0]) == "beta":
+        os._exit(1)
+    return REAL_SCAN_SHARD(shard_dirs, *args, **kwargs)
+
+
+def test_multiprocess_records_match_tree(sample_tree):
+    stats = {}
+    records = list(dn.iter_multiprocess_scan_records(sample_tree, 4, stats=stats, process_count=2))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["folders"] == 6
+    assert stats["files"] == 7
+    assert stats["failed_shards"] == 0
+    assert stats["threads_per_process"] >= dn.MULTIPROCESS_MIN_THREADS
+
+
+def test_failed_shard_is_rescanned_in_process(sample_tree, monkeypatch):
+    monkeypatch.setattr(dn, "scan_shard", failing_beta_shard)
+    stats = {}
+    records = list(dn.iter_multiprocess_scan_records(sample_tree, 4, stats=stats, process_count=2))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["failed_shards"] == 1
+    assert stats["files"] == 7
+
+
+def test_broken_pool_falls_back_to_in_process_scan(sample_tree, monkeypatch):
+    monkeypatch.setattr(dn, "scan_shard", crashing_beta_shard)
+    stats = {}
+    records = list(dn.iter_multiprocess_scan_records(sample_tree, 4, stats=stats, process_count=1))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["failed_shards"] >= 1
+    assert stats["folders"] == 6
@@ -0,0 +1,49 @@
+import json
+
+import DirectoryNator_v1 as dn
+
+
+def test_histograms_use_power_of_two_buckets():
+    profiler = dn.ScanProfiler(top_n=2)
+    profiler.record("/a", 0.000003, "w1", 5)
+    profiler.record("/b", 0.000100, "w1", 0)
+    profiler.record("/c", 0.000050, "w2", 5)
+    summary = profiler.summary()
+    assert sum(summary["scandir_latency_us"].values()) == 3
+    assert sum(summary["entries_per_dir"].values()) == 3
+    # 3 us lands in [2, 4), 100 us in [64, 128).
+    assert profiler.latency_buckets[2] == 1
+    assert profiler.latency_buckets[7] == 1
+    assert summary["scandir_latency_p50_us_max"] == 63
+    assert summary["scandir_latency_p99_us_max"] == 127
+
+
+def test_slowest_keeps_the_top_n():
+    profiler = dn.ScanProfiler(top_n=2)
+    for index, latency in enumerate([0.3, 0.1, 0.5, 0.2]):
+        profiler.record(f"/d{index}", latency, "w", 1)
+    assert [item["path"] for item in profiler.summary()["slowest_dirs"]] == ["/d2", "/d0"]
+
+
+def test_queue_depth_samples_are_rate_limited():
+    profiler = dn.ScanProfiler()
+    for pending in range(100):
+        profiler.sample_depth(pending, 1)
+    assert len(profiler.depth_samples) == 1
+
+
+def test_profiled_scan_reports_into_summary(sample_tree):
+    stats, _, summary_path = dn.generate_directory_report_multithread(2, sample_tree, engine_options={"profile": 3})
+    profile = stats["profile"]
+    assert sum(profile["scandir_latency_us"].values()) == stats["folders"] + 1
+    assert len(profile["slowest_dirs"]) == 3
+    assert 0 <= profile["worker_utilization"] <= 1
+    assert profile["report_write_seconds"] >= 0
+    with open(summary_path, "r", encoding="utf-8") as summary_file:
+        assert json.load(summary_file)["stats"]["profile"]["summary_write_seconds"] >= 0
+
+
+def test_unprofiled_scan_has_no_profile(sample_tree):
+    stats = {}
+    list(dn.iter_multithread_scan_records(sample_tree, 2, stats=stats))
+    assert "profile" not in stats
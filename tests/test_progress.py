@@ -0,0 +1,68 @@
+import json
+import re
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+import DirectoryNator_v1 as dn
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_prometheus_label_escapes_backslash_quote_and_newline():
+    assert dn.prometheus_label('C:\\data "x"\nnext') == 'C:\\\\data \\"x\\"\\nnext'
+    assert dn.prometheus_label(None) == ""
+
+
+def test_metrics_stay_one_sample_per_line_for_odd_root_names():
+    progress = dn.ScanProgress()
+    progress.begin('/srv/odd\n"name"\\', phase="scan")
+    progress.update(3, 5, 7, 0, 2, 1)
+    lines = progress.prometheus().splitlines()
+
+    sample = re.compile(r'^directorynator_\w+\{root="(?:[^"\\\n]|\\.)*",phase="scan"\} \S+$')
+    assert all(line.startswith("# TYPE ") or sample.match(line) for line in lines)
+    assert 'directorynator_files_scanned{root="/srv/odd\\n\\"name\\"\\\\",phase="scan"} 7' in lines
+
+
+def test_final_status_write_failure_does_not_raise(tmp_path, capsys):
+    status_file = str(tmp_path / "missing" / "status.json")
+    with dn.ProgressReporter(dn.ScanProgress(), status_file=status_file, interval=60):
+        pass
+
+    assert "Could not write status file" in capsys.readouterr().out
+
+
+def test_status_file_is_written_on_exit(tmp_path):
+    progress = dn.ScanProgress()
+    status_file = str(tmp_path / "status.json")
+    with dn.ProgressReporter(progress, status_file=status_file, interval=60):
+        progress.begin("/srv/data")
+        progress.update(4, 4, 9, 0, 0, 0)
+        progress.finish()
+
+    with open(status_file, encoding="utf-8") as handle:
+        status = json.load(handle)
+    assert status["dirs_scanned"] == 4 and status["files"] == 9 and status["running"] is False
+
+
+def test_http_endpoint_serves_progress_and_metrics():
+    progress = dn.ScanProgress()
+    progress.begin("/srv/data", phase="scan")
+    progress.update(2, 3, 5, 1, 1, 0)
+    port = free_port()
+    with dn.ProgressReporter(progress, port=port):
+        base = f"http://127.0.0.1:{port}"
+        with urllib.request.urlopen(f"{base}/progress") as response:
+            assert json.load(response)["files"] == 5
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert 'directorynator_errors{root="/srv/data",phase="scan"} 1' in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"{base}/nope")
+        assert excinfo.value.code == 404
@@ -0,0 +1,69 @@
+import pickle
+import time
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, records_listing, walk_listing
+
+
+def test_token_bucket_spends_burst_then_waits_for_rate():
+    bucket = dn.TokenBucket(rate=100, burst=5)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.04
+    for _ in range(5):
+        bucket.acquire()
+    # Five tokens past the burst at 100/s take about 50 ms.
+    assert time.monotonic() - started >= 0.045
+    assert bucket.consumed == 10
+    assert bucket.waited == pytest.approx(0.05, abs=0.01)
+
+
+def test_charge_never_sleeps_but_delays_later_callers():
+    bucket = dn.TokenBucket(rate=50, burst=1)
+    started = time.monotonic()
+    bucket.charge(5)
+    assert time.monotonic() - started < 0.01
+    assert bucket.available_in() == pytest.approx(0.1, abs=0.01)
+
+
+def test_token_bucket_survives_pickling():
+    bucket = pickle.loads(pickle.dumps(dn.TokenBucket(rate=10)))
+    bucket.acquire()
+    assert bucket.consumed == 1
+
+
+def test_split_divides_the_budget():
+    limiter = dn.ScanRateLimiter(dirs_per_sec=100, entries_per_sec=1000, burst_seconds=0.5)
+    part = limiter.split(4)
+    assert part.dirs_per_sec == 25
+    assert part.entries_per_sec == 250
+    assert part.burst_seconds == 0.5
+    assert dn.ScanRateLimiter(entries_per_sec=1000).split(4).dir_bucket is None
+
+
+def test_resolve_and_build_rate_limiter():
+    assert dn.resolve_rate_limiter() is None
+    legacy = dn.resolve_rate_limiter(throttle_ms=10)
+    assert legacy.dirs_per_sec == 100
+    assert legacy.entry_bucket is None
+    explicit = dn.ScanRateLimiter(dirs_per_sec=5)
+    assert dn.resolve_rate_limiter(10, explicit) is explicit
+    built = dn.build_rate_limiter(10, {"entries_per_sec": 200})
+    assert built.dirs_per_sec is None
+    assert built.entries_per_sec == 200
+
+
+@pytest.mark.parametrize("iterator", ["multithread", "workstealing", "dirfd"])
+def test_scan_respects_directory_rate(tmp_path, iterator):
+    root = build_tree(tmp_path / "tree", {f"d{i}": {"f.txt": "x"} for i in range(19)})
+    limiter = dn.ScanRateLimiter(dirs_per_sec=200, burst_seconds=0.01)
+    stats = {}
+    records = list(dn.SCAN_RECORD_ITERATORS[iterator](root, 4, stats=stats, limiter=limiter))
+    assert records_listing(records) == walk_listing(root)
+    # 20 directory opens at 200/s with a two-token burst need at least ~90 ms.
+    assert stats["elapsed"] >= 0.08
+    assert stats["rate_limit"]["observed_dirs_per_sec"] <= 200 * 1.25
+    assert stats["rate_limit"]["throttled_worker_seconds"] > 0
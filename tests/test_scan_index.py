@@ -0,0 +1,81 @@
+import os
+import shutil
+import sqlite3
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing, walk_listing
+
+
+def indexed_scan(root_dir, index_path):
+    stats = {}
+    with dn.ScanIndex(index_path) as scan_index:
+        records = list(dn.iter_multithread_scan_records(root_dir, 4, stats=stats, scan_index=scan_index))
+    return records, stats
+
+
+def indexed_paths(index_path):
+    conn = sqlite3.connect(index_path)
+    try:
+        return {os.fsdecode(row[0]) for row in conn.execute("SELECT path FROM dirs")}
+    finally:
+        conn.close()
+
+
+def test_second_run_reuses_unchanged_listings(sample_tree, tmp_path):
+    index_path = str(tmp_path / "index.sqlite3")
+    first, first_stats = indexed_scan(sample_tree, index_path)
+    second, second_stats = indexed_scan(sample_tree, index_path)
+
+    assert records_listing(first) == records_listing(second) == walk_listing(sample_tree)
+    assert first_stats["index_hits"] == 0
+    assert second_stats["index_misses"] == 0
+    assert second_stats["index_hit_ratio"] == 1.0
+
+
+def test_changed_directory_is_rescanned(sample_tree, tmp_path):
+    index_path = str(tmp_path / "index.sqlite3")
+    indexed_scan(sample_tree, index_path)
+    with open(os.path.join(sample_tree, "beta", "new.txt"), "w", encoding="utf-8") as handle:
+        handle.write("new")
+    os.utime(os.path.join(sample_tree, "beta"), ns=(1, 1))
+
+    records, stats = indexed_scan(sample_tree, index_path)
+
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["index_misses"] == 1
+
+
+def test_vanished_subtree_rows_are_pruned(sample_tree, tmp_path):
+    index_path = str(tmp_path / "index.sqlite3")
+    indexed_scan(sample_tree, index_path)
+    nested = os.path.join(sample_tree, "alpha", "nested")
+    assert os.path.join(nested, "deeper") in indexed_paths(index_path)
+
+    shutil.rmtree(nested)
+    records, _ = indexed_scan(sample_tree, index_path)
+
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert not {path for path in indexed_paths(index_path) if path.startswith(nested)}
+    assert os.path.join(sample_tree, "alpha") in indexed_paths(index_path)
+
+
+def test_commit_looks_up_previous_listings_once_per_batch(tmp_path):
+    index_path = str(tmp_path / "index.sqlite3")
+    signature = (1, 1, 1, 1)
+    with dn.ScanIndex(index_path) as scan_index:
+        for index in range(300):
+            scan_index.stage(f"/data/{index}", signature, [f"/data/{index}/sub"], [])
+        scan_index.commit()
+
+        statements = []
+        scan_index.writer.set_trace_callback(statements.append)
+        for index in range(300):
+            subfolders = [] if index % 3 == 0 else [f"/data/{index}/sub"]
+            scan_index.stage(f"/data/{index}", signature, subfolders, [])
+        scan_index.commit()
+        scan_index.writer.set_trace_callback(None)
+
+    selects = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+    deletes = [statement for statement in statements if statement.lstrip().upper().startswith("DELETE FROM DIRS")]
+    assert len(selects) == 1
+    assert len(deletes) == 100
@@ -0,0 +1,81 @@
+import json
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing
+
+ROOT = os.path.join(os.sep, "scan")
+
+
+def excluded(rules, relative_path, is_dir=False):
+    dirpath, name = os.path.split(os.path.join(ROOT, relative_path))
+    return rules.match(dirpath, name, is_dir) is not None
+
+
+def test_unanchored_patterns_match_names_anywhere():
+    rules = dn.ScanRules(ROOT, ["*.log", "node_modules"])
+    assert excluded(rules, "a.log")
+    assert excluded(rules, "deep/down/b.log")
+    assert excluded(rules, "x/node_modules", is_dir=True)
+    assert not excluded(rules, "a.txt")
+
+
+def test_anchored_patterns_match_from_the_root():
+    rules = dn.ScanRules(ROOT, ["/build", "docs/*.md"])
+    assert excluded(rules, "build", is_dir=True)
+    assert not excluded(rules, "src/build", is_dir=True)
+    assert excluded(rules, "docs/readme.md")
+    assert not excluded(rules, "docs/sub/readme.md")
+
+
+def test_trailing_slash_only_matches_directories():
+    rules = dn.ScanRules(ROOT, ["cache/"])
+    assert excluded(rules, "cache", is_dir=True)
+    assert not excluded(rules, "cache", is_dir=False)
+
+
+def test_double_star_spans_directories():
+    rules = dn.ScanRules(ROOT, ["src/**/gen"])
+    assert excluded(rules, "src/gen", is_dir=True)
+    assert excluded(rules, "src/a/b/gen", is_dir=True)
+    assert not excluded(rules, "lib/a/gen", is_dir=True)
+
+
+def test_last_matching_pattern_wins():
+    rules = dn.ScanRules(ROOT, ["*.log", "!keep.log"])
+    assert excluded(rules, "drop.log")
+    assert not excluded(rules, "keep.log")
+    rules = dn.ScanRules(ROOT, ["!keep.log", "*.log"])
+    assert excluded(rules, "keep.log")
+
+
+def test_comments_blanks_and_negation_only_rules_are_empty():
+    assert not dn.ScanRules(ROOT, ["# comment", "", "!keep.log"])
+    assert dn.load_scan_rules(ROOT, ["# comment", "  "]) is None
+
+
+def test_prefix_rules_prune_subtrees_but_never_the_root():
+    rules = dn.ScanRules(ROOT, prefixes=[os.path.join(ROOT, "proc"), ROOT])
+    assert rules.match(ROOT, "proc", True) == f"prefix:{os.path.join(ROOT, 'proc')}"
+    assert rules.match(ROOT, "home", True) is None
+    assert os.path.normpath(ROOT) not in rules.prefix_rules
+
+
+def test_scan_prunes_and_counts_by_rule(sample_tree):
+    rules = dn.load_scan_rules(sample_tree, ["node_modules/", "*.log", "/alpha/nested/deeper"])
+    stats = {}
+    records = list(dn.iter_multithread_scan_records(sample_tree, 4, stats=stats, rules=rules))
+    listing = records_listing(records)
+    assert os.path.join(sample_tree, "beta", "node_modules") not in listing
+    assert os.path.join(sample_tree, "alpha", "nested", "deeper") not in listing
+    assert os.path.join(sample_tree, "alpha", "a2.log") not in listing[os.path.join(sample_tree, "alpha")]
+    assert stats["pruned"] == {"node_modules/": 1, "*.log": 1, "/alpha/nested/deeper": 1}
+    assert stats["pruned_total"] == 3
+
+
+def test_json_rules_file(tmp_path):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"exclude": ["*.log"], "include": ["keep.log"]}), encoding="utf-8")
+    rules = dn.load_scan_rules(ROOT, rules_file=str(rules_file))
+    assert excluded(rules, "drop.log")
+    assert not excluded(rules, "keep.log")
@@ -0,0 +1,66 @@
+import json
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, records_listing, walk_listing
+
+
+def drain(scheduler, children):
+    """Pops until empty, finishing each directory with children[path]; returns the pop order."""
+    order = []
+    while len(scheduler):
+        path = scheduler.popleft()
+        order.append(path)
+        scheduler.finish(path, children.get(path, []))
+    return order
+
+
+def test_history_sends_the_largest_subtree_first():
+    history = {"/r/small": [2, 2], "/r/big": [400, 3], "/r/deep": [10, 30]}
+    scheduler = dn.SubtreeScheduler(["/r"], 4, history)
+    assert scheduler.popleft() == "/r"
+    scheduler.finish("/r", ["/r/small", "/r/big", "/r/deep"])
+    # Costs: big max(400/4, 3) = 100, deep max(10/4, 30) = 30, small 2.
+    assert [scheduler.popleft() for _ in range(3)] == ["/r/big", "/r/deep", "/r/small"]
+
+
+def test_unknown_directories_use_parent_fanout_then_fifo():
+    scheduler = dn.SubtreeScheduler(["/x", "/y"], 1)
+    assert [scheduler.popleft(), scheduler.popleft()] == ["/x", "/y"]
+    scheduler.finish("/x", ["/x/1"])
+    scheduler.finish("/y", ["/y/1", "/y/2", "/y/3"])
+    # Nothing is known about /x or /y, so their children are costed by the parent's fan-out.
+    assert [scheduler.popleft() for _ in range(4)] == ["/y/1", "/y/2", "/y/3", "/x/1"]
+
+
+def test_known_parent_splits_its_size_evenly():
+    scheduler = dn.SubtreeScheduler(["/r"], 1, history={"/r": [9, 2]})
+    scheduler.popleft()
+    scheduler.finish("/r", ["/r/a", "/r/b"])
+    assert [item[3][:2] for item in sorted(scheduler.heap)] == [(4.0, 1), (4.0, 1)]
+
+
+def test_learned_rolls_sizes_up_to_ancestors(monkeypatch):
+    monkeypatch.setattr(dn, "SCHEDULE_HISTORY_MIN_DIRS", 2)
+    scheduler = dn.SubtreeScheduler(["/r"], 2)
+    drain(scheduler, {"/r": ["/r/a", "/r/b"], "/r/a": ["/r/a/x"], "/r/a/x": ["/r/a/x/y"]})
+    assert scheduler.learned() == {"/r": [5, 4], "/r/a": [3, 3], "/r/a/x": [2, 2]}
+
+
+def test_priority_scan_matches_tree_and_refreshes_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(dn, "SCHEDULE_HISTORY_MIN_DIRS", 2)
+    root = build_tree(tmp_path / "tree", {"big": {f"s{i}": {"f": "x"} for i in range(6)}, "small": {"f": "x"}})
+    stats, _, _ = dn.generate_directory_report_multithread(2, root, engine_options={"priority": True})
+    assert stats["history_subtrees"] == 0
+    history_path = dn.subtree_history_path(dn.ensure_output_folder(), root)
+    with open(history_path, "r", encoding="utf-8") as history_file:
+        history = json.load(history_file)
+    assert history[root] == [9, 3]
+    assert history[os.path.join(root, "big")] == [7, 2]
+
+    history_stats = {}
+    records = list(
+        dn.iter_multithread_scan_records(root, 2, stats=history_stats, priority=True, subtree_history=history)
+    )
+    assert records_listing(records) == walk_listing(root)
+    assert "straggler_tail_seconds" in history_stats
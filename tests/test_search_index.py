@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree
+
+SEARCH_TREE = {
+    "certs": {"Server.PEM": "k", "client.pem": "k", "notes.txt": "n"},
+    "src": {"ReadMe.md": "r", "main.py": "m", "Makefile": "m"},
+    "MainDir": {},
+}
+
+
+@pytest.fixture
+def search_index(tmp_path):
+    root = build_tree(tmp_path / "tree", SEARCH_TREE)
+    index_path = str(tmp_path / "search.sqlite3")
+    stats, _, _ = dn.generate_directory_report_multithread(2, root, search_index_path=index_path)
+    assert stats["search_index_entries"] == 9
+    with dn.SearchIndex(index_path) as index:
+        yield root, index
+
+
+def names(results):
+    return sorted(os.path.basename(path) for path, _, _ in results)
+
+
+def test_every_query_type_ignores_case(search_index):
+    _, index = search_index
+    assert names(index.query("prefix", "MAIN")) == ["MainDir", "main.py"]
+    assert names(index.query("substring", "AKEF")) == ["Makefile"]
+    assert names(index.query("glob", "*.PEM")) == ["Server.PEM", "client.pem"]
+    assert names(index.query("glob", "readme.*")) == ["ReadMe.md"]
+    assert names(index.query("ext", ".Pem")) == ["Server.PEM", "client.pem"]
+
+
+def test_glob_wildcards_and_classes(search_index):
+    _, index = search_index
+    assert names(index.query("glob", "[sc]*.pem")) == ["Server.PEM", "client.pem"]
+    assert names(index.query("glob", "ma?n*")) == ["MainDir", "main.py"]
+    assert names(index.query("glob", "*file")) == ["Makefile"]
+
+
+def test_results_carry_paths_kinds_and_limit(search_index):
+    root, index = search_index
+    ((path, is_dir, _),) = index.query("prefix", "maindir")
+    assert path == os.path.join(root, "MainDir")
+    assert is_dir is True
+    assert len(index.query("substring", "e", limit=2)) == 2
+
+
+def test_unknown_query_type_and_missing_index(search_index, tmp_path):
+    _, index = search_index
+    with pytest.raises(ValueError):
+        index.query("regex", "x")
+    with pytest.raises(FileNotFoundError):
+        dn.SearchIndex(str(tmp_path / "missing.sqlite3"))
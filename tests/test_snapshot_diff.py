@@ -0,0 +1,93 @@
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree
+
+
+def read_diff(stats):
+    with open(stats["diff_path"], "r", encoding="utf-8", errors="surrogateescape") as diff_file:
+        return sorted(diff_file.read().splitlines())
+
+
+def test_external_sort_matches_in_memory_sort(tmp_path):
+    entries = [(os.fsencode(f"/r/{index % 7}/{index}"), 1, index, index) for index in range(50)]
+    spilled, single = dn.SnapshotSorter(str(tmp_path / "a"), run_size=8), dn.SnapshotSorter(str(tmp_path / "b"))
+    for entry in entries:
+        spilled.add(*entry)
+        single.add(*entry)
+    assert spilled.finish() == single.finish() == 50
+    assert list(dn.iter_snapshot(spilled.snapshot_path)) == list(dn.iter_snapshot(single.snapshot_path))
+    assert list(dn.iter_snapshot(single.snapshot_path)) == sorted(entries)
+
+
+def test_diff_reports_added_removed_and_changed(tmp_path):
+    def snapshot(name, entries):
+        sorter = dn.SnapshotSorter(str(tmp_path / name))
+        for entry in entries:
+            sorter.add(*entry)
+        sorter.finish()
+        return sorter.snapshot_path
+
+    before = snapshot("before", [(b"/r", 0), (b"/r/gone", 0), (b"/r/a", 1, 1, 1), (b"/r/b", 1, 2, 2)])
+    after = snapshot("after", [(b"/r", 0), (b"/r/a", 1, 1, 1), (b"/r/b", 1, 3, 4), (b"/r/new\xff", 1, 5, 5)])
+    counts = dn.diff_snapshots(before, after, str(tmp_path / "changes.diff"))
+    assert counts == {
+        "added_dirs": 0,
+        "added_files": 1,
+        "removed_dirs": 1,
+        "removed_files": 0,
+        "changed_files": 1,
+        "total_changes": 3,
+    }
+    with open(tmp_path / "changes.diff", "rb") as diff_file:
+        lines = diff_file.read().splitlines()
+    assert b"+ F /r/new\xff" in lines
+    assert b"~ F /r/b\tsize 2->3 mtime_ns 2->4" in lines
+
+
+def test_second_run_diffs_against_the_previous_snapshot(sample_tree):
+    stats, _, _ = dn.generate_directory_report_multithread(2, sample_tree, diff=True)
+    assert "diff" not in stats
+    os.remove(os.path.join(sample_tree, "top.txt"))
+    build_tree(os.path.join(sample_tree, "gamma"), {"g.txt": "g"})
+    stats, _, _ = dn.generate_directory_report_multithread(2, sample_tree, diff=True)
+    assert stats["diff"]["added_dirs"] == 1
+    assert stats["diff"]["added_files"] == 1
+    assert stats["diff"]["removed_files"] == 1
+    assert read_diff(stats) == sorted(
+        [
+            f"+ D {os.path.join(sample_tree, 'gamma')}",
+            f"+ F {os.path.join(sample_tree, 'gamma', 'g.txt')}",
+            f"- F {os.path.join(sample_tree, 'top.txt')}",
+        ]
+    )
+
+
+def test_changed_rules_skip_the_diff_and_start_a_new_baseline(sample_tree):
+    dn.generate_directory_report_multithread(2, sample_tree, diff=True)
+    rules = dn.load_scan_rules(sample_tree, ["node_modules/"])
+    stats, _, _ = dn.generate_directory_report_multithread(2, sample_tree, diff=True, rules=rules)
+    assert "diff" not in stats
+    assert stats["diff_skipped"] == "exclusion rules differ from the previous snapshot"
+    # Same rules again: the skipped run became the baseline, so nothing changed.
+    stats, _, _ = dn.generate_directory_report_multithread(2, sample_tree, diff=True, rules=rules)
+    assert stats["diff"]["total_changes"] == 0
+
+
+def test_older_snapshot_format_is_not_diffed(sample_tree):
+    snapshot_path = dn.snapshot_path_for(dn.ensure_output_folder(), sample_tree)
+    with open(snapshot_path, "wb") as snapshot_file:
+        snapshot_file.write(b"DNRSNAP1")
+    stats, _, _ = dn.generate_directory_report_multithread(2, sample_tree, diff=True)
+    assert stats["diff_skipped"] == "previous snapshot has an older format"
+    assert dn.read_snapshot_rules(snapshot_path) == dn.rules_fingerprint(None)
+
+
+def test_rules_fingerprint_follows_rule_order_and_content():
+    root = os.path.join(os.sep, "scan")
+    fingerprint = dn.rules_fingerprint(dn.ScanRules(root, ["*.log", "!keep.log"]))
+    assert fingerprint == dn.rules_fingerprint(dn.ScanRules(root, ["*.log", "!keep.log"]))
+    assert fingerprint != dn.rules_fingerprint(dn.ScanRules(root, ["!keep.log", "*.log"]))
+    assert fingerprint != dn.rules_fingerprint(dn.ScanRules(root, ["*.log", "!keep.log"], prefixes=["/scan/x"]))
+    assert fingerprint != dn.rules_fingerprint(None)
+    assert len(fingerprint) == dn.SNAPSHOT_RULES_DIGEST_SIZE
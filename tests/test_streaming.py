@@ -0,0 +1,54 @@
+import os
+
+import DirectoryNator_v1 as dn
+from conftest import records_listing, walk_listing
+
+
+def read_blocks(report_path):
+    return {folder: sorted(files) for folder, files in dn.iter_text_report(report_path)}
+
+
+def test_records_cover_every_directory(sample_tree):
+    stats = {}
+    records = list(dn.iter_multithread_scan_records(sample_tree, 4, stats=stats))
+
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert stats["folders"] == len(records) - 1
+    assert stats["files"] == sum(len(files) for files in walk_listing(sample_tree).values())
+
+
+def test_subfolders_are_announced_before_they_are_scanned(sample_tree):
+    seen = {sample_tree}
+    for folder, subfolders, _ in dn.iter_multithread_scan_records(sample_tree, 3):
+        assert folder in seen
+        seen.update(subfolders)
+
+
+def test_report_stream_writes_every_block(tmp_path):
+    blocks = [(f"/data/{index}", [f"/data/{index}/file{n}" for n in range(index % 4)]) for index in range(50)]
+    report_path = str(tmp_path / "report.txt")
+    timings = {}
+
+    written = dn.write_report_stream(report_path, iter(blocks), buffer_limit=4, timings=timings)
+
+    assert written == len(blocks)
+    assert read_blocks(report_path) == {folder: sorted(files) for folder, files in blocks}
+    assert {"report_write_seconds", "report_producer_blocked_seconds"} <= set(timings)
+
+
+def test_report_stream_keeps_draining_after_writer_error(tmp_path, capsys):
+    blocks = ((f"/data/{index}", []) for index in range(20))
+
+    written = dn.write_report_stream(str(tmp_path / "missing" / "report.txt"), blocks, buffer_limit=2)
+
+    assert written == 0
+    assert "Error writing report" in capsys.readouterr().out
+
+
+def test_generated_report_matches_tree(sample_tree, work_dir):
+    stats, report_path, summary_path = dn.generate_directory_report_multithread(thread_count=4, root_dir=sample_tree)
+
+    assert report_path.startswith(os.path.join(str(work_dir), "directorynator"))
+    assert read_blocks(report_path) == walk_listing(sample_tree)
+    assert os.path.exists(summary_path)
+    assert stats["folders"] == len(walk_listing(sample_tree)) - 1
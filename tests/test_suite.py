@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import run_main
+
+SMALL_SHAPE = {"root_fanout": 3, "fanout": 2, "depth": 2, "files_per_dir": 2, "name_length": 6}
+
+
+def test_synthetic_tree_is_deterministic(tmp_path):
+    counts = []
+    for name in ("a", "b"):
+        os.mkdir(tmp_path / name)
+        counts.append(dn.generate_synthetic_tree(str(tmp_path / name), seed=3, **SMALL_SHAPE))
+    assert counts[0] == counts[1] == (3 + 3 * 2, (1 + 3 + 6) * 2)
+    names = [sorted(os.listdir(tmp_path / name)) for name in ("a", "b")]
+    assert names[0] == names[1]
+
+
+def test_suite_counts_match_generated_tree(tmp_path):
+    suite_dir = tmp_path / "suite"
+    suite_dir.mkdir()
+    payload, summary_path = dn.run_benchmark_suite(
+        engines=["multithread", "bfs"],
+        workers=2,
+        warmup=0,
+        trials=2,
+        suite_dir=str(suite_dir),
+        custom_shape=SMALL_SHAPE,
+    )
+    assert [item["engine"] for item in payload["results"]] == ["multithread", "bfs"]
+    for item in payload["results"]:
+        assert item["count_mismatch"] is False
+        assert item["trials"] == 2
+        assert item["median_s"] > 0
+        assert "max_rss" in item
+    assert os.path.exists(summary_path)
+    assert not os.listdir(suite_dir)
+
+
+def test_baseline_comparison_flags_regressions():
+    baseline = {"results": [{"shape": "s", "engine": "e", "workers": 2, "median_s": 1.0}]}
+    results = [{"shape": "s", "engine": "e", "workers": 2, "median_s": 1.2}]
+    assert dn.compare_with_baseline(results, baseline, 0.10)[0]["regression"] is True
+    assert dn.compare_with_baseline(results, baseline, 0.25)[0]["regression"] is False
+    assert dn.compare_with_baseline([{**results[0], "workers": 4}], baseline, 0.10) == []
+
+
+def test_suite_baseline_round_trip(tmp_path):
+    baseline_path = str(tmp_path / "baseline.json")
+    options = {"engines": ["multithread"], "workers": 2, "warmup": 0, "trials": 1, "custom_shape": SMALL_SHAPE}
+    dn.run_benchmark_suite(save_baseline_path=baseline_path, **options)
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        assert json.load(baseline_file)["config"]["trials"] == 1
+    payload, _ = dn.run_benchmark_suite(baseline_path=baseline_path, tolerance=1000.0, **options)
+    assert len(payload["comparison"]) == 1
+    assert payload["regressions"] == []
+
+
+def test_measure_engine_requires_a_trial(sample_tree):
+    with pytest.raises(ValueError):
+        dn.measure_engine(dn.multithread_scan, sample_tree, 2, 0, 0)
+
+
+@pytest.mark.parametrize("trials", ["0", "-1", "many"])
+def test_trials_flag_rejects_non_positive_values(monkeypatch, capsys, trials):
+    with pytest.raises(SystemExit) as excinfo:
+        run_main(monkeypatch, "--mode", "suite", "--trials", trials)
+    assert excinfo.value.code == 2
+    assert "--trials" in capsys.readouterr().err
@@ -0,0 +1,108 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, walk_listing
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+def live_listing(live):
+    return {folder: sorted(os.path.join(folder, name) for name in node[1]) for folder, node in live.tree.items()}
+
+
+def pump(live, budget=dn.WATCH_WALK_BATCH):
+    """Applies queued events and runs walk batches until both the event queue and the walk queue are empty."""
+    while True:
+        events = list(live.watcher.read(timeout=0.05))
+        for wd, mask, name in events:
+            live.apply(wd, mask, name)
+        walked = live.walk_pending(budget)
+        if not events and not walked and not live.pending_walks:
+            return
+
+
+@pytest.fixture
+def live(sample_tree):
+    tree = dn.LiveTree(sample_tree, 2)
+    tree.seed()
+    yield tree
+    tree.close()
+
+
+def test_seed_matches_walk_and_watches_every_directory(live, sample_tree):
+    assert live_listing(live) == walk_listing(sample_tree)
+    assert set(live.watched) == set(live.tree)
+    assert all(node[2] is not None for node in live.tree.values())
+
+
+def test_created_tree_is_walked_and_tracked(live, sample_tree):
+    build_tree(os.path.join(sample_tree, "gamma"), {"g.txt": "g", "inner": {"i.txt": "i"}})
+    pump(live)
+    with open(os.path.join(sample_tree, "gamma", "inner", "late.txt"), "w") as handle:
+        handle.write("late")
+    pump(live)
+
+    assert live_listing(live) == walk_listing(sample_tree)
+    assert not live.pending_walks
+
+
+def test_large_moved_in_tree_is_walked_in_batches(live, sample_tree, tmp_path):
+    spec = {f"d{index}": {f"s{inner}": {"f.txt": "f"} for inner in range(5)} for index in range(10)}
+    outside = build_tree(tmp_path / "outside", {"big": spec})
+    os.rename(os.path.join(outside, "big"), os.path.join(sample_tree, "big"))
+    for wd, mask, name in live.watcher.read(timeout=1.0):
+        live.apply(wd, mask, name)
+
+    # Moving in only queues the directory; each batch stays within the budget.
+    assert live.pending_walks and os.path.join(sample_tree, "big") not in live.tree
+    batches = 0
+    while live.pending_walks:
+        assert live.walk_pending(budget=8) <= 8
+        batches += 1
+    assert batches > 1
+    pump(live)
+
+    assert live_listing(live) == walk_listing(sample_tree)
+    assert live.counters["walked_dirs"] == 1 + 10 + 50
+
+
+def test_queued_directory_removed_before_its_walk_is_skipped(live, sample_tree):
+    build_tree(os.path.join(sample_tree, "gamma"), {"inner": {}})
+    for wd, mask, name in live.watcher.read(timeout=1.0):
+        live.apply(wd, mask, name)
+    shutil.rmtree(os.path.join(sample_tree, "gamma"))
+    pump(live)
+
+    assert live_listing(live) == walk_listing(sample_tree)
+
+
+@pytest.mark.parametrize("remove", ["rmtree", "rename"])
+def test_losing_the_root_empties_the_tree(live, sample_tree, tmp_path, remove):
+    if remove == "rmtree":
+        shutil.rmtree(sample_tree)
+    else:
+        os.rename(sample_tree, tmp_path / "moved")
+    pump(live)
+
+    assert live.root_lost
+    assert live.tree == {} and live.watched == {}
+
+
+def test_watch_mode_stops_when_the_root_is_deleted(sample_tree, monkeypatch):
+    seed = dn.LiveTree.seed
+
+    def seed_then_delete(live):
+        stats = seed(live)
+        shutil.rmtree(sample_tree)
+        return stats
+
+    monkeypatch.setattr(dn.LiveTree, "seed", seed_then_delete)
+    payload = dn.run_watch_mode(sample_tree, thread_count=2, watch_seconds=30)
+
+    assert payload["root_lost"] is True
+    assert payload["watched_seconds"] < 30
+    assert payload["folders"] == 0 and payload["files"] == 0
@@ -0,0 +1,34 @@
+import threading
+
+import DirectoryNator_v1 as dn
+from conftest import build_tree, records_listing, walk_listing
+
+
+def test_workstealing_records_match_tree(sample_tree):
+    stats = {}
+    records = list(dn.iter_workstealing_scan_records(sample_tree, 4, stats=stats, batch_size=2))
+    assert records_listing(records) == walk_listing(sample_tree)
+    assert len(records) == len({folder for folder, _, _ in records})
+    assert stats["folders"] == 6
+    assert stats["files"] == 7
+    assert stats["result_batches"] >= 1
+
+
+def test_workstealing_wide_tree_spreads_across_workers(tmp_path):
+    spec = {f"d{i}": {f"s{j}": {"f.txt": "x"} for j in range(5)} for i in range(20)}
+    root = build_tree(tmp_path / "wide", spec)
+    stats = {}
+    records = list(dn.iter_workstealing_scan_records(root, 4, stats=stats))
+    assert records_listing(records) == walk_listing(root)
+    assert stats["files"] == 100
+    assert isinstance(stats["steals"], int)
+
+
+def test_workstealing_abandoned_generator_stops_workers(tmp_path):
+    spec = {f"d{i}": {f"s{j}": {} for j in range(10)} for i in range(20)}
+    root = build_tree(tmp_path / "wide", spec)
+    before = threading.active_count()
+    records = dn.iter_workstealing_scan_records(root, 4, batch_size=1)
+    next(records)
+    records.close()
+    assert threading.active_count() == before